@@ -19,7 +19,7 @@ def validate_goal_entities(entities: Dict[str, Any]) -> bool:
     goal_name = entities.get("goal_name")
     if not goal_name:
         return False
-    return any(g.name.lower() == goal_name.lower() for g in storage.goals)
+    return any(g.name.lower() == goal_name.lower() for g in storage.list_goals())
 
 
 def _handle_context_dependent_followup(
@@ -76,6 +76,15 @@ def _handle_context_dependent_followup(
 
 
 # --- Core tool router --- #
+def _balance_text(result: Dict[str, Any]) -> str:
+    text = f"Your balance as of {result['as_of']} is ${result['balance']:.2f}."
+    flow = result.get("net_flow")
+    if flow:
+        text += (f" From {flow['start']} to {flow['end']}: income ${flow['income']:.2f}, "
+                 f"expenses ${flow['expense']:.2f}, net ${flow['net']:.2f}.")
+    return text
+
+
 def _choose_and_call(intent_result: Dict[str, Any]) -> Dict[str, Any]:
     intent = intent_result.get("intent")
     entities = intent_result.get("entities", {})
@@ -105,6 +114,8 @@ def _choose_and_call(intent_result: Dict[str, Any]) -> Dict[str, Any]:
         return {"tool": "predict_cashflow", "result": tools.predict_cashflow_tool(entities)}
     if intent == "check_spending_ability":
         return {"tool": "check_spending_ability", "result": tools.check_spending_ability_tool(entities)}
+    if intent == "ask_balance":
+        return {"tool": "balance", "result": tools.balance_tool(entities)}
 
     # --- Unknown --- #
     return {"tool": "none", "result": {"ok": False, "message": "unknown intent"}}
@@ -214,6 +225,8 @@ def run_agent(
     elif tool == "check_spending_ability":
         # Return the spending advice message directly from the tool
         text = result.get("message", "Unable to determine spending ability.")
+    elif tool == "balance":
+        text = _balance_text(result)
     elif tool == "list_transactions":
         txs = result.get("transactions", [])
         if not txs:
@@ -270,7 +283,8 @@ def run_agent_from_intent(intent_result: Dict) -> Dict:
         "add_goal_contribution": tools.add_goal_contribution_tool,
         "ask_budget_status": tools.get_budget_status_tool,
         "ask_goal_progress": tools.get_goal_status_tool,
-        "ask_spending_summary": tools.predict_cashflow_tool
+        "ask_spending_summary": tools.predict_cashflow_tool,
+        "ask_balance": tools.balance_tool,
     }
 
     tool_func = tool_map.get(intent)
@@ -326,6 +340,9 @@ def run_agent_from_intent(intent_result: Dict) -> Dict:
             month = tool_result.get("next_30_estimate")
             text = f"Estimated next week spend: ${week:.2f}. Next 30 days: ${month:.2f}."
 
+    elif intent == "ask_balance":
+        text = _balance_text(tool_result)
+
     else:
         text = "Sorry, I couldn't determine an action for that request."
 
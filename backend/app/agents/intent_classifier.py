@@ -86,7 +86,9 @@ def classify_intent(message: str) -> Dict[str, Any]:
         cat = _extract_category(message)
         if cat:
             entities["category"] = cat
-    # --- Budget / goals queries --- #
+    # --- Balance / budget / goals queries --- #
+    elif "balance" in lower:
+        intent = "ask_balance"
     elif "budget" in lower:
         intent = "ask_budget_status"
     elif any(w in lower for w in ["goal", "saving"]):
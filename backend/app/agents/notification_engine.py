@@ -43,25 +43,78 @@ def on_transaction_created(payload: Dict[str, Any]):
     # 2 Budget threshold / exceeded rules
     category = tx.get("category")
     if category:
-        spending, limit, alert_threshold = get_budget_spending(category)
-        # alert threshold (e.g., 80%)
-        if spending >= alert_threshold * limit:
-            logger.info(f"Budget threshold reached for {category}")
-            add_notification(
-                notification_type="budget.threshold",
-                title=f"{category} Budget Alert",
-                message=f"Your spending has reached {spending}/{limit} ({spending/limit*100:.0f}%)"
-            )
-        # exceeded limit
-        if spending >= limit:
-            logger.warning(f"Budget exceeded for {category}")
-            add_notification(
-                notification_type="budget.exceeded",
-                title=f"{category} Budget Exceeded",
-                message=f"You have exceeded your budget of {limit} for {category}!"
-            )
+        _check_budget(category)
 
     # 4 Balance negative
+    _check_balance()
+
+
+def on_transactions_imported(payload: Dict[str, Any]):
+    """
+    Handle the single transactions.imported event emitted by a bulk import.
+    Runs each rule once for the whole batch instead of once per row.
+    """
+    logger.info(f"Processing transactions imported event: {payload.get('count')} transactions")
+
+    # 1 Large transaction rule (one summary notification)
+    large_count = payload.get("large_count", 0)
+    if large_count:
+        add_notification(
+            notification_type="transaction.large",
+            title="Large Transactions Imported",
+            message=f"{large_count} imported transaction(s) were over 500"
+        )
+
+    # 2 Budget threshold / exceeded rules, once per affected category
+    for category in payload.get("categories", []):
+        _check_budget(category)
+
+    # 4 Balance negative
+    _check_balance()
+
+
+def on_transaction_updated(payload: Dict[str, Any]):
+    """
+    Handle transaction.updated events: the edited amount or category may now
+    push its budget over the threshold, and the balance may turn negative.
+    """
+    logger.info(f"Processing transaction updated event: {payload.get('id')}")
+    category = payload.get("category")
+    if category:
+        _check_budget(category)
+    _check_balance()
+
+
+def on_transaction_deleted(payload: Dict[str, Any]):
+    """Handle transaction.deleted events: removing income may turn the balance negative."""
+    logger.info(f"Processing transaction deleted event: {payload.get('id')}")
+    _check_balance()
+
+
+def _check_budget(category: str):
+    spending, limit, alert_threshold = get_budget_spending(category)
+    if not limit:
+        # no budget for this category
+        return
+    # alert threshold (e.g., 80%)
+    if spending >= alert_threshold * limit:
+        logger.info(f"Budget threshold reached for {category}")
+        add_notification(
+            notification_type="budget.threshold",
+            title=f"{category} Budget Alert",
+            message=f"Your spending has reached {spending}/{limit} ({spending/limit*100:.0f}%)"
+        )
+    # exceeded limit
+    if spending >= limit:
+        logger.warning(f"Budget exceeded for {category}")
+        add_notification(
+            notification_type="budget.exceeded",
+            title=f"{category} Budget Exceeded",
+            message=f"You have exceeded your budget of {limit} for {category}!"
+        )
+
+
+def _check_balance():
     balance = get_balance()
     if balance < 0:
         logger.error(f"Negative balance detected: {balance}")
@@ -152,4 +205,7 @@ def check_negative_balance():
 def setup_event_handlers():
     logger.info("Registering notification event handlers")
     eventing.register("transaction.created", on_transaction_created)
+    eventing.register("transactions.imported", on_transactions_imported)
+    eventing.register("transaction.updated", on_transaction_updated)
+    eventing.register("transaction.deleted", on_transaction_deleted)
     eventing.register("goal.check_due", on_goal_due_check)
\ No newline at end of file
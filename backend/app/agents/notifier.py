@@ -2,14 +2,27 @@ from typing import List, Dict, Any
 import threading
 import requests
 from threading import Lock
+from app import storage
 
+# In-process registry for the JSON backend. With STORAGE_BACKEND=sqlite the
+# webhooks live in the database instead, so every worker process alerts them.
 _lock = Lock()
 _webhooks: List[Dict[str, Any]] = []
 _next_id = 1
 
 
+def _shared_store():
+    if storage.STORAGE_BACKEND == "sqlite":
+        from app import sqlite_storage
+        return sqlite_storage
+    return None
+
+
 def register_webhook(url: str) -> Dict[str, Any]:
     global _next_id
+    shared = _shared_store()
+    if shared is not None:
+        return shared.add_webhook(url)
     with _lock:
         entry = {"id": _next_id, "url": url}
         _webhooks.append(entry)
@@ -18,11 +31,17 @@ def register_webhook(url: str) -> Dict[str, Any]:
 
 
 def list_webhooks() -> List[Dict[str, Any]]:
+    shared = _shared_store()
+    if shared is not None:
+        return shared.list_webhooks()
     with _lock:
         return list(_webhooks)
 
 
 def remove_webhook(hook_id: int) -> bool:
+    shared = _shared_store()
+    if shared is not None:
+        return shared.remove_webhook(hook_id)
     with _lock:
         for i, h in enumerate(_webhooks):
             if h["id"] == hook_id:
@@ -1,4 +1,5 @@
 from app import storage, models
+from app.errors import VersionConflictError
 from datetime import date, datetime, timedelta
 from typing import Dict, Any
 import logging
@@ -53,14 +54,23 @@ def add_goal_contribution_tool(entities: Dict[str, Any]) -> Dict[str, Any]:
     if amount is None:
         return {"ok": False, "error": "Missing amount"}
 
-    # find goal by name (case-insensitive exact match)
-    goal = next((g for g in storage.goals if g.name.lower() == goal_name.lower()), None)
-    if not goal:
-        logger.warning(f"Goal '{goal_name}' not found")
-        return {"ok": False, "error": f"Goal '{goal_name}' not found"}
-
-    # Update goal's saved amount
-    goal.saved_amount += float(amount)
+    # Read-modify-write as a compare-and-swap: if another contribution lands
+    # between reading the goal and writing it back, re-read and try again
+    while True:
+        # find goal by name (case-insensitive exact match)
+        goal = next((g for g in storage.list_goals() if g.name.lower() == goal_name.lower()), None)
+        if not goal:
+            logger.warning(f"Goal '{goal_name}' not found")
+            return {"ok": False, "error": f"Goal '{goal_name}' not found"}
+
+        # Update goal's saved amount through storage so it is persisted
+        goal_data = models.GoalBase(**goal.model_dump(exclude={"id", "version"}))
+        goal_data.saved_amount += float(amount)
+        try:
+            goal = storage.update_goal(goal.id, goal_data, expected_version=goal.version)
+            break
+        except VersionConflictError:
+            logger.info(f"Goal '{goal_name}' changed concurrently, retrying contribution")
     logger.info(f"Added ${amount} to goal '{goal_name}'")
 
     return {
@@ -78,16 +88,9 @@ def add_goal_contribution_tool(entities: Dict[str, Any]) -> Dict[str, Any]:
 def get_budget_status_tool(_: Dict[str, Any] = None) -> Dict[str, Any]:
     # Match budgets to categories using exact matching (case-insensitive)
     data = []
-    for b in storage.budgets:
-        # Exact match: normalize budget category to lowercase
-        budget_category = (b.category or "").lower() if hasattr(b, 'category') else (b.name or "").lower()
-        spent = 0.0
-        for t in storage.transactions:
-            # Normalize transaction category to lowercase for comparison
-            tx_category = (t.category or "").lower()
-            # Use exact match instead of substring match
-            if budget_category and budget_category == tx_category:
-                spent += t.amount
+    for b in storage.list_budgets():
+        # Spending for the current month, from the storage (category, month) aggregates
+        spent = b.spent_this_month
         remaining = b.monthly_limit - spent
         data.append({"id": b.id, "name": b.name, "amount": b.monthly_limit, "spent": spent, "remaining": remaining})
     return {"ok": True, "budgets": data}
@@ -95,7 +98,7 @@ def get_budget_status_tool(_: Dict[str, Any] = None) -> Dict[str, Any]:
 
 def get_goal_status_tool(_: Dict[str, Any] = None) -> Dict[str, Any]:
     data = []
-    for g in storage.goals:
+    for g in storage.list_goals():
         progress = 0.0
         if g.target_amount:
             try:
@@ -122,12 +125,7 @@ def check_spending_ability_tool(entities: Dict[str, Any]) -> Dict[str, Any]:
     category_lower = (category or "misc").lower()
 
     # Find matching budget
-    matching_budget = None
-    for b in storage.budgets:
-        budget_category = (b.category or "").lower() if hasattr(b, 'category') else (b.name or "").lower()
-        if budget_category and budget_category == category_lower:
-            matching_budget = b
-            break
+    matching_budget = storage.get_budget_for_category(category_lower)
 
     if not matching_budget:
         # No budget set for this category - can afford
@@ -139,12 +137,8 @@ def check_spending_ability_tool(entities: Dict[str, Any]) -> Dict[str, Any]:
             "limit": None
         }
 
-    # Calculate current spending for the category
-    spent = 0.0
-    for t in storage.transactions:
-        tx_category = (t.category or "").lower()
-        if budget_category and budget_category == tx_category:
-            spent += t.amount
+    # Current month's spending for the category
+    spent = matching_budget.spent_this_month
 
     remaining = matching_budget.monthly_limit - spent
     can_afford = (remaining - amount) >= 0
@@ -172,36 +166,38 @@ def check_spending_ability_tool(entities: Dict[str, Any]) -> Dict[str, Any]:
 
 def predict_cashflow_tool(_: Dict[str, Any] = None) -> Dict[str, Any]:
     # Improved prediction: use recent 30 days (or all) to compute avg daily spend, and project 7/30 days
-    txs = storage.transactions
-    if not txs:
-        return {"ok": True, "prediction": "No transactions available to predict."}
-
     # consider last 30 days
     today = date.today()
     cutoff = today - timedelta(days=30)
-    recent = [t for t in txs if getattr(t, 'date', today) >= cutoff]
-    if not recent:
-        recent = txs
+    stats = storage.get_cashflow_stats(cutoff)
+    if not stats:
+        return {"ok": True, "prediction": "No transactions available to predict."}
 
-    dates = [t.date for t in recent]
-    span_days = (max(dates) - min(dates)).days or 1
-    total = sum(t.amount for t in recent)
+    span_days = (stats["last_date"] - stats["first_date"]).days or 1
+    total = stats["total"]
     avg_daily = total / span_days
     next_week = avg_daily * 7
     next_30 = avg_daily * 30
 
     # per-category averages
     by_cat = {}
-    for t in recent:
-        cat = (t.category or "misc").lower()
-        by_cat.setdefault(cat, 0.0)
-        by_cat[cat] += t.amount
-    for k in list(by_cat.keys()):
-        by_cat[k] = {"total": by_cat[k], "avg_daily": by_cat[k] / span_days}
+    for k, cat_total in stats["by_category"].items():
+        by_cat[k] = {"total": cat_total, "avg_daily": cat_total / span_days}
 
     return {"ok": True, "avg_daily": avg_daily, "next_week_estimate": next_week, "next_30_estimate": next_30, "by_category": by_cat}
 
 
+def balance_tool(entities: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Balance as of `date` (default today), plus the net flow between `start` and `end` when both are given."""
+    entities = entities or {}
+    as_of = _parse_date(entities.get("date"))
+    result = {"ok": True, "as_of": as_of.isoformat(), "balance": storage.get_balance_as_of(as_of)}
+    if entities.get("start") and entities.get("end"):
+        start, end = _parse_date(entities["start"]), _parse_date(entities["end"])
+        result["net_flow"] = {"start": start.isoformat(), "end": end.isoformat(), **storage.get_net_flow(start, end)}
+    return result
+
+
 def list_transactions_tool(_: Dict[str, Any] = None):
     return {
         "ok": True,
@@ -211,7 +207,7 @@ def list_transactions_tool(_: Dict[str, Any] = None):
                 "category": t.category,
                 "date": t.date.isoformat()
             }
-            for t in storage.transactions
+            for t in storage.list_transactions()
         ]
     }
 
@@ -0,0 +1,94 @@
+"""
+Date-sorted prefix sums of income and expense, for point-in-time balances.
+
+storage keeps one BalanceIndex: the distinct transaction days in sorted
+order, with cumulative income and expense through each day. "Balance as of
+X" is a bisect plus a lookup, and the net flow between two days is the
+difference of two such lookups, so both are O(log n).
+
+Writes are incremental. A transaction on the latest day (the usual case)
+appends or bumps the last entry. An older day shifts the cumulative tail
+with one vectorized add, and the arrays grow by doubling like
+TransactionColumns.
+"""
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, Tuple
+import numpy as np
+
+
+class BalanceIndex:
+    """Sorted day ordinals with cumulative (income, expense) through each day."""
+
+    def __init__(self, capacity: int = 1024):
+        self._reset(capacity)
+
+    def _reset(self, capacity: int):
+        self._days: list[int] = []
+        self._income = np.zeros(capacity, dtype=np.float64)
+        self._expense = np.zeros(capacity, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def _reserve(self, needed: int):
+        capacity = len(self._income)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("_income", "_expense"):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:len(self._days)] = old[:len(self._days)]
+            setattr(self, name, grown)
+
+    # --- Writes --- #
+    def add(self, d: date, income: float, expense: float):
+        """Add amounts dated d (pass negated amounts to remove them)."""
+        ordinal = d.toordinal()
+        size = len(self._days)
+        i = bisect_left(self._days, ordinal)
+        if i == size or self._days[i] != ordinal:
+            # New day: open a slot holding the cumulative values of the day before
+            self._reserve(size + 1)
+            for column in (self._income, self._expense):
+                column[i + 1:size + 1] = column[i:size]
+                column[i] = column[i - 1] if i else 0.0
+            self._days.insert(i, ordinal)
+            size += 1
+        self._income[i:size] += income
+        self._expense[i:size] += expense
+
+    def rebuild(self, entries: Iterable[Tuple[date, float, float]]):
+        """Replace the index with (date, income, expense) entries."""
+        per_day = defaultdict(lambda: [0.0, 0.0])
+        for d, income, expense in entries:
+            totals = per_day[d.toordinal()]
+            totals[0] += income
+            totals[1] += expense
+        self._reset(len(self._income))
+        self._days = sorted(per_day)
+        self._reserve(len(self._days))
+        n = len(self._days)
+        self._income[:n] = np.cumsum([per_day[o][0] for o in self._days])
+        self._expense[:n] = np.cumsum([per_day[o][1] for o in self._days])
+
+    # --- Queries --- #
+    def totals_through(self, d: date) -> Tuple[float, float]:
+        """(income, expense) dated on or before d."""
+        i = bisect_right(self._days, d.toordinal())
+        if not i:
+            return 0.0, 0.0
+        return float(self._income[i - 1]), float(self._expense[i - 1])
+
+    def totals_between(self, start: date, end: date) -> Tuple[float, float]:
+        """(income, expense) dated between start and end inclusive."""
+        if end < start:
+            return 0.0, 0.0
+        income_end, expense_end = self.totals_through(end)
+        i = bisect_left(self._days, start.toordinal())
+        if not i:
+            return income_end, expense_end
+        return income_end - float(self._income[i - 1]), expense_end - float(self._expense[i - 1])
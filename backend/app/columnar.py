@@ -0,0 +1,145 @@
+"""
+Columnar, NumPy-backed copy of the transaction list for analytics.
+
+storage keeps one TransactionColumns alongside `storage.transactions` for
+the one windowed query its rollups can't answer: per-category cashflow
+since a date (tools.predict_cashflow_tool), which runs as vectorized masks
+and bincounts instead of a Python loop over Transaction models. Totals and
+the chart come from TimeRollups and BalanceIndex. Rows follow storage's
+transaction slots, so a deleted transaction's row is only marked dead.
+Columns grow by doubling, so appends are amortized O(1).
+"""
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from app.models import Transaction
+
+
+def normalize_category(category: Optional[str]) -> str:
+    return (category or "").lower()
+
+
+class TransactionColumns:
+    """Parallel arrays: amount, date ordinal, category code, live flag."""
+
+    def __init__(self, capacity: int = 1024):
+        self._reset(capacity)
+
+    def _reset(self, capacity: int):
+        self._size = 0
+        self._amount = np.zeros(capacity, dtype=np.float64)
+        self._date = np.zeros(capacity, dtype=np.int32)        # date.toordinal()
+        self._category = np.zeros(capacity, dtype=np.int32)    # index into category_names
+        self._live = np.zeros(capacity, dtype=np.bool_)         # False once deleted
+        self.category_codes: Dict[str, int] = {}
+        self.category_names: List[str] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    # --- Writes --- #
+    def _reserve(self, extra: int):
+        needed = self._size + extra
+        capacity = len(self._amount)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("_amount", "_date", "_category", "_live"):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:self._size] = old[:self._size]
+            setattr(self, name, grown)
+
+    def category_code(self, category: Optional[str]) -> int:
+        key = normalize_category(category)
+        code = self.category_codes.get(key)
+        if code is None:
+            code = len(self.category_names)
+            self.category_codes[key] = code
+            self.category_names.append(key)
+        return code
+
+    def append(self, tx: Transaction):
+        self._reserve(1)
+        i = self._size
+        self._amount[i] = tx.amount
+        self._date[i] = tx.date.toordinal()
+        self._category[i] = self.category_code(tx.category)
+        self._live[i] = True
+        self._size += 1
+
+    def extend(self, txs: Iterable[Transaction]):
+        txs = list(txs)
+        self._reserve(len(txs))
+        start = self._size
+        end = start + len(txs)
+        self._amount[start:end] = [tx.amount for tx in txs]
+        self._date[start:end] = [tx.date.toordinal() for tx in txs]
+        self._category[start:end] = [self.category_code(tx.category) for tx in txs]
+        self._live[start:end] = True
+        self._size = end
+
+    def replace(self, i: int, tx: Transaction):
+        """Overwrite row i (an edited transaction)."""
+        if not 0 <= i < self._size:
+            raise IndexError(i)
+        self._amount[i] = tx.amount
+        self._date[i] = tx.date.toordinal()
+        self._category[i] = self.category_code(tx.category)
+
+    def delete(self, i: int):
+        """Mark row i dead (a deleted transaction); later rows keep their place."""
+        if not 0 <= i < self._size:
+            raise IndexError(i)
+        self._live[i] = False
+
+    def rebuild(self, txs: Iterable[Transaction]):
+        self._reset(len(self._amount))
+        self.extend(txs)
+
+    # --- Column views (no copies) --- #
+    @property
+    def amount(self) -> np.ndarray:
+        return self._amount[:self._size]
+
+    @property
+    def date_ordinal(self) -> np.ndarray:
+        return self._date[:self._size]
+
+    @property
+    def category(self) -> np.ndarray:
+        return self._category[:self._size]
+
+    @property
+    def live(self) -> np.ndarray:
+        return self._live[:self._size]
+
+    # --- Analytics --- #
+    def cashflow_stats(self, since: date) -> Optional[Dict]:
+        """
+        Amount totals over transactions dated on/after `since` (or over all
+        transactions if none are that recent): total, first/last date and
+        per-category totals. Returns None when there are no transactions.
+        """
+        live = self.live
+        if not live.any():
+            return None
+        mask = live & (self.date_ordinal >= since.toordinal())
+        if not mask.any():
+            mask = live
+
+        amount = self.amount[mask]
+        dates = self.date_ordinal[mask]
+        per_category = np.bincount(self.category[mask], weights=amount, minlength=len(self.category_names))
+        present = np.bincount(self.category[mask], minlength=len(self.category_names)) > 0
+        by_category: Dict[str, float] = {}
+        for code in np.flatnonzero(present):
+            name = self.category_names[code] or "misc"
+            by_category[name] = by_category.get(name, 0.0) + float(per_category[code])
+        return {
+            "total": float(amount.sum()),
+            "first_date": date.fromordinal(int(dates.min())),
+            "last_date": date.fromordinal(int(dates.max())),
+            "by_category": by_category,
+        }
@@ -9,6 +9,7 @@ import logging
 from datetime import datetime, date
 from typing import List, Tuple, Optional
 from pathlib import Path
+from app import file_lock
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,8 @@ USER_DATA_DIR = Path(__file__).parent.parent / "user_data"
 USER_DATA_DIR.mkdir(exist_ok=True)
 CONVERSATIONS_DIR = USER_DATA_DIR / "conversations"
 CONVERSATIONS_DIR.mkdir(exist_ok=True)
+# Serializes add_turn's read-modify-write across worker processes
+CONVERSATIONS_LOCK_FILE = CONVERSATIONS_DIR / ".lock"
 
 logger.info(f"Conversation storage initialized at: {CONVERSATIONS_DIR}")
 
@@ -127,10 +130,11 @@ def _save_conversation(turns: List[ConversationTurn]) -> None:
 
 def add_turn(role: str, content: str) -> ConversationTurn:
     """Add a turn to today's conversation history and save to file."""
-    turns = _load_conversation()
-    turn = ConversationTurn(role, content)
-    turns.append(turn)
-    _save_conversation(turns)
+    with file_lock.exclusive(CONVERSATIONS_LOCK_FILE):
+        turns = _load_conversation()
+        turn = ConversationTurn(role, content)
+        turns.append(turn)
+        _save_conversation(turns)
     return turn
 
 
@@ -0,0 +1,12 @@
+"""Exceptions shared by the storage backends."""
+
+
+class VersionConflictError(Exception):
+    """An update named an entity version that is no longer the current one."""
+
+    def __init__(self, entity: str, entity_id: int, expected: int, current: int):
+        super().__init__(f"{entity} {entity_id} is at version {current}, not {expected}")
+        self.entity = entity
+        self.entity_id = entity_id
+        self.expected = expected
+        self.current = current
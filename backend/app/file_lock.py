@@ -0,0 +1,53 @@
+"""
+Cross-process file locks, for state several worker processes share on disk.
+
+`exclusive(path)` serializes a read-modify-write of a file across processes
+(and threads: every call opens its own handle, and flock locks on different
+handles exclude each other). `claim(path)` takes a lock for the rest of the
+process's life, so a second process using the same data fails fast instead
+of silently overwriting it.
+
+POSIX only (fcntl.flock); elsewhere both are no-ops.
+"""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, IO
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+_claims: Dict[Path, IO] = {}
+
+
+@contextmanager
+def exclusive(path: Path):
+    """Hold an exclusive lock on `path` (created if missing) for the duration of the block."""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def claim(path: Path, message: str) -> None:
+    """Lock `path` until the process exits; RuntimeError(message) if another process holds it."""
+    if fcntl is None:
+        return
+    path = path.resolve()
+    if path in _claims:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle = open(path, "a")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        handle.close()
+        raise RuntimeError(message) from None
+    _claims[path] = handle
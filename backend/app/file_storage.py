@@ -1,14 +1,21 @@
 """
 File-based storage for persistent data.
-Stores all transactions, budgets, goals, and notifications in JSON files.
+Stores all transactions, budgets, goals, and notifications in JSON files
+(or compact binary snapshots, see app/snapshot.py).
 Automatically loads data from files on startup.
 """
 import json
 import logging
+import os
+import threading
 from datetime import date, datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Tuple
+from pydantic import TypeAdapter
 from app.models import Transaction, Budget, Goal, Notification, TransactionType
+from app import snapshot
+from app import file_lock
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +30,43 @@ TRANSACTIONS_FILE = USER_STORAGE_DIR / "transactions.json"
 BUDGETS_FILE = USER_STORAGE_DIR / "budgets.json"
 GOALS_FILE = USER_STORAGE_DIR / "goals.json"
 NOTIFICATIONS_FILE = USER_STORAGE_DIR / "notifications.json"
+TRANSACTIONS_JOURNAL_FILE = USER_STORAGE_DIR / "transactions.journal"
+TRANSACTIONS_BIN_FILE = USER_STORAGE_DIR / "transactions.bin"
+BUDGETS_BIN_FILE = USER_STORAGE_DIR / "budgets.bin"
+GOALS_BIN_FILE = USER_STORAGE_DIR / "goals.bin"
+NOTIFICATIONS_BIN_FILE = USER_STORAGE_DIR / "notifications.bin"
+TRANSACTIONS_PARTITION_DIR = USER_STORAGE_DIR / "transactions"
+TRANSACTIONS_MANIFEST_FILE = TRANSACTIONS_PARTITION_DIR / "manifest.json"
+# Held by the process serving the JSON backend (see claim_storage_dir)
+STORAGE_LOCK_FILE = USER_STORAGE_DIR / ".lock"
+
+# Snapshot format written by save_*: "json" or "binary" (see app/snapshot.py).
+# Loading reads whichever of the two files is newer, so switching needs no migration.
+SNAPSHOT_FORMAT = os.getenv("STORAGE_SNAPSHOT_FORMAT", "json").lower()
+
+# Journal mode: new transactions are appended to TRANSACTIONS_JOURNAL_FILE and
+# folded into transactions.json at checkpoints instead of rewriting it per insert.
+JOURNAL_ENABLED = os.getenv("TRANSACTIONS_JOURNAL", "1").lower() not in ("0", "false", "no", "off")
+# A checkpoint runs once the journal holds at least this many records, or as many
+# records as the snapshot itself (whichever is larger), keeping inserts amortized O(1).
+JOURNAL_CHECKPOINT_MIN = int(os.getenv("TRANSACTIONS_CHECKPOINT_MIN", "1000"))
+
+_journal_records = 0  # records appended since the last checkpoint
+_snapshot_size = 0  # transactions in the last written/loaded snapshot
+
+# Partitioned mode: transactions are stored one file per month in
+# TRANSACTIONS_PARTITION_DIR (e.g. 2025-12.json) next to a manifest of per-month
+# counts and totals, so an insert rewrites only its month. It replaces the journal.
+PARTITIONED = os.getenv("TRANSACTIONS_PARTITIONED", "0").lower() not in ("0", "false", "no", "off")
+
+_partitions: Dict[str, List[Transaction]] = {}  # "YYYY-MM" -> that month's transactions
+_manifest: Dict[str, Dict[str, Any]] = {}  # "YYYY-MM" -> {"count", "income", "expense"}
+
+# Write-behind mode: save_* calls only mark a collection dirty and a background
+# thread writes each dirty collection once per STORAGE_FLUSH_INTERVAL seconds,
+# which is also the most the files can lag behind memory.
+WRITE_BEHIND = os.getenv("STORAGE_WRITE_BEHIND", "0").lower() not in ("0", "false", "no", "off")
+FLUSH_INTERVAL = float(os.getenv("STORAGE_FLUSH_INTERVAL", "1.0"))
 
 logger.info(f"File-based storage initialized at: {USER_STORAGE_DIR}")
 
@@ -36,8 +80,10 @@ class DateTimeEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
-def serialize_data(data: Any) -> str:
+def serialize_data(data: Any, compact: bool = False) -> str:
     """Serialize data to JSON string."""
+    if compact:
+        return json.dumps(data, cls=DateTimeEncoder, separators=(",", ":"))
     return json.dumps(data, cls=DateTimeEncoder, indent=2)
 
 
@@ -54,46 +100,205 @@ def deserialize_json(filepath: Path) -> Dict[str, Any]:
         return {}
 
 
+def _atomic_write(filepath: Path, data: str | bytes) -> None:
+    """Write to a temp file, fsync it and rename it over filepath, so readers never see a torn file."""
+    tmp_path = filepath.with_name(filepath.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data.encode('utf-8') if isinstance(data, str) else data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Make renames and new files in directory durable (skipped where directories can't be opened, e.g. Windows)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# --- Snapshots --- #
+# Batch validation runs in pydantic-core and beats building models one by one
+_TRANSACTIONS = TypeAdapter(List[Transaction])
+_BUDGETS = TypeAdapter(List[Budget])
+_GOALS = TypeAdapter(List[Goal])
+_NOTIFICATIONS = TypeAdapter(List[Notification])
+
+
+def binary_snapshot_path(collection: str) -> Path:
+    return {
+        "transactions": TRANSACTIONS_BIN_FILE,
+        "budgets": BUDGETS_BIN_FILE,
+        "goals": GOALS_BIN_FILE,
+        "notifications": NOTIFICATIONS_BIN_FILE,
+    }[collection]
+
+
+def _write_snapshot(collection: str, json_path: Path, items: List[Any], to_json: Callable[[], Dict[str, Any]],
+                    compact: bool = False, bin_path: Path | None = None) -> None:
+    if SNAPSHOT_FORMAT == "binary":
+        _atomic_write(bin_path or binary_snapshot_path(collection), snapshot.encode(collection, items))
+    else:
+        _atomic_write(json_path, serialize_data(to_json(), compact=compact))
+
+
+def _read_snapshot(collection: str, json_path: Path, adapter: TypeAdapter, bin_path: Path | None = None) -> List[Any]:
+    """Load a collection from its JSON or binary snapshot, whichever was written last."""
+    bin_path = bin_path or binary_snapshot_path(collection)
+    use_binary = bin_path.exists()
+    if use_binary and json_path.exists():
+        bin_mtime, json_mtime = bin_path.stat().st_mtime_ns, json_path.stat().st_mtime_ns
+        use_binary = bin_mtime > json_mtime or (bin_mtime == json_mtime and SNAPSHOT_FORMAT == "binary")
+    if use_binary:
+        # Written from validated models, so no second validation pass
+        return snapshot.decode(bin_path.read_bytes())[1]
+    return adapter.validate_python(deserialize_json(json_path).get(collection, []))
+
+
+# --- Single-process guard --- #
+def claim_storage_dir() -> None:
+    """
+    Mark USER_STORAGE_DIR as owned by this process. The JSON files are
+    rewritten from one process's memory, so a second process on the same
+    directory (e.g. another uvicorn worker) would silently overwrite the
+    first one's writes; it gets a RuntimeError at startup instead.
+    """
+    file_lock.claim(
+        STORAGE_LOCK_FILE,
+        f"{USER_STORAGE_DIR} is in use by another process. The JSON storage backend serves a single "
+        "process; run several workers with STORAGE_BACKEND=sqlite.",
+    )
+
+
+# --- Write-behind --- #
+_io_lock = threading.RLock()  # serializes snapshot writes and journal appends
+_dirty: Dict[str, Tuple[Callable[[List[Any]], None], List[Any]]] = {}
+_dirty_lock = threading.Lock()
+_flusher: threading.Thread | None = None
+_flusher_stop = threading.Event()
+
+
+def _persist(name: str, writer: Callable[[List[Any]], None], items: List[Any]) -> None:
+    """Write a collection now, or mark it dirty for the flusher in write-behind mode."""
+    if not WRITE_BEHIND:
+        with _io_lock:
+            writer(items)
+        return
+    with _dirty_lock:
+        # Only the newest version handed in is kept; the flush writes it as it is by then
+        _dirty[name] = (writer, items)
+    _ensure_flusher()
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _dirty_lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher_stop.clear()
+            _flusher = threading.Thread(target=_flush_loop, name="storage-flusher", daemon=True)
+            _flusher.start()
+
+
+def _flush_loop() -> None:
+    while not _flusher_stop.wait(FLUSH_INTERVAL):
+        try:
+            flush_pending()
+        except Exception as e:
+            logger.error(f"Error flushing storage: {e}")
+
+
+def flush_pending() -> int:
+    """Write every dirty collection now. Returns the number of collections written."""
+    with _dirty_lock:
+        pending = list(_dirty.values())
+        _dirty.clear()
+    # Writers serialize the list while holding the I/O lock, so the last write always has the newest data
+    for writer, items in pending:
+        with _io_lock:
+            writer(items)
+    return len(pending)
+
+
+def stop_flusher() -> None:
+    """Stop the background flusher and write anything still pending (called on shutdown)."""
+    global _flusher
+    _flusher_stop.set()
+    if _flusher is not None:
+        _flusher.join()
+        _flusher = None
+    written = flush_pending()
+    if written:
+        logger.info(f"Flushed {written} pending collections on shutdown")
+
+
 # --- Transaction Storage --- #
+def _transaction_to_dict(tx: Transaction) -> Dict[str, Any]:
+    return {
+        "id": tx.id,
+        "amount": tx.amount,
+        "category": tx.category,
+        "date": tx.date.isoformat(),
+        "description": tx.description,
+        "type": tx.type.value
+    }
+
+
+def _transaction_from_dict(tx_data: Dict[str, Any]) -> Transaction:
+    return Transaction(
+        id=tx_data["id"],
+        amount=tx_data["amount"],
+        category=tx_data["category"],
+        date=datetime.fromisoformat(tx_data["date"]).date(),
+        description=tx_data.get("description"),
+        type=TransactionType(tx_data["type"])
+    )
+
+
 def save_transactions(transactions: List[Transaction]) -> None:
-    """Save transactions to transactions.json"""
+    """Save all transactions to transactions.json, or every month partition (a checkpoint in journal mode)"""
+    _persist("transactions", _write_transactions, transactions)
+
+
+def _write_transactions(transactions: List[Transaction]) -> None:
+    global _journal_records, _snapshot_size
     try:
-        data = {
-            "transactions": [
-                {
-                    "id": tx.id,
-                    "amount": tx.amount,
-                    "category": tx.category,
-                    "date": tx.date.isoformat(),
-                    "description": tx.description,
-                    "type": tx.type.value
-                }
-                for tx in transactions
-            ]
-        }
-        with open(TRANSACTIONS_FILE, 'w', encoding='utf-8') as f:
-            f.write(serialize_data(data))
-        logger.debug(f"Saved {len(transactions)} transactions to file")
+        # Journal appends wait on the lock until the old journal is dropped
+        with _io_lock:
+            if PARTITIONED:
+                _write_all_partitions(transactions)
+            else:
+                _write_snapshot(
+                    "transactions", TRANSACTIONS_FILE, transactions,
+                    lambda: {"transactions": [_transaction_to_dict(tx) for tx in transactions]},
+                    compact=JOURNAL_ENABLED,
+                )
+            _snapshot_size = len(transactions)
+            # The snapshot now covers everything in the journal, so it can be dropped,
+            # but only once its rename is on disk: a crash must not leave the old
+            # snapshot without the journal.
+            if _journal_records or TRANSACTIONS_JOURNAL_FILE.exists():
+                _fsync_dir(TRANSACTIONS_PARTITION_DIR if PARTITIONED else TRANSACTIONS_FILE.parent)
+                TRANSACTIONS_JOURNAL_FILE.unlink(missing_ok=True)
+                _journal_records = 0
+        logger.debug(f"Saved {_snapshot_size} transactions to file")
     except Exception as e:
         logger.error(f"Error saving transactions: {e}")
 
 
 def load_transactions() -> List[Transaction]:
-    """Load transactions from transactions.json"""
+    """Load transactions from transactions.json/.bin or the month partitions (journal records are applied by replay_transaction_journal)"""
+    global _snapshot_size
     try:
-        data = deserialize_json(TRANSACTIONS_FILE)
-        transactions = []
-
-        for tx_data in data.get("transactions", []):
-            tx = Transaction(
-                id=tx_data["id"],
-                amount=tx_data["amount"],
-                category=tx_data["category"],
-                date=datetime.fromisoformat(tx_data["date"]).date(),
-                description=tx_data.get("description"),
-                type=TransactionType(tx_data["type"])
-            )
-            transactions.append(tx)
+        transactions = _read_transactions()
+        if PARTITIONED:
+            _index_partitions(transactions)
+        _snapshot_size = len(transactions)
 
         logger.debug(f"Loaded {len(transactions)} transactions from file")
         return transactions
@@ -102,11 +307,290 @@ def load_transactions() -> List[Transaction]:
         return []
 
 
+def _read_transactions() -> List[Transaction]:
+    """The transaction snapshot or month partitions as on disk; changes no module state."""
+    if PARTITIONED and TRANSACTIONS_MANIFEST_FILE.exists():
+        return _read_partitions(sorted(_read_manifest()))
+    return _read_snapshot("transactions", TRANSACTIONS_FILE, _TRANSACTIONS)
+
+
+# --- Month Partitions --- #
+def journal_active() -> bool:
+    """True when new transactions go to the append-only journal."""
+    return JOURNAL_ENABLED and not PARTITIONED
+
+
+def month_key(d: date) -> str:
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def _partition_path(month: str, suffix: str = ".json") -> Path:
+    return TRANSACTIONS_PARTITION_DIR / f"{month}{suffix}"
+
+
+def _month_summary(txs: List[Transaction]) -> Dict[str, Any]:
+    summary = {"count": 0, "income": 0.0, "expense": 0.0}
+    for tx in txs:
+        _add_to_summary(summary, tx)
+    return summary
+
+
+def _add_to_summary(summary: Dict[str, Any], tx: Transaction, sign: int = 1) -> None:
+    summary["count"] += sign
+    if tx.type == TransactionType.INCOME:
+        summary["income"] += sign * tx.amount
+    else:
+        summary["expense"] += sign * abs(tx.amount)
+
+
+def _index_partitions(transactions: List[Transaction]) -> None:
+    """Group transactions by month and recompute the manifest entries, in memory."""
+    _partitions.clear()
+    for tx in transactions:
+        _partitions.setdefault(month_key(tx.date), []).append(tx)
+    _manifest.clear()
+    _manifest.update((month, _month_summary(txs)) for month, txs in _partitions.items())
+
+
+def _write_partition(month: str, txs: List[Transaction]) -> None:
+    TRANSACTIONS_PARTITION_DIR.mkdir(parents=True, exist_ok=True)
+    _write_snapshot(
+        "transactions", _partition_path(month), txs,
+        lambda: {"transactions": [_transaction_to_dict(tx) for tx in txs]},
+        compact=True, bin_path=_partition_path(month, ".bin"),
+    )
+
+
+def _write_manifest(manifest: Dict[str, Dict[str, Any]]) -> None:
+    TRANSACTIONS_PARTITION_DIR.mkdir(parents=True, exist_ok=True)
+    _atomic_write(TRANSACTIONS_MANIFEST_FILE, serialize_data({"partitions": dict(sorted(manifest.items()))}))
+
+
+def _drop_partition(month: str, _txs: List[Transaction] = ()) -> None:
+    for suffix in (".json", ".bin"):
+        _partition_path(month, suffix).unlink(missing_ok=True)
+
+
+def _write_all_partitions(transactions: List[Transaction]) -> None:
+    _index_partitions(transactions)
+    for month, txs in _partitions.items():
+        _write_partition(month, txs)
+    # Months that no longer hold any transaction
+    if TRANSACTIONS_PARTITION_DIR.exists():
+        for path in TRANSACTIONS_PARTITION_DIR.glob("????-??.*"):
+            if path.stem not in _partitions:
+                path.unlink(missing_ok=True)
+    _write_manifest(_manifest)
+
+
+def _record_partitioned(new_txs: List[Transaction], removed: List[Transaction] = ()) -> None:
+    """
+    Remove transactions from and add transactions to their month partitions;
+    only the touched months and the manifest are written. A month left empty
+    loses its file and manifest entry.
+    """
+    touched = set()
+    with _io_lock:
+        for tx in removed:
+            month = month_key(tx.date)
+            txs = _partitions.get(month, [])
+            idx = next((i for i, other in enumerate(txs) if other.id == tx.id), None)
+            if idx is None:
+                continue
+            del txs[idx]
+            _add_to_summary(_manifest[month], tx, sign=-1)
+            touched.add(month)
+        for tx in new_txs:
+            month = month_key(tx.date)
+            _partitions.setdefault(month, []).append(tx)
+            _add_to_summary(_manifest.setdefault(month, {"count": 0, "income": 0.0, "expense": 0.0}), tx)
+            touched.add(month)
+        for month in touched:
+            if not _partitions.get(month):
+                _partitions.pop(month, None)
+                _manifest.pop(month, None)
+    for month in sorted(touched):
+        if month in _partitions:
+            # Edits keep partitions in id order, as they are read back
+            if removed:
+                _partitions[month].sort(key=lambda tx: tx.id)
+            _persist(f"transactions/{month}", partial(_write_partition, month), _partitions[month])
+        else:
+            _persist(f"transactions/{month}", partial(_drop_partition, month), [])
+    _persist("transactions/manifest", _write_manifest, _manifest)
+
+
+def _read_manifest() -> Dict[str, Dict[str, Any]]:
+    return deserialize_json(TRANSACTIONS_MANIFEST_FILE).get("partitions", {})
+
+
+def _read_partitions(months: List[str]) -> List[Transaction]:
+    transactions = []
+    for month in months:
+        transactions.extend(_read_snapshot(
+            "transactions", _partition_path(month), _TRANSACTIONS, bin_path=_partition_path(month, ".bin")))
+    # Partitions are per month; ids restore the insertion order
+    transactions.sort(key=lambda tx: tx.id)
+    return transactions
+
+
+# --- Transaction Journal --- #
+# Journal records only hold JSON-native values, so the plain C encoder suffices
+_JOURNAL_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def _append_journal_records(records: List[Dict[str, Any]]) -> None:
+    global _journal_records
+    encode = _JOURNAL_ENCODER.encode
+    lines = "".join(encode(record) + "\n" for record in records)
+    with _io_lock:
+        created = not TRANSACTIONS_JOURNAL_FILE.exists()
+        with open(TRANSACTIONS_JOURNAL_FILE, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            # On disk before the write is acknowledged, so a crash can't lose it
+            os.fsync(f.fileno())
+        if created:
+            _fsync_dir(TRANSACTIONS_JOURNAL_FILE.parent)
+        _journal_records += len(records)
+
+
+def append_transactions(txs: List[Transaction]) -> None:
+    """Append transaction records to the journal in a single write."""
+    _append_journal_records([{"op": "add", "transaction": _transaction_to_dict(tx)} for tx in txs])
+
+
+def append_transaction(tx: Transaction) -> None:
+    """Append a single transaction record to the journal."""
+    append_transactions([tx])
+
+
+def journal_needs_checkpoint() -> bool:
+    """True once the journal is large enough to be folded into the snapshot."""
+    return _journal_records >= max(JOURNAL_CHECKPOINT_MIN, _snapshot_size)
+
+
+def record_transactions(new_txs: List[Transaction], transactions: List[Transaction]) -> None:
+    """
+    Persist newly added transactions.
+    With month partitions only the touched months are rewritten; in journal
+    mode this is one append (plus an occasional checkpoint), otherwise the
+    whole transactions.json is rewritten once.
+    """
+    if PARTITIONED:
+        _record_partitioned(new_txs)
+        return
+    if not JOURNAL_ENABLED:
+        save_transactions(transactions)
+        return
+    try:
+        append_transactions(new_txs)
+    except Exception as e:
+        logger.error(f"Error appending to transaction journal: {e}")
+        save_transactions(transactions)
+        return
+    if journal_needs_checkpoint():
+        logger.info(f"Checkpointing transaction journal ({_journal_records} records)")
+        save_transactions(transactions)
+
+
+def record_transaction(tx: Transaction, transactions: List[Transaction]) -> None:
+    """Persist a single newly added transaction (see record_transactions)."""
+    record_transactions([tx], transactions)
+
+
+def _record_change(record: Dict[str, Any], removed: List[Transaction], added: List[Transaction],
+                   transactions: List[Transaction]) -> None:
+    """Persist an edit or deletion the same way record_transactions persists inserts."""
+    if PARTITIONED:
+        _record_partitioned(added, removed)
+        return
+    if not JOURNAL_ENABLED:
+        save_transactions(transactions)
+        return
+    try:
+        _append_journal_records([record])
+    except Exception as e:
+        logger.error(f"Error appending to transaction journal: {e}")
+        save_transactions(transactions)
+        return
+    if journal_needs_checkpoint():
+        logger.info(f"Checkpointing transaction journal ({_journal_records} records)")
+        save_transactions(transactions)
+
+
+def record_transaction_update(previous: Transaction, updated: Transaction, transactions: List[Transaction]) -> None:
+    """Persist an edited transaction (one journal record, or its old and new month partitions)."""
+    _record_change({"op": "update", "transaction": _transaction_to_dict(updated)}, [previous], [updated], transactions)
+
+
+def record_transaction_delete(tx: Transaction, transactions: List[Transaction]) -> None:
+    """Persist a deleted transaction (one journal record, or its month partition)."""
+    _record_change({"op": "delete", "id": tx.id}, [tx], [], transactions)
+
+
+def replay_transaction_journal(transactions: List[Transaction]) -> int:
+    """
+    Apply journal records (adds, updates and deletes) on top of a loaded
+    snapshot, in place. Records already present in the snapshot (e.g. after a
+    crash between checkpoint and journal removal) are replaced rather than
+    duplicated, deleting a missing id is a no-op, and a torn trailing record
+    is ignored. Returns the number of records replayed.
+    """
+    global _journal_records
+    _journal_records = _replay_journal(transactions)
+    return _journal_records
+
+
+def _replay_journal(transactions: List[Transaction]) -> int:
+    """replay_transaction_journal without touching the checkpoint counter."""
+    if not TRANSACTIONS_JOURNAL_FILE.exists():
+        return 0
+
+    positions = {tx.id: idx for idx, tx in enumerate(transactions)}
+    replayed = 0
+    with open(TRANSACTIONS_JOURNAL_FILE, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                if record.get("op") == "delete":
+                    tx_id, tx = int(record["id"]), None
+                else:
+                    tx = _transaction_from_dict(record["transaction"])
+                    tx_id = tx.id
+            except Exception as e:
+                logger.warning(f"Skipping unreadable journal record at line {line_no}: {e}")
+                continue
+            if tx is None:
+                # Deleted slots are dropped once the whole journal is applied
+                pos = positions.pop(tx_id, None)
+                if pos is not None:
+                    transactions[pos] = None
+            elif tx_id in positions:
+                transactions[positions[tx_id]] = tx
+            else:
+                positions[tx_id] = len(transactions)
+                transactions.append(tx)
+            replayed += 1
+
+    if len(positions) != len(transactions):
+        transactions[:] = [tx for tx in transactions if tx is not None]
+    logger.debug(f"Replayed {replayed} journal records")
+    return replayed
+
+
 # --- Budget Storage --- #
 def save_budgets(budgets: List[Budget]) -> None:
     """Save budgets to budgets.json"""
+    _persist("budgets", _write_budgets, budgets)
+
+
+def _write_budgets(budgets: List[Budget]) -> None:
     try:
-        data = {
+        _write_snapshot("budgets", BUDGETS_FILE, budgets, lambda: {
             "budgets": [
                 {
                     "id": b.id,
@@ -114,34 +598,21 @@ def save_budgets(budgets: List[Budget]) -> None:
                     "category": b.category,
                     "monthly_limit": b.monthly_limit,
                     "alert_threshold": b.alert_threshold,
-                    "spent_this_month": b.spent_this_month
+                    "spent_this_month": b.spent_this_month,
+                    "version": b.version
                 }
                 for b in budgets
             ]
-        }
-        with open(BUDGETS_FILE, 'w', encoding='utf-8') as f:
-            f.write(serialize_data(data))
+        })
         logger.debug(f"Saved {len(budgets)} budgets to file")
     except Exception as e:
         logger.error(f"Error saving budgets: {e}")
 
 
 def load_budgets() -> List[Budget]:
-    """Load budgets from budgets.json"""
+    """Load budgets from budgets.json or budgets.bin"""
     try:
-        data = deserialize_json(BUDGETS_FILE)
-        budgets = []
-
-        for b_data in data.get("budgets", []):
-            b = Budget(
-                id=b_data["id"],
-                name=b_data["name"],
-                category=b_data["category"],
-                monthly_limit=b_data["monthly_limit"],
-                alert_threshold=b_data["alert_threshold"],
-                spent_this_month=b_data.get("spent_this_month", 0.0)
-            )
-            budgets.append(b)
+        budgets = _read_snapshot("budgets", BUDGETS_FILE, _BUDGETS)
 
         logger.debug(f"Loaded {len(budgets)} budgets from file")
         return budgets
@@ -153,8 +624,12 @@ def load_budgets() -> List[Budget]:
 # --- Goal Storage --- #
 def save_goals(goals: List[Goal]) -> None:
     """Save goals to goals.json"""
+    _persist("goals", _write_goals, goals)
+
+
+def _write_goals(goals: List[Goal]) -> None:
     try:
-        data = {
+        _write_snapshot("goals", GOALS_FILE, goals, lambda: {
             "goals": [
                 {
                     "id": g.id,
@@ -162,34 +637,21 @@ def save_goals(goals: List[Goal]) -> None:
                     "target_amount": g.target_amount,
                     "saved_amount": g.saved_amount,
                     "target_date": g.target_date.isoformat() if g.target_date else None,
-                    "description": g.description
+                    "description": g.description,
+                    "version": g.version
                 }
                 for g in goals
             ]
-        }
-        with open(GOALS_FILE, 'w', encoding='utf-8') as f:
-            f.write(serialize_data(data))
+        })
         logger.debug(f"Saved {len(goals)} goals to file")
     except Exception as e:
         logger.error(f"Error saving goals: {e}")
 
 
 def load_goals() -> List[Goal]:
-    """Load goals from goals.json"""
+    """Load goals from goals.json or goals.bin"""
     try:
-        data = deserialize_json(GOALS_FILE)
-        goals = []
-
-        for g_data in data.get("goals", []):
-            g = Goal(
-                id=g_data["id"],
-                name=g_data["name"],
-                target_amount=g_data["target_amount"],
-                saved_amount=g_data.get("saved_amount", 0.0),
-                target_date=datetime.fromisoformat(g_data["target_date"]).date() if g_data.get("target_date") else None,
-                description=g_data.get("description")
-            )
-            goals.append(g)
+        goals = _read_snapshot("goals", GOALS_FILE, _GOALS)
 
         logger.debug(f"Loaded {len(goals)} goals from file")
         return goals
@@ -201,8 +663,12 @@ def load_goals() -> List[Goal]:
 # --- Notification Storage --- #
 def save_notifications(notifications: List[Notification]) -> None:
     """Save notifications to notifications.json"""
+    _persist("notifications", _write_notifications, notifications)
+
+
+def _write_notifications(notifications: List[Notification]) -> None:
     try:
-        data = {
+        _write_snapshot("notifications", NOTIFICATIONS_FILE, notifications, lambda: {
             "notifications": [
                 {
                     "id": n.id,
@@ -214,30 +680,16 @@ def save_notifications(notifications: List[Notification]) -> None:
                 }
                 for n in notifications
             ]
-        }
-        with open(NOTIFICATIONS_FILE, 'w', encoding='utf-8') as f:
-            f.write(serialize_data(data))
+        })
         logger.debug(f"Saved {len(notifications)} notifications to file")
     except Exception as e:
         logger.error(f"Error saving notifications: {e}")
 
 
 def load_notifications() -> List[Notification]:
-    """Load notifications from notifications.json"""
+    """Load notifications from notifications.json or notifications.bin"""
     try:
-        data = deserialize_json(NOTIFICATIONS_FILE)
-        notifications = []
-
-        for n_data in data.get("notifications", []):
-            n = Notification(
-                id=n_data["id"],
-                notification_type=n_data["notification_type"],
-                title=n_data["title"],
-                message=n_data["message"],
-                created_at=datetime.fromisoformat(n_data["created_at"]),
-                read=n_data.get("read", False)
-            )
-            notifications.append(n)
+        notifications = _read_snapshot("notifications", NOTIFICATIONS_FILE, _NOTIFICATIONS)
 
         logger.debug(f"Loaded {len(notifications)} notifications from file")
         return notifications
@@ -247,20 +699,23 @@ def load_notifications() -> List[Notification]:
 
 
 # --- All Data Export (for RAG) --- #
+def _load_transactions_with_journal() -> List[Transaction]:
+    """
+    Read snapshot + journal as on disk, leaving the live checkpoint counters and
+    partition index alone. Holds the I/O lock, so a checkpoint can't drop the
+    journal between the two reads.
+    """
+    with _io_lock:
+        transactions = _read_transactions()
+        _replay_journal(transactions)
+    return transactions
+
+
 def export_all_data() -> Dict[str, Any]:
     """Export all data in memory as dictionary for RAG ingestion."""
+    flush_pending()
     return {
-        "transactions": [
-            {
-                "id": tx.id,
-                "amount": tx.amount,
-                "category": tx.category,
-                "date": tx.date.isoformat(),
-                "description": tx.description,
-                "type": tx.type.value
-            }
-            for tx in load_transactions()
-        ],
+        "transactions": [_transaction_to_dict(tx) for tx in _load_transactions_with_journal()],
         "budgets": [
             {
                 "id": b.id,
@@ -0,0 +1,149 @@
+"""
+Copy-free read-only snapshots of the transaction list.
+
+storage keeps its transactions in a SlotVector: slots grouped in chunks of
+CHUNK_SIZE, where a deleted transaction leaves None in its slot (a
+tombstone), so no later slot ever moves. Appends fill the last chunk in
+place. An edit or a delete copies only the chunk it touches plus the chunk
+table (copy-on-write), O(CHUNK_SIZE + n / CHUNK_SIZE) instead of O(n).
+
+A FrozenPrefix holds a chunk table together with the slot count and live
+count when the view was taken. Later appends land past that slot count and
+later edits land in new chunks, so the view never changes. It costs nothing
+to create and readers need no lock.
+"""
+from collections.abc import Sequence
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+CHUNK_SIZE = 1024
+
+
+class FrozenPrefix(Sequence):
+    """Immutable view of the first `slots` slots of a SlotVector; tombstones are skipped."""
+
+    __slots__ = ("_chunks", "_slots", "_length")
+
+    def __init__(self, chunks: List[List[Optional[T]]], slots: int, length: int):
+        self._chunks = chunks
+        self._slots = slots
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        i = range(self._length)[index]
+        if self._length == self._slots:
+            # No tombstones: position and slot coincide
+            return self._chunks[i // CHUNK_SIZE][i % CHUNK_SIZE]
+        return next(islice(iter(self), i, None))
+
+    def __iter__(self) -> Iterator[T]:
+        remaining = self._slots
+        # Every chunk but the last is full, and the last may have grown since the view was taken
+        for chunk in self._chunks:
+            if remaining <= 0:
+                break
+            for item in islice(chunk, remaining):
+                if item is not None:
+                    yield item
+            remaining -= CHUNK_SIZE
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"FrozenPrefix({list(self)!r})"
+
+
+class SlotVector(Sequence):
+    """
+    The working list behind FrozenPrefix views. Positions (len, iteration,
+    indexing) count live items only; slots are stable ids for storage's indexes.
+    Writers must be serialized by the caller; readers only ever read `_state`,
+    which every write replaces in one assignment.
+    """
+
+    def __init__(self, items: Iterable[T] = ()):
+        self._state: Tuple[List[List[Optional[T]]], int, int] = ([], 0, 0)  # (chunks, slots, live)
+        self.extend(items)
+
+    def __len__(self) -> int:
+        return self._state[2]
+
+    def __getitem__(self, index):
+        return self.snapshot()[index]
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.snapshot())
+
+    def __repr__(self) -> str:
+        return f"SlotVector({list(self)!r})"
+
+    @property
+    def slot_count(self) -> int:
+        """Slots in use, tombstones included."""
+        return self._state[1]
+
+    def snapshot(self) -> FrozenPrefix:
+        return FrozenPrefix(*self._state)
+
+    def get_slot(self, slot: int) -> Optional[T]:
+        """The item in a slot, or None for a tombstone or a slot not yet used."""
+        chunks, slots, _ = self._state
+        if not 0 <= slot < slots:
+            return None
+        return chunks[slot // CHUNK_SIZE][slot % CHUNK_SIZE]
+
+    # --- Writes --- #
+    def append(self, item: T):
+        self.extend((item,))
+
+    def extend(self, items: Iterable[T]):
+        chunks, slots, live = self._state
+        for item in items:
+            if not chunks or len(chunks[-1]) == CHUNK_SIZE:
+                chunks.append([])
+            chunks[-1].append(item)
+            slots += 1
+            live += 1
+        self._state = (chunks, slots, live)
+
+    def set_slot(self, slot: int, item: Optional[T]) -> Optional[T]:
+        """Replace a slot's item (None deletes it), copying only its chunk and the chunk table. Returns the old item."""
+        chunks, slots, live = self._state
+        if not 0 <= slot < slots:
+            raise IndexError(slot)
+        chunk = chunks[slot // CHUNK_SIZE].copy()
+        previous = chunk[slot % CHUNK_SIZE]
+        chunk[slot % CHUNK_SIZE] = item
+        table = chunks.copy()
+        table[slot // CHUNK_SIZE] = chunk
+        self._state = (table, slots, live + (item is not None) - (previous is not None))
+        return previous
+
+    def compact(self):
+        """Drop the tombstones; every later slot moves, so slot-based indexes must be rebuilt."""
+        items = list(self)
+        self._state = ([], 0, 0)
+        self.extend(items)
+
+    def clear(self):
+        self._state = ([], 0, 0)
+
+    def pop(self, index: int = -1) -> T:
+        """Remove and return the item at a (live) position, leaving a tombstone in its slot."""
+        chunks, slots, live = self._state
+        i = range(live)[index]
+        if live == slots:
+            slot = i
+        else:
+            slot = next(islice((s for s in range(slots) if self.get_slot(s) is not None), i, None))
+        return self.set_slot(slot, None)
@@ -0,0 +1,58 @@
+"""
+Conditional GET support for read routes.
+
+A route passes a storage.data_version() token; the response carries it as a
+strong ETag, and a request whose If-None-Match already names it gets an empty
+304 before the route reads or serializes any data.
+
+Single budgets and goals also carry their entity version as an ETag; a PUT
+sending it back in If-Match only applies if the entity is still at that
+version (compare-and-swap), otherwise it gets a 412.
+"""
+from typing import Optional
+from fastapi import HTTPException, Request, Response
+
+# Clients may reuse a stored response, but only after revalidating it
+CACHE_CONTROL = "no-cache"
+
+
+def etag_for(version: str) -> str:
+    return f'"{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: a W/ prefix is ignored, "*" matches anything."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def if_match_version(request: Request) -> Optional[int]:
+    """
+    The entity version named by If-Match, or None when the header is absent or "*".
+    If-Match uses strong comparison, so a weak or foreign tag can never match: 412.
+    """
+    if_match = (request.headers.get("if-match") or "").strip()
+    if not if_match or if_match == "*":
+        return None
+    tag = if_match.strip('"')
+    if if_match != etag_for(tag) or not tag.isdigit():
+        raise HTTPException(status_code=412, detail="If-Match does not name a current version")
+    return int(tag)
+
+
+def not_modified(request: Request, response: Response, version: str) -> Optional[Response]:
+    """
+    A 304 response if the client already holds `version`, else None after
+    setting the ETag on the route's response.
+    """
+    etag = etag_for(version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return None
@@ -76,6 +76,7 @@ def _build_structured_prompt(
         "- 'ask_budget_status': User wants to know current budget health\n"
         "- 'ask_goal_progress': User wants to know goal progress\n"
         "- 'ask_spending_summary': User wants spending predictions/analysis for future planning\n"
+        "- 'ask_balance': User wants their balance, now or on a past date (extract: optional date)\n"
         "- 'check_spending_ability': User is asking if they can afford something (extract: amount, category)\n"
         "\n=== CRITICAL: OUTPUT FORMAT ===\n"
         "YOU MUST RESPOND WITH ONLY THIS EXACT JSON FORMAT. NO TEXT BEFORE OR AFTER.\n"
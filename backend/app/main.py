@@ -4,7 +4,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import transactions, budgets, goals, summary, chat, agent, rag_routes, notifications
 from app.agents import notification_engine
-from app import rag
+from app import rag, file_storage
 from contextlib import asynccontextmanager
 
 logger = logging.getLogger(__name__)
@@ -24,6 +24,8 @@ async def lifespan(app: FastAPI):
         logger.info("RAG initialized with financial data")
     except Exception as e:
         logger.warning(f"Failed to initialize RAG: {e}")
+    # Chroma and the embedding model load in the background; retrieval uses the in-memory index until then
+    rag.start_warmup()
 
     logger.info("Application startup complete")
     yield
@@ -31,6 +33,9 @@ async def lifespan(app: FastAPI):
     # ✅ Shutdown (optional cleanup)
     logger.info("Application shutting down")
 
+    # Write out anything still pending in write-behind mode
+    file_storage.stop_flusher()
+
 
 app = FastAPI(
     title="budget-assist - backend",
@@ -49,6 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Include API routers
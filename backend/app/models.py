@@ -41,6 +41,8 @@ class BudgetBase(BaseModel):
 class Budget(BudgetBase):
     id: int
     spent_this_month: float = 0.0
+    # Bumped on every update; an update may name the version it was based on (If-Match)
+    version: int = 1
 
     def calculate_budget_used(self) -> float:
         return min(1.0, self.spent_this_month / self.monthly_limit if self.monthly_limit else 0)
@@ -68,6 +70,8 @@ class GoalBase(BaseModel):
 
 class Goal(GoalBase):
     id: int
+    # Bumped on every update; an update may name the version it was based on (If-Match)
+    version: int = 1
 
 class FinancialSummary(BaseModel):
     total_balance: float
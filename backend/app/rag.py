@@ -1,79 +1,422 @@
 """
 RAG implementation with optional Chroma + sentence-transformers integration.
 
-If Chroma and sentence-transformers are installed, this module will use them
-to create and query a vector collection. Otherwise it falls back to the simple
-token-set (Jaccard) in-memory store implemented below.
+Every doc goes into the BM25-ranked in-memory inverted index implemented
+below. If Chroma and sentence-transformers are installed, start_warmup()
+(called at app startup) opens a persistent Chroma collection under
+user_data/chroma and loads the embedding model in a background thread, copies
+the docs over, and from then on retrieval queries the vector collection.
+Until then, or if Chroma is missing or fails, the in-memory index answers.
+Importing this module loads neither library.
 
 Note: This prototype uses an in-process Chroma client (no external server).
 """
-from typing import List, Dict, Any
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Callable, List, Dict, Any, Optional, Tuple
+import hashlib
+import importlib.util
+import json
+import math
 import re
 import logging
+import os
+import threading
+import time
+import numpy as np
+
+from app import file_lock
 
 logger = logging.getLogger(__name__)
 
-try:
-    import chromadb
-    from chromadb.utils import embedding_functions
-    from sentence_transformers import SentenceTransformer
-    _CHROMA_AVAILABLE = True
-except Exception:
-    _CHROMA_AVAILABLE = False
+# Docs encoded (and written to Chroma) per batch
+EMBED_BATCH_SIZE = int(os.getenv("RAG_EMBED_BATCH_SIZE", "64"))
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+# Persistent embedding cache: one matrix + key list per model
+EMBEDDING_CACHE_DIR = Path(os.getenv(
+    "RAG_EMBEDDING_CACHE_DIR", str(Path(__file__).parent.parent / "user_data" / "embeddings")))
+EMBEDDING_CACHE_DTYPE = os.getenv("RAG_EMBEDDING_CACHE_DTYPE", "float32")
+# Query embeddings kept in memory, least recently used first out
+QUERY_CACHE_SIZE = int(os.getenv("RAG_QUERY_CACHE_SIZE", "256"))
+# Persistent Chroma client directory
+CHROMA_DIR = Path(os.getenv("RAG_CHROMA_DIR", str(Path(__file__).parent.parent / "user_data" / "chroma")))
+
+# Only checked here; both are imported by the warm-up thread, since importing them takes seconds
+_CHROMA_AVAILABLE = all(importlib.util.find_spec(name) is not None
+                        for name in ("chromadb", "sentence_transformers"))
+
+
+_TOKEN_RE = re.compile(r"\w+")
 
 
 def _tokenize(text: str) -> List[str]:
-    text = text.lower()
-    tokens = re.findall(r"\w+", text)
-    return tokens
+    return _TOKEN_RE.findall(text.lower())
 
 
 class InMemoryDocStore:
+    """
+    BM25-ranked inverted index.
+
+    Each term maps to a posting list {slot: term frequency}; a doc's slot
+    indexes the per-doc length array. A query only touches the postings of
+    its own terms, compiled to slot-sorted NumPy arrays on first use after a
+    change and scored in vectorized passes; the top k come from a partial
+    sort. Adding a doc under an existing id replaces it.
+
+    Request threads and the warm-up thread write while others query, so every
+    public method holds the store's lock; retrieval also fills the compiled cache.
+    """
+
+    # BM25 parameters (the usual defaults)
+    K1 = 1.2
+    B = 0.75
+    # Postings scored up front per query; longer (common-term) lists are only probed
+    CANDIDATE_LIMIT = 20_000
+
     def __init__(self):
-        self.docs: List[Dict[str, Any]] = []
+        self._docs: List[Optional[Dict[str, Any]]] = []  # slot -> doc (None once removed)
+        self._slots: Dict[str, int] = {}  # doc id -> slot
+        self._free: List[int] = []
+        self._lengths = np.zeros(64, dtype=np.float64)  # slot -> token count
+        self._total_length = 0
+        self._postings: Dict[str, Dict[int, int]] = {}  # term -> {slot: term frequency}
+        self._compiled: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}  # term -> (slots, frequencies)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._slots
 
     def add_document(self, doc_id: str, text: str, metadata: Dict[str, Any] = None):
-        if metadata is None:
-            metadata = {}
-        tokens = set(_tokenize(text))
-        self.docs.append({"id": doc_id, "text": text, "tokens": tokens, "metadata": metadata})
+        with self._lock:
+            if metadata is None:
+                metadata = {}
+            self._drop(doc_id)
+            tokens = _tokenize(text)
+            if self._free:
+                slot = self._free.pop()
+                self._docs[slot] = {"id": doc_id, "text": text, "metadata": metadata}
+            else:
+                slot = len(self._docs)
+                self._docs.append({"id": doc_id, "text": text, "metadata": metadata})
+                if slot == len(self._lengths):
+                    self._lengths = np.concatenate((self._lengths, np.zeros(slot, dtype=np.float64)))
+            self._slots[doc_id] = slot
+            self._lengths[slot] = len(tokens)
+            self._total_length += len(tokens)
+            for term, count in Counter(tokens).items():
+                self._postings.setdefault(term, {})[slot] = count
+                self._compiled.pop(term, None)
+
+    def add_documents(self, docs: List[Dict[str, Any]]):
+        """Add {id, text, metadata?} docs; same as add_document for each."""
+        with self._lock:
+            for d in docs:
+                self.add_document(d["id"], d["text"], d.get("metadata"))
+
+    def documents(self) -> List[Dict[str, Any]]:
+        """Every doc as {id, text, metadata}."""
+        with self._lock:
+            return [d for d in self._docs if d is not None]
+
+    def remove_document(self, doc_id: str) -> bool:
+        """Drop a doc and its postings; False if the id is unknown."""
+        with self._lock:
+            return self._drop(doc_id)
+
+    def _drop(self, doc_id: str) -> bool:
+        slot = self._slots.pop(doc_id, None)
+        if slot is None:
+            return False
+        for term in set(_tokenize(self._docs[slot]["text"])):
+            postings = self._postings[term]
+            del postings[slot]
+            if not postings:
+                del self._postings[term]
+            self._compiled.pop(term, None)
+        self._total_length -= int(self._lengths[slot])
+        self._lengths[slot] = 0
+        self._docs[slot] = None
+        self._free.append(slot)
+        return True
+
+    def _compiled_postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(slots, frequencies) of a term as arrays sorted by slot, rebuilt after the term changes."""
+        compiled = self._compiled.get(term)
+        if compiled is None:
+            postings = self._postings[term]
+            slots = np.fromiter(postings.keys(), dtype=np.intp, count=len(postings))
+            freqs = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            order = np.argsort(slots)
+            compiled = self._compiled[term] = (slots[order], freqs[order])
+        return compiled
+
+    def _bm25(self, freqs: np.ndarray, slots: np.ndarray, idf: float, avg_length: float) -> np.ndarray:
+        norm = self.K1 * (1.0 - self.B + self.B * self._lengths[slots] / avg_length)
+        return idf * freqs * (self.K1 + 1.0) / (freqs + norm)
 
     def retrieve(self, query: str, k: int = 3) -> List[Dict[str, Any]]:
-        qtokens = set(_tokenize(query))
-        scores = []
-        for d in self.docs:
-            inter = len(qtokens & d["tokens"])
-            union = len(qtokens | d["tokens"]) or 1
-            score = inter / union
-            scores.append((score, d))
-        scores.sort(key=lambda x: x[0], reverse=True)
-        return [d for s, d in scores[:k] if s > 0]
+        with self._lock:
+            return self._retrieve(query, k)
+
+    def _retrieve(self, query: str, k: int) -> List[Dict[str, Any]]:
+        # Rarest terms first: they carry most of the score and have the shortest postings
+        terms = sorted((t for t in set(_tokenize(query)) if t in self._postings), key=lambda t: len(self._postings[t]))
+        if not terms or k <= 0:
+            return []
+        n = len(self._slots)
+        avg_length = self._total_length / n or 1.0
+        idfs = {t: math.log(1.0 + (n - len(self._postings[t]) + 0.5) / (len(self._postings[t]) + 0.5)) for t in terms}
+
+        # Candidates are the docs matching the rare terms (up to CANDIDATE_LIMIT postings);
+        # the common terms are only looked up for them. A doc matching none of the rare
+        # terms scores at most the common terms' upper bounds, so if the k-th candidate
+        # beats that, the answer is exact without scanning the long postings.
+        split, size = 0, 0
+        while split < len(terms) and size + len(self._postings[terms[split]]) <= self.CANDIDATE_LIMIT:
+            size += len(self._postings[terms[split]])
+            split += 1
+        if split:
+            slots, scores = self._score_candidates(terms[:split], terms[split:], idfs, avg_length)
+            bound = sum(idfs[t] for t in terms[split:]) * (self.K1 + 1.0)
+            if split == len(terms) or (len(scores) >= k and np.partition(scores, -k)[-k] >= bound):
+                return self._top(slots, scores, k)
+
+        # Only very common terms: score every doc that has any of them
+        dense = np.zeros(len(self._docs), dtype=np.float64)
+        for term in terms:
+            term_slots, freqs = self._compiled_postings(term)
+            dense[term_slots] += self._bm25(freqs, term_slots, idfs[term], avg_length)
+        slots = np.flatnonzero(dense)
+        return self._top(slots, dense[slots], k)
+
+    def _score_candidates(self, rare: List[str], common: List[str], idfs: Dict[str, float],
+                          avg_length: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted slots matching any rare term, with their BM25 scores over all the terms."""
+        parts = [self._compiled_postings(t) for t in rare]
+        weights = [self._bm25(freqs, slots, idfs[t], avg_length) for t, (slots, freqs) in zip(rare, parts)]
+        if len(parts) == 1:
+            slots, scores = parts[0][0], weights[0]
+        else:
+            slots, inverse = np.unique(np.concatenate([slots for slots, _ in parts]), return_inverse=True)
+            scores = np.bincount(inverse, weights=np.concatenate(weights))
+        for term in common:
+            term_slots, freqs = self._compiled_postings(term)
+            pos = np.searchsorted(term_slots, slots).clip(max=len(term_slots) - 1)
+            hit = term_slots[pos] == slots
+            scores = scores + np.where(hit, self._bm25(freqs[pos], slots, idfs[term], avg_length), 0.0)
+        return slots, scores
+
+    def _top(self, slots: np.ndarray, scores: np.ndarray, k: int) -> List[Dict[str, Any]]:
+        top = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+        # Highest score first; ties go to the earlier slot
+        ranked = sorted(top, key=lambda i: (-scores[i], slots[i]))
+        return [self._docs[slots[i]] for i in ranked]
 
 
 # Fallback global store
 _MEMORY_STORE = InMemoryDocStore()
 
 
+class EmbeddingCache:
+    """
+    Content-addressed embeddings of one model, persisted under `directory`.
+
+    `<model>.<dtype>` is a memory-mapped [rows, dim] matrix and `<model>.keys`
+    lists the sha256 of each row's text, one per line in row order, after a
+    `dim N` header. A key is appended only once its row is written and
+    flushed, so a crash can leave an unused row but never a key without its
+    vector. Appends take a file lock and first read the keys other processes
+    added, so workers sharing user_data share the cache.
+    """
+
+    # Rows the matrix file grows by at least
+    MIN_ROWS = 64
+
+    def __init__(self, directory: Path, model_name: str, dtype: str = "float32"):
+        slug = re.sub(r"[^\w.-]+", "_", model_name)
+        self.dtype = np.dtype(dtype)
+        self._matrix_path = directory / f"{slug}.{self.dtype.name}"
+        self._keys_path = directory / f"{slug}.keys"
+        self._lock_path = directory / f"{slug}.lock"
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}  # text hash -> row
+        self._count = 0  # key lines read so far
+        self._keys_offset = 0
+        self._matrix: Optional[np.memmap] = None
+        self.dim = 0
+        self.hits = self.misses = 0
+        with self._lock:
+            self._refresh()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _refresh(self):
+        """Read the keys appended since the last read (by any process)."""
+        if not self._keys_path.exists():
+            return
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            data = f.read()
+        # Whole lines only: another process may be mid-append
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("ascii").splitlines():
+            if line.startswith("dim "):
+                self.dim = int(line[4:])
+                continue
+            self._rows.setdefault(line, self._count)
+            self._count += 1
+        self._keys_offset += end
+
+    def _mapped(self, rows: int) -> np.memmap:
+        """The matrix mapped with at least `rows` rows (remapped if the file grew)."""
+        if self._matrix is None or len(self._matrix) < rows:
+            capacity = self._matrix_path.stat().st_size // (self.dim * self.dtype.itemsize)
+            self._matrix = np.memmap(self._matrix_path, dtype=self.dtype, mode="r+", shape=(capacity, self.dim))
+        return self._matrix
+
+    def _lookup(self, keys: List[str], out: Dict[str, np.ndarray]):
+        rows = [(k, self._rows[k]) for k in keys if k in self._rows and k not in out]
+        if rows:
+            matrix = self._mapped(max(row for _, row in rows) + 1)
+            for k, row in rows:
+                out[k] = np.array(matrix[row], dtype=np.float32)
+
+    def get_many(self, texts: List[str], encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        float32 embeddings of `texts`, one row each. Texts not in the cache
+        are passed to `encode` in one call and their vectors stored.
+        """
+        keys = [self.key(t) for t in texts]
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            self._lookup(keys, found)
+            if len(found) < len(set(keys)):
+                self._refresh()
+                self._lookup(keys, found)
+            missing = list(dict.fromkeys(k for k in keys if k not in found))
+            self.hits += len(keys) - sum(1 for k in keys if k not in found)
+            self.misses += len(missing)
+        if missing:
+            by_key = dict(zip(keys, texts))
+            vectors = np.asarray(encode([by_key[k] for k in missing]), dtype=np.float32)
+            # Return them as stored, so a later hit gives the same vector
+            found.update(zip(missing, vectors.astype(self.dtype).astype(np.float32)))
+            self._store(missing, vectors)
+        return np.stack([found[k] for k in keys]) if keys else np.zeros((0, self.dim), dtype=np.float32)
+
+    def _store(self, keys: List[str], vectors: np.ndarray):
+        self._lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, file_lock.exclusive(self._lock_path):
+            self._refresh()
+            new = [(k, v) for k, v in zip(keys, vectors) if k not in self._rows]
+            if not new:
+                return
+            header = b""
+            if not self.dim:
+                self.dim = vectors.shape[1]
+                header = f"dim {self.dim}\n".encode("ascii")
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding size {vectors.shape[1]} does not match the cache ({self.dim})")
+            needed = self._count + len(new)
+            row_bytes = self.dim * self.dtype.itemsize
+            size = self._matrix_path.stat().st_size if self._matrix_path.exists() else 0
+            if size < needed * row_bytes:
+                with open(self._matrix_path, "ab") as f:
+                    f.truncate(max(needed * 2, self.MIN_ROWS) * row_bytes)
+            matrix = self._mapped(needed)
+            for row, (_, vector) in enumerate(new, start=self._count):
+                matrix[row] = vector
+            matrix.flush()
+            with open(self._keys_path, "ab") as f:
+                f.write(header + "".join(f"{k}\n" for k, _ in new).encode("ascii"))
+            self._refresh()
+
+
+def _load_model(name: str):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name)
+
+
 class ChromaDocStore:
     def __init__(self, collection_name: str = "budget_assist_docs"):
-        # initialize Chroma client and sentence-transformers model
-        self.client = chromadb.Client()
+        import chromadb
+
+        # Persistent client, so the collection survives restarts
+        self.client = chromadb.PersistentClient(path=str(CHROMA_DIR))
         self.collection_name = collection_name
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
-        try:
-            self.collection = self.client.get_collection(collection_name)
-        except Exception:
-            self.collection = self.client.create_collection(collection_name)
+        self._model = None
+        self._model_lock = threading.Lock()
+        self.embeddings = EmbeddingCache(EMBEDDING_CACHE_DIR, EMBEDDING_MODEL, EMBEDDING_CACHE_DTYPE)
+        self._queries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._queries_lock = threading.Lock()
+        self.collection = self.client.get_or_create_collection(collection_name)
+
+    @property
+    def model(self):
+        """The sentence-transformers model, loaded on first use (embedding cache hits never need it)."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = _load_model(EMBEDDING_MODEL)
+        return self._model
+
+    def ids(self) -> List[str]:
+        return self.collection.get(include=[])["ids"]
+
+    def _encode(self, texts: List[str], batch_size: int = None) -> np.ndarray:
+        return self.model.encode(texts, batch_size=batch_size or EMBED_BATCH_SIZE, normalize_embeddings=True)
 
     def add_document(self, doc_id: str, text: str, metadata: Dict[str, Any] = None):
-        if metadata is None:
-            metadata = {}
-        emb = self.model.encode(text).tolist()
-        # Chroma expects list inputs
-        self.collection.add(ids=[doc_id], documents=[text], metadatas=[metadata], embeddings=[emb])
+        self.add_documents([{"id": doc_id, "text": text, "metadata": metadata}])
+
+    def add_documents(self, docs: List[Dict[str, Any]], batch_size: int = None):
+        """
+        Encode and write {id, text, metadata?} docs in batches: one model.encode
+        and one collection.upsert per batch (upsert, so re-adding an id replaces it).
+        Embeddings are L2-normalized, so Chroma's distance ranks by cosine similarity.
+        Texts already in the embedding cache are not encoded again.
+        """
+        batch_size = batch_size or EMBED_BATCH_SIZE
+        for start in range(0, len(docs), batch_size):
+            batch = docs[start:start + batch_size]
+            texts = [d["text"] for d in batch]
+            embeddings = self.embeddings.get_many(texts, lambda missing: self._encode(missing, batch_size))
+            # Chroma rejects empty metadata dicts
+            self.collection.upsert(
+                ids=[d["id"] for d in batch],
+                documents=texts,
+                metadatas=[d.get("metadata") or None for d in batch],
+                embeddings=embeddings.tolist(),
+            )
+
+    def remove_document(self, doc_id: str) -> bool:
+        self.collection.delete(ids=[doc_id])
+        return True
+
+    def _query_embedding(self, query: str) -> List[float]:
+        """Hot queries come from the in-memory LRU, the rest from the embedding cache."""
+        with self._queries_lock:
+            embedding = self._queries.get(query)
+            if embedding is not None:
+                self._queries.move_to_end(query)
+                return embedding
+        embedding = self.embeddings.get_many([query], self._encode)[0].tolist()
+        with self._queries_lock:
+            self._queries[query] = embedding
+            while len(self._queries) > QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+        return embedding
 
     def retrieve(self, query: str, k: int = 3) -> List[Dict[str, Any]]:
-        qemb = self.model.encode(query).tolist()
+        qemb = self._query_embedding(query)
         results = self.collection.query(query_embeddings=[qemb], n_results=k)
         out = []
         # results: dict with ids, distances, metadatas, documents
@@ -85,22 +428,61 @@ class ChromaDocStore:
         return out
 
 
-# Choose store implementation
-_DOC_STORE = None
-if _CHROMA_AVAILABLE:
-    try:
-        _DOC_STORE = ChromaDocStore()
-    except Exception as e:
-        logging.warning("Chroma initialization failed, falling back to in-memory store: %s", e)
-        _DOC_STORE = _MEMORY_STORE
-else:
-    _DOC_STORE = _MEMORY_STORE
+# Set by warm_up() once the Chroma collection holds every doc; until then retrieval uses _MEMORY_STORE
+_VECTOR_STORE: Optional[ChromaDocStore] = None
+
+
+# doc id -> hash of the text and metadata last written to the stores
+_DOC_HASHES: Dict[str, str] = {}
+# Diffing against _DOC_HASHES and writing the store must not interleave between requests
+_SYNC_LOCK = threading.Lock()
+# Id prefixes of the docs generated from storage; full syncs delete the stale ones
+_GENERATED_PREFIXES = ("budget_", "goal_")
 
 
-def add_financial_docs(docs: List[Dict[str, Any]]):
-    """Add docs where each doc is {id, text, metadata?}. Uses Chroma if available."""
-    for d in docs:
-        _DOC_STORE.add_document(d.get("id"), d.get("text"), d.get("metadata"))
+def _doc_hash(text: str, metadata: Dict[str, Any]) -> str:
+    payload = json.dumps([text, metadata], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _upsert_docs(docs: List[Dict[str, Any]]) -> int:
+    """Write the docs whose text or metadata changed since last written, in one batched call; returns how many."""
+    with _SYNC_LOCK:
+        # By id: the last of repeated ids wins
+        latest = {d.get("id"): {"id": d.get("id"), "text": d.get("text"), "metadata": d.get("metadata") or {}}
+                  for d in docs}
+        digests = {doc_id: _doc_hash(doc["text"], doc["metadata"]) for doc_id, doc in latest.items()}
+        changed = {doc_id: doc for doc_id, doc in latest.items() if _DOC_HASHES.get(doc_id) != digests[doc_id]}
+        if changed:
+            _MEMORY_STORE.add_documents(list(changed.values()))
+            if _VECTOR_STORE is not None:
+                _VECTOR_STORE.add_documents(list(changed.values()))
+            _DOC_HASHES.update((doc_id, digests[doc_id]) for doc_id in changed)
+    return len(changed)
+
+
+def _remove_docs(doc_ids: List[str]):
+    with _SYNC_LOCK:
+        for doc_id in doc_ids:
+            _MEMORY_STORE.remove_document(doc_id)
+            if _VECTOR_STORE is not None:
+                _VECTOR_STORE.remove_document(doc_id)
+            _DOC_HASHES.pop(doc_id, None)
+
+
+def add_financial_docs(docs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Add docs where each doc is {id, text, metadata?}. Once Chroma is warm they
+    are also encoded into it, in batches of EMBED_BATCH_SIZE. An existing id is replaced, and a
+    doc identical to what is stored is skipped.
+    Returns {"written", "seconds", "docs_per_sec"} for the ingestion.
+    """
+    started = time.perf_counter()
+    written = _upsert_docs(docs)
+    seconds = time.perf_counter() - started
+    rate = written / seconds if written and seconds > 0 else 0.0
+    logger.info(f"Ingested {written} of {len(docs)} RAG documents in {seconds:.3f}s ({rate:.1f} docs/sec)")
+    return {"written": written, "seconds": round(seconds, 4), "docs_per_sec": round(rate, 1)}
 
 
 def retrieve_context(query: str, k: int = 3) -> List[Dict[str, Any]]:
@@ -108,111 +490,168 @@ def retrieve_context(query: str, k: int = 3) -> List[Dict[str, Any]]:
     Retrieve relevant documents matching the query.
     Returns list of dicts with 'id', 'text', and 'metadata' keys.
     """
-    hits = _DOC_STORE.retrieve(query, k=k)
+    store = _VECTOR_STORE if _VECTOR_STORE is not None else _MEMORY_STORE
+    hits = store.retrieve(query, k=k)
     return hits
 
 
-def initialize_with_financial_data():
+def warm_up() -> bool:
     """
-    Populate RAG with current financial data from storage.
-    Called at app startup to seed the vector DB.
+    Open the persistent Chroma collection, load the embedding model, copy the
+    docs written so far into it and switch retrieval over to it. Returns
+    False (retrieval stays in memory) if Chroma is unavailable or fails.
     """
-    from app import storage
+    global _VECTOR_STORE
+    if not _CHROMA_AVAILABLE:
+        return False
+    started = time.perf_counter()
+    try:
+        store = ChromaDocStore()
+        store.model  # load it now, not on the first query
+        # Encode outside the sync lock, so syncs are not held up by the model...
+        snapshot = {d["id"]: d for d in _MEMORY_STORE.documents()}
+        store.add_documents(list(snapshot.values()))
+        with _SYNC_LOCK:
+            # ...then catch up with what was written meanwhile, and drop generated docs
+            # persisted by an earlier run whose entity is gone
+            current = _MEMORY_STORE.documents()
+            store.add_documents([d for d in current if snapshot.get(d["id"]) != d])
+            for doc_id in store.ids():
+                if doc_id.startswith(_GENERATED_PREFIXES) and doc_id not in _MEMORY_STORE:
+                    store.remove_document(doc_id)
+            _VECTOR_STORE = store
+    except Exception as e:
+        logger.warning("Chroma warm-up failed, staying on the in-memory store: %s", e)
+        return False
+    logger.info(f"Chroma RAG store ready in {time.perf_counter() - started:.1f}s ({len(current)} documents)")
+    return True
 
-    docs_to_add = []
 
-    logger.info("Initializing RAG with financial data...")
+def start_warmup() -> Optional[threading.Thread]:
+    """Run warm_up() in a background thread (called at app startup); None if Chroma is not installed."""
+    if not _CHROMA_AVAILABLE:
+        return None
+    thread = threading.Thread(target=warm_up, name="rag-warmup", daemon=True)
+    thread.start()
+    return thread
+
 
-    # Add budgets as documents
-    for budget in storage.budgets:
-        doc_id = f"budget_{budget.id}"
-        text = (
+def _budget_doc(budget) -> Dict[str, Any]:
+    return {
+        "id": f"budget_{budget.id}",
+        "text": (
             f"Budget: {budget.name}. "
             f"Monthly limit: ${budget.monthly_limit}. "
             f"Alert threshold: {budget.alert_threshold * 100:.0f}%. "
             f"Category: {getattr(budget, 'category', budget.name)}"
-        )
-        docs_to_add.append({
-            "id": doc_id,
-            "text": text,
-            "metadata": {
-                "type": "budget",
-                "budget_id": budget.id,
-                "name": budget.name,
-                "category": getattr(budget, 'category', budget.name)
-            }
-        })
-
-    # Add goals as documents
-    for goal in storage.goals:
-        doc_id = f"goal_{goal.id}"
-        text = (
-            f"Goal: {goal.name}. "
-            f"Target amount: ${goal.target_amount}. "
-            f"Currently saved: ${goal.saved_amount}. "
-            f"Progress: {goal.saved_amount/goal.target_amount*100:.0f}%"
-        )
-        if goal.target_date:
-            text += f". Target date: {goal.target_date}"
-
-        docs_to_add.append({
-            "id": doc_id,
-            "text": text,
-            "metadata": {
-                "type": "goal",
-                "goal_id": goal.id,
-                "name": goal.name,
-                "target_date": str(goal.target_date) if goal.target_date else None
-            }
-        })
-
-    # Add financial summary as a document
-    summary = storage.get_financial_summary()
+        ),
+        "metadata": {
+            "type": "budget",
+            "budget_id": budget.id,
+            "name": budget.name,
+            "category": getattr(budget, 'category', budget.name)
+        }
+    }
+
+
+def _goal_doc(goal) -> Dict[str, Any]:
     text = (
-        f"Financial summary: "
-        f"Total income: ${summary.total_income}. "
-        f"Total expenses: ${summary.total_expense}. "
-        f"Balance: ${summary.total_balance}. "
-        f"Number of transactions: {summary.transactions_count}"
+        f"Goal: {goal.name}. "
+        f"Target amount: ${goal.target_amount}. "
+        f"Currently saved: ${goal.saved_amount}. "
+        f"Progress: {goal.saved_amount/goal.target_amount*100:.0f}%"
     )
-    docs_to_add.append({
-        "id": "summary_current",
+    if goal.target_date:
+        text += f". Target date: {goal.target_date}"
+    return {
+        "id": f"goal_{goal.id}",
         "text": text,
+        "metadata": {
+            "type": "goal",
+            "goal_id": goal.id,
+            "name": goal.name,
+            "target_date": str(goal.target_date) if goal.target_date else None
+        }
+    }
+
+
+def _summary_doc(summary) -> Dict[str, Any]:
+    return {
+        "id": "summary_current",
+        "text": (
+            f"Financial summary: "
+            f"Total income: ${summary.total_income}. "
+            f"Total expenses: ${summary.total_expense}. "
+            f"Balance: ${summary.total_balance}. "
+            f"Number of transactions: {summary.transactions_count}"
+        ),
         "metadata": {
             "type": "summary",
             "total_income": summary.total_income,
             "total_expense": summary.total_expense,
             "total_balance": summary.total_balance
         }
-    })
+    }
 
-    # Add default financial rules/policies
-    docs_to_add.append({
+
+# Default financial rules/policies
+_RULE_DOCS = [
+    {
         "id": "rule_budget_threshold",
         "text": "Budget alerts are triggered when spending reaches the alert threshold (typically 80% of limit). "
                 "Critical alerts when spending exceeds the budget limit.",
         "metadata": {"type": "rule", "name": "budget_threshold"}
-    })
-
-    docs_to_add.append({
+    },
+    {
         "id": "rule_transaction_alerts",
         "text": "Large transactions over $500 trigger notifications. "
                 "You are also alerted if your balance goes negative.",
         "metadata": {"type": "rule", "name": "transaction_alerts"}
-    })
+    },
+]
+
+
+def initialize_with_financial_data():
+    """
+    Populate RAG with current financial data from storage.
+    Called at app startup to seed the vector DB, and by sync_financial_data():
+    only docs that changed are written, and budget/goal docs whose entity no
+    longer exists are deleted.
+    """
+    from app import storage
+
+    logger.info("Initializing RAG with financial data...")
+
+    docs = [_budget_doc(b) for b in storage.list_budgets()]
+    docs += [_goal_doc(g) for g in storage.list_goals()]
+    docs.append(_summary_doc(storage.get_financial_summary()))
+    docs += _RULE_DOCS
+
+    current = {d["id"] for d in docs}
+    stale = [doc_id for doc_id in list(_DOC_HASHES)
+             if doc_id.startswith(_GENERATED_PREFIXES) and doc_id not in current]
+    _remove_docs(stale)
+    written = _upsert_docs(docs)
+    logger.info(f"Initialized RAG with {len(docs)} documents ({written} written, {len(stale)} removed)")
 
-    if docs_to_add:
-        add_financial_docs(docs_to_add)
-        logger.info(f"Initialized RAG with {len(docs_to_add)} documents")
 
-def sync_financial_data():
+def sync_financial_data(budget=None, goal=None):
     """
     Refresh RAG with latest financial data.
-    Call after budget/goal updates to keep context fresh.
+    Call after budget/goal updates to keep context fresh: pass the budget or
+    goal that changed to rewrite only its doc; with neither, every doc is
+    rebuilt and the changed ones written.
     """
-    # For now, we reinitialize. In production, could do partial updates.
-    logger.info("Syncing financial data to RAG...")
-    initialize_with_financial_data()
+    if budget is None and goal is None:
+        logger.info("Syncing financial data to RAG...")
+        initialize_with_financial_data()
+        return
+    docs = []
+    if budget is not None:
+        docs.append(_budget_doc(budget))
+    if goal is not None:
+        docs.append(_goal_doc(goal))
+    _upsert_docs(docs)
 
 
 def format_context_for_prompt(documents: List[Dict[str, Any]]) -> str:
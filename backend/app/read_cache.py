@@ -0,0 +1,97 @@
+"""
+Invalidation-aware cache for derived reads (financial summary, chart ranges).
+
+storage keeps one ReadCache and tells it exactly what changed: the summary is
+dropped when transactions, budgets or goals are written, and a chart range is
+dropped only when a transaction dated inside it is written. Chart ranges are
+kept in LRU order up to a fixed bound.
+
+Every invalidation bumps a generation; a value computed while an invalidation
+happened is returned to its caller but not stored, so a slow reader can never
+put stale data back into the cache.
+"""
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple
+
+# Collections whose writes change the financial summary
+SUMMARY_DEPENDS_ON = frozenset({"transactions", "budgets", "goals"})
+
+
+class ReadCache:
+    """Cached summary plus an LRU of chart results keyed by (start, end, variant)."""
+
+    def __init__(self, max_ranges: int = 128):
+        self.max_ranges = max_ranges
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._summary: Any = None
+        self._summary_key: Hashable = None
+        self._charts: "OrderedDict[Tuple[date, date, Hashable], Any]" = OrderedDict()
+        self._stats = {"summary_hits": 0, "summary_misses": 0, "chart_hits": 0, "chart_misses": 0}
+
+    # --- Reads --- #
+    def summary(self, compute: Callable[[], Any], key: Hashable = None) -> Any:
+        """The cached summary if it was computed under the same `key` (e.g. the current month)."""
+        with self._lock:
+            if self._summary is not None and self._summary_key == key:
+                self._stats["summary_hits"] += 1
+                return self._summary
+            self._stats["summary_misses"] += 1
+            generation = self._generation
+        value = compute()
+        with self._lock:
+            if generation == self._generation:
+                self._summary, self._summary_key = value, key
+        return value
+
+    def chart(self, start: date, end: date, compute: Callable[[], Any], variant: Hashable = None) -> Any:
+        key = (start, end, variant)
+        with self._lock:
+            value = self._charts.get(key)
+            if value is not None:
+                self._charts.move_to_end(key)
+                self._stats["chart_hits"] += 1
+                return value
+            self._stats["chart_misses"] += 1
+            generation = self._generation
+        value = compute()
+        with self._lock:
+            if generation == self._generation:
+                self._charts[key] = value
+                while len(self._charts) > self.max_ranges:
+                    self._charts.popitem(last=False)
+        return value
+
+    # --- Invalidation --- #
+    def collections_changed(self, collections: Iterable[str]):
+        """Drop the summary if any of the written collections feeds it."""
+        if SUMMARY_DEPENDS_ON.isdisjoint(collections):
+            return
+        with self._lock:
+            self._generation += 1
+            self._summary = None
+
+    def transactions_changed(self, dates: Iterable[date]):
+        """Drop the chart ranges containing any of the dates of written transactions."""
+        dates = sorted(set(dates))
+        if not dates:
+            return
+        with self._lock:
+            self._generation += 1
+            for start, end, variant in list(self._charts):
+                i = bisect_left(dates, start)
+                if i < len(dates) and dates[i] <= end:
+                    del self._charts[(start, end, variant)]
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._summary = None
+            self._charts.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, chart_ranges=len(self._charts))
@@ -0,0 +1,159 @@
+"""
+Income/expense rollups by calendar period, for the financial chart.
+
+storage keeps one TimeRollups next to `storage.transactions`. Each insert
+adds its amount to a daily, weekly (Monday-based), monthly and yearly bucket
+keyed by the real period, so Jan 2025 and Jan 2026 stay apart. Range queries
+read buckets only: whole periods come straight from their bucket, and the
+partial periods at the edges of a range are summed from years, months and
+days, so a query costs O(number of buckets), never O(transactions).
+"""
+import calendar
+from datetime import date
+from typing import Dict, Iterator, List, Tuple
+
+GRANULARITIES = ("day", "week", "month", "year")
+
+
+def _week_key(ordinal: int) -> int:
+    """Ordinal of the Monday starting the week (ordinal 1, 0001-01-01, is a Monday)."""
+    return ordinal - (ordinal - 1) % 7
+
+
+def _month_key(d: date) -> int:
+    return d.year * 12 + d.month - 1
+
+
+def _month_end(d: date) -> date:
+    return date(d.year, d.month, calendar.monthrange(d.year, d.month)[1])
+
+
+def _period_bounds(d: date, granularity: str) -> Tuple[date, date]:
+    """First and last day of the period containing d."""
+    if granularity == "day":
+        return d, d
+    if granularity == "week":
+        monday = _week_key(d.toordinal())
+        return date.fromordinal(monday), date.fromordinal(min(monday + 6, date.max.toordinal()))
+    if granularity == "month":
+        return d.replace(day=1), _month_end(d)
+    if granularity == "year":
+        return date(d.year, 1, 1), date(d.year, 12, 31)
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def _period_label(d: date, granularity: str) -> str:
+    if granularity == "day":
+        return d.isoformat()
+    if granularity == "week":
+        year, week, _ = d.isocalendar()
+        return f"{year}-W{week:02d}"
+    if granularity == "month":
+        return f"{d.year}-{d.month:02d}"
+    return str(d.year)
+
+
+def period_count(start: date, end: date, granularity: str) -> int:
+    """Number of periods a series from start to end (inclusive) has."""
+    if end < start:
+        return 0
+    if granularity == "day":
+        return end.toordinal() - start.toordinal() + 1
+    if granularity == "week":
+        return (_week_key(end.toordinal()) - _week_key(start.toordinal())) // 7 + 1
+    if granularity == "month":
+        return _month_key(end) - _month_key(start) + 1
+    if granularity == "year":
+        return end.year - start.year + 1
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def periods(start: date, end: date, granularity: str) -> Iterator[Tuple[str, date, date, bool]]:
+    """
+    (label, start, end, whole) for each period overlapping start..end, empty
+    periods included, with start/end clipped to the range; whole is False for
+    periods the range cuts.
+    """
+    d = start
+    while d <= end:
+        first, last = _period_bounds(d, granularity)
+        clipped_start, clipped_end = max(first, start), min(last, end)
+        yield _period_label(first, granularity), clipped_start, clipped_end, (clipped_start, clipped_end) == (first, last)
+        if last >= date.max:
+            break
+        d = date.fromordinal(last.toordinal() + 1)
+
+
+class TimeRollups:
+    """[income, expense] per day, week, month and year; expenses count by absolute value."""
+
+    def __init__(self):
+        self._buckets: Dict[str, Dict[int, List[float]]] = {g: {} for g in GRANULARITIES}
+
+    def clear(self):
+        for buckets in self._buckets.values():
+            buckets.clear()
+
+    def add(self, d: date, income: float, expense: float):
+        """Add amounts dated d to every resolution (pass negated amounts to remove them)."""
+        ordinal = d.toordinal()
+        for granularity, key in (("day", ordinal), ("week", _week_key(ordinal)),
+                                 ("month", _month_key(d)), ("year", d.year)):
+            bucket = self._buckets[granularity].get(key)
+            if bucket is None:
+                self._buckets[granularity][key] = [income, expense]
+            else:
+                bucket[0] += income
+                bucket[1] += expense
+
+    def _bucket(self, granularity: str, key: int) -> List[float]:
+        return self._buckets[granularity].get(key) or [0.0, 0.0]
+
+    def range_total(self, start: date, end: date) -> Tuple[float, float]:
+        """(income, expense) dated between start and end inclusive, from the coarsest buckets that fit."""
+        income = expense = 0.0
+        ordinal, last = start.toordinal(), end.toordinal()
+        while ordinal <= last:
+            d = date.fromordinal(ordinal)
+            year_end = date(d.year, 12, 31).toordinal()
+            month_end = _month_end(d).toordinal()
+            if d.month == 1 and d.day == 1 and year_end <= last:
+                bucket, ordinal = self._bucket("year", d.year), year_end + 1
+            elif d.day == 1 and month_end <= last:
+                bucket, ordinal = self._bucket("month", _month_key(d)), month_end + 1
+            else:
+                bucket, ordinal = self._bucket("day", ordinal), ordinal + 1
+            income += bucket[0]
+            expense += bucket[1]
+        return income, expense
+
+    def series(self, start: date, end: date, granularity: str) -> List[Dict]:
+        """
+        One row per period overlapping start..end, empty periods included:
+        {"period", "start", "end", "income", "expense"}, with start/end clipped to the range.
+        """
+        rows = []
+        for label, clipped_start, clipped_end, whole in periods(start, end, granularity):
+            if whole:
+                key = {"day": clipped_start.toordinal(), "week": clipped_start.toordinal(),
+                       "month": _month_key(clipped_start), "year": clipped_start.year}[granularity]
+                income, expense = self._bucket(granularity, key)
+            else:
+                income, expense = self.range_total(clipped_start, clipped_end)
+            rows.append({
+                "period": label,
+                "start": clipped_start,
+                "end": clipped_end,
+                "income": income,
+                "expense": expense,
+            })
+        return rows
+
+    def month_of_year(self, start: date, end: date) -> Tuple[List[float], List[float]]:
+        """Income and expense per month-of-year (index 0 = Jan) between start and end, all years combined."""
+        income, expense = [0.0] * 12, [0.0] * 12
+        for row in self.series(start, end, "month"):
+            month = row["start"].month - 1
+            income[month] += row["income"]
+            expense[month] += row["expense"]
+        return income, expense
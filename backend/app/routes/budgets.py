@@ -1,6 +1,9 @@
-from fastapi import APIRouter
+from datetime import date
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List
-from app import storage, models, rag
+from app import file_storage, storage, models, rag
+from app.errors import VersionConflictError
+from app.http_cache import etag_for, if_match_version, not_modified
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,22 +16,34 @@ def create_budget(budget: models.BudgetBase):
     created = storage.add_budget(budget)
     # Sync RAG with updated budget data
     try:
-        rag.sync_financial_data()
+        rag.sync_financial_data(budget=created)
         logger.info(f"RAG synced after budget creation: {created.name}")
     except Exception as e:
         logger.warning(f"Failed to sync RAG after budget creation: {e}")
     return created
 
 @router.get("/", response_model=List[models.Budget])
-def get_budgets():
+def get_budgets(request: Request, response: Response):
+    # Spending comes from this month's transactions, so a new month is a new version too
+    version = f"{storage.data_version('budgets', 'transactions')}-{file_storage.month_key(date.today())}"
+    unchanged = not_modified(request, response, version)
+    if unchanged:
+        return unchanged
     return storage.list_budgets()
 
 @router.put("/{budget_id}", response_model=models.Budget)
-def update_budget(budget_id: int, budget: models.BudgetBase):
-    updated = storage.update_budget(budget_id, budget)
+def update_budget(budget_id: int, budget: models.BudgetBase, request: Request, response: Response):
+    # If-Match: "<version>" turns the update into a compare-and-swap
+    try:
+        updated = storage.update_budget(budget_id, budget, expected_version=if_match_version(request))
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Budget not found")
+    response.headers["ETag"] = etag_for(str(updated.version))
     # Sync RAG with updated budget data
     try:
-        rag.sync_financial_data()
+        rag.sync_financial_data(budget=updated)
         logger.info(f"RAG synced after budget update: {updated.name}")
     except Exception as e:
         logger.warning(f"Failed to sync RAG after budget update: {e}")
@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List
 from app import storage, models, rag
+from app.errors import VersionConflictError
+from app.http_cache import etag_for, if_match_version, not_modified
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,22 +15,32 @@ def create_goal(goal: models.GoalBase):
     created = storage.add_goal(goal)
     # Sync RAG with updated goal data
     try:
-        rag.sync_financial_data()
+        rag.sync_financial_data(goal=created)
         logger.info(f"RAG synced after goal creation: {created.name}")
     except Exception as e:
         logger.warning(f"Failed to sync RAG after goal creation: {e}")
     return created
 
 @router.get("/", response_model=List[models.Goal])
-def get_goals():
+def get_goals(request: Request, response: Response):
+    unchanged = not_modified(request, response, storage.data_version("goals"))
+    if unchanged:
+        return unchanged
     return storage.list_goals()
 
 @router.put("/{goal_id}", response_model=models.Goal)
-def update_goal(goal_id: int, goal: models.GoalBase):
-    updated = storage.update_goal(goal_id, goal)
+def update_goal(goal_id: int, goal: models.GoalBase, request: Request, response: Response):
+    # If-Match: "<version>" turns the update into a compare-and-swap
+    try:
+        updated = storage.update_goal(goal_id, goal, expected_version=if_match_version(request))
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Goal not found")
+    response.headers["ETag"] = etag_for(str(updated.version))
     # Sync RAG with updated goal data
     try:
-        rag.sync_financial_data()
+        rag.sync_financial_data(goal=updated)
         logger.info(f"RAG synced after goal update: {updated.name}")
     except Exception as e:
         logger.warning(f"Failed to sync RAG after goal update: {e}")
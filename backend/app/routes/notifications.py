@@ -1,13 +1,17 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List
-from app.storage import list_notifications, mark_read
+from app.storage import data_version, list_notifications, mark_read
 from app.models import Notification
+from app.http_cache import not_modified
 
 router = APIRouter()
 
 @router.get("", include_in_schema=False, response_model=List[Notification])
 @router.get("/", response_model=List[Notification])
-def get_notifications():
+def get_notifications(request: Request, response: Response):
+    unchanged = not_modified(request, response, data_version("notifications"))
+    if unchanged:
+        return unchanged
     return list_notifications()
 
 @router.post("/{notification_id}}/read")
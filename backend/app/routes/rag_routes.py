@@ -10,9 +10,9 @@ router = APIRouter()
 
 @router.post("/docs/add")
 def add_docs(docs: List[Dict]):
-    rag.add_financial_docs(docs)
+    stats = rag.add_financial_docs(docs)
     logger.info(f"Added {len(docs)} documents to RAG")
-    return {"ok": True, "added": len(docs)}
+    return {"ok": True, "added": len(docs), **stats}
 
 
 @router.get("/docs/retrieve")
@@ -48,6 +48,6 @@ def add_policies(policies: List[Dict]):
             "metadata": metadata
         })
 
-    rag.add_financial_docs(formatted_policies)
+    stats = rag.add_financial_docs(formatted_policies)
     logger.info(f"Added {len(formatted_policies)} policies to RAG")
-    return {"ok": True, "added": len(formatted_policies)}
+    return {"ok": True, "added": len(formatted_policies), **stats}
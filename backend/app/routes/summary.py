@@ -1,14 +1,53 @@
 from datetime import date
-from fastapi import APIRouter
-from app import storage, models
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Request, Response
+from app import file_storage, storage, models
+from app.http_cache import not_modified
+from app.rollups import period_count
 
 router = APIRouter()
 
+# Rows a single granular chart request may return
+MAX_CHART_PERIODS = 5000
+
 
 @router.get("/", response_model=models.FinancialSummary)
-def get_summary():
+def get_summary(request: Request, response: Response):
+    # Budget spend in the summary is this month's, so a new month is a new version too
+    version = f"{storage.data_version('transactions', 'budgets', 'goals')}-{file_storage.month_key(date.today())}"
+    unchanged = not_modified(request, response, version)
+    if unchanged:
+        return unchanged
     return storage.get_financial_summary()
 
 @router.get("/financial-chart")
-def financial_chart(start: date, end: date):
-    return storage.get_monthly_income_expense(start, end)
\ No newline at end of file
+def financial_chart(start: date, end: date, granularity: Optional[Literal["day", "week", "month", "year"]] = None):
+    """
+    Income and expense between start and end.
+
+    Without `granularity`, one row per month name (Jan..Dec) with all years in
+    the range combined, as before. With it, one row per calendar period, e.g.
+    granularity=month over 2025-06-01..2026-05-31 gives 2025-06 .. 2026-05.
+    """
+    if granularity is None:
+        return storage.get_monthly_income_expense(start, end)
+    if period_count(start, end, granularity) > MAX_CHART_PERIODS:
+        raise HTTPException(status_code=400, detail=f"Range spans more than {MAX_CHART_PERIODS} {granularity}s")
+    return storage.get_income_expense_series(start, end, granularity)
+
+@router.get("/balance")
+def balance_as_of(as_of: date):
+    """Balance (income minus expenses) over transactions dated on or before `as_of`."""
+    return {"as_of": as_of, "balance": storage.get_balance_as_of(as_of)}
+
+
+@router.get("/net-flow")
+def net_flow(start: date, end: date):
+    """Income, expense and net over transactions dated between start and end (inclusive)."""
+    return {"start": start, "end": end, **storage.get_net_flow(start, end)}
+
+
+@router.get("/cache-stats")
+def cache_stats():
+    """Hit/miss counters of the summary and chart cache."""
+    return storage.read_cache_stats()
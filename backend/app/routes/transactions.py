@@ -1,36 +1,314 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter, ValidationError
+from typing import List, Literal, Optional, Dict, Any, AsyncIterator, Tuple
+from datetime import date
 from app import storage
 from app import models
 from app.agents import eventing
+import base64
+import binascii
+import csv
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Rows validated and persisted together during a bulk import
+IMPORT_CHUNK_SIZE = 5000
+# Row errors echoed back in the import response
+MAX_REPORTED_ERRORS = 50
+CSV_FIELDS = ["amount", "category", "date", "description", "type"]
+
+# Page size when filtering or paging without an explicit limit
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+_TRANSACTION_LIST = TypeAdapter(List[models.TransactionBase])
+
 
 @router.post("/", response_model=models.Transaction)
 def create_transaction(tx: models.TransactionBase):
     created = storage.add_transaction(tx)
 
-    payload = {
-        "id": created.id,
-        "amount": created.amount,
-        "category": created.category,
-        "type": created.type,
-        "date": created.date,
-        "description": created.description,
-    }
-
     logger.info(f"Emitting transaction.created event for transaction {created.id}")
 
     # Emit event for new transaction
-    eventing.emit("transaction.created", payload)
+    eventing.emit("transaction.created", _event_payload(created))
 
     return created
 
 
+@router.get("/{tx_id}", response_model=models.Transaction)
+def get_transaction(tx_id: int):
+    tx = storage.get_transaction(tx_id)
+    if tx is None:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+    return tx
+
+
+@router.put("/{tx_id}", response_model=models.Transaction)
+def update_transaction(tx_id: int, tx: models.TransactionBase):
+    try:
+        # The previous row comes from the same locked write, so a concurrent edit can't slip in between
+        previous, updated = storage.update_transaction(tx_id, tx)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+
+    logger.info(f"Emitting transaction.updated event for transaction {updated.id}")
+    eventing.emit("transaction.updated", {**_event_payload(updated), "previous": _event_payload(previous)})
+    return updated
+
+
+@router.delete("/{tx_id}")
+def delete_transaction(tx_id: int):
+    try:
+        deleted = storage.delete_transaction(tx_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Transaction not found")
+
+    logger.info(f"Emitting transaction.deleted event for transaction {deleted.id}")
+    eventing.emit("transaction.deleted", _event_payload(deleted))
+    return {"ok": True}
+
+
+def _event_payload(tx: models.Transaction) -> Dict[str, Any]:
+    return {
+        "id": tx.id,
+        "amount": tx.amount,
+        "category": tx.category,
+        "type": tx.type,
+        "date": tx.date,
+        "description": tx.description,
+    }
+
+
 @router.get("/", response_model=List[models.Transaction])
-def get_transactions():
-    return storage.list_transactions()
+def get_transactions(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    category: Optional[str] = None,
+    type: Optional[models.TransactionType] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    order: Literal["asc", "desc"] = "asc",
+):
+    """
+    List transactions.
+
+    Without parameters every transaction is returned, as before. With `limit`,
+    `cursor` or any filter, one page is returned in (date, id) order and the
+    cursor for the next page is sent in the `X-Next-Cursor` header (absent on
+    the last page). Pass it back as `cursor` with the same filters.
+
+    Example:
+        GET /api/v1/transactions/?category=groceries&start_date=2025-12-01&limit=50
+    """
+    filters = (cursor, start_date, end_date, category, type, min_amount, max_amount)
+    if limit is None and order == "asc" and all(f is None for f in filters):
+        return storage.list_transactions()
+
+    page, next_key = storage.list_transactions_page(
+        limit or DEFAULT_PAGE_SIZE,
+        after=_decode_cursor(cursor) if cursor else None,
+        start=start_date,
+        end=end_date,
+        category=category,
+        tx_type=type,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        descending=order == "desc",
+    )
+    if next_key is not None:
+        response.headers["X-Next-Cursor"] = _encode_cursor(next_key)
+    return page
+
+
+def _encode_cursor(key: Tuple[date, int]) -> str:
+    raw = f"{key[0].isoformat()}|{key[1]}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        day, tx_id = raw.split("|")
+        return date.fromisoformat(day), int(tx_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.post("/import")
+async def import_transactions(request: Request, format: Optional[str] = None):
+    """
+    Bulk import transactions from a CSV or NDJSON request body.
+
+    The body is streamed and parsed row by row; rows are validated and
+    persisted in chunks of IMPORT_CHUNK_SIZE (one storage write per chunk),
+    and a single `transactions.imported` event is emitted at the end.
+    CSV needs a header row with amount, category, date, type and optionally
+    description. Invalid rows are skipped and reported.
+
+    Example:
+        curl -X POST "http://localhost:8000/api/v1/transactions/import?format=csv" \
+             --data-binary @export.csv
+    """
+    fmt = (format or _format_from_content_type(request.headers.get("content-type", ""))).lower()
+    if fmt not in ("csv", "ndjson"):
+        raise HTTPException(status_code=415, detail="Use format=csv or format=ndjson")
+
+    rows = _csv_rows(_lines(request)) if fmt == "csv" else _ndjson_rows(_lines(request))
+
+    imported: List[models.Transaction] = []
+    errors: List[Dict[str, Any]] = []
+    chunk: List[Tuple[int, Any]] = []
+
+    async def flush(chunk):
+        valid, chunk_errors = _validate_chunk(chunk)
+        errors.extend(chunk_errors)
+        if valid:
+            imported.extend(await run_in_threadpool(storage.add_transactions, valid))
+
+    async for line_no, row in rows:
+        chunk.append((line_no, row))
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            await flush(chunk)
+            chunk = []
+    if chunk:
+        await flush(chunk)
+
+    if imported:
+        payload = _import_event_payload(imported)
+        logger.info(f"Emitting transactions.imported event for {len(imported)} transactions")
+        await run_in_threadpool(eventing.emit, "transactions.imported", payload)
+
+    return {"ok": True, "imported": len(imported), "rejected": len(errors), "errors": errors[:MAX_REPORTED_ERRORS]}
+
+
+def _format_from_content_type(content_type: str) -> str:
+    if "csv" in content_type:
+        return "csv"
+    if "ndjson" in content_type or "jsonl" in content_type or "json-seq" in content_type:
+        return "ndjson"
+    return ""
+
+
+async def _lines(request: Request) -> AsyncIterator[str]:
+    """Yield decoded text lines from the streamed request body."""
+    pending = b""
+    first = True
+    async for chunk in request.stream():
+        pending += chunk
+        *complete, pending = pending.split(b"\n")
+        for raw in complete:
+            line = raw.decode("utf-8-sig" if first else "utf-8").rstrip("\r")
+            first = False
+            yield line
+    if pending:
+        yield pending.decode("utf-8-sig" if first else "utf-8").rstrip("\r")
+
+
+async def _csv_rows(lines: AsyncIterator[str]):
+    """Yield (line_no, row dict) per CSV record. Quoted fields may not span lines."""
+    header = None
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [h.strip().lower() for h in values]
+            missing = [f for f in CSV_FIELDS if f != "description" and f not in header]
+            if missing:
+                raise HTTPException(status_code=400, detail=f"CSV header is missing columns: {', '.join(missing)}")
+            continue
+        yield line_no, dict(zip(header, values))
+
+
+async def _ndjson_rows(lines: AsyncIterator[str]):
+    """Yield (line_no, row dict) per NDJSON record; unparseable lines yield the error."""
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, ValueError(f"Invalid JSON: {e}")
+            continue
+        if not isinstance(row, dict):
+            yield line_no, ValueError("Expected a JSON object")
+            continue
+        yield line_no, row
+
+
+def _validate_chunk(chunk: List[Tuple[int, Any]]) -> Tuple[List[models.TransactionBase], List[Dict[str, Any]]]:
+    """
+    Validate a chunk of (line_no, row) pairs in one pass.
+    Returns the valid transactions and an error entry per rejected row.
+    """
+    errors = []
+    rows = []
+    line_numbers = []
+    for line_no, row in chunk:
+        if isinstance(row, Exception):
+            errors.append({"line": line_no, "error": str(row)})
+        else:
+            rows.append(_normalize_row(row))
+            line_numbers.append(line_no)
+
+    try:
+        return _TRANSACTION_LIST.validate_python(rows), errors
+    except ValidationError as e:
+        # Drop the offending rows, then validate the rest again in one pass
+        bad = {}
+        for err in e.errors():
+            bad.setdefault(err["loc"][0], f"{'.'.join(str(p) for p in err['loc'][1:])}: {err['msg']}")
+        for idx, message in bad.items():
+            errors.append({"line": line_numbers[idx], "error": message})
+        errors.sort(key=lambda err: err["line"])
+        good = [row for idx, row in enumerate(rows) if idx not in bad]
+        return _TRANSACTION_LIST.validate_python(good), errors
+
+
+def _normalize_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    data = {k: row.get(k) for k in CSV_FIELDS if k in row}
+    if isinstance(data.get("type"), str):
+        data["type"] = data["type"].strip().upper()
+    if isinstance(data.get("category"), str):
+        data["category"] = data["category"].strip()
+    if data.get("description") == "":
+        data["description"] = None
+    return data
+
+
+def _import_event_payload(imported: List[models.Transaction]) -> Dict[str, Any]:
+    """One coalesced event describing the whole import."""
+    categories = {}
+    total_income = 0.0
+    total_expense = 0.0
+    for tx in imported:
+        if tx.type == models.TransactionType.INCOME:
+            total_income += tx.amount
+        else:
+            total_expense += abs(tx.amount)
+        if tx.category:
+            categories.setdefault(tx.category.lower(), tx.category)
+    return {
+        "count": len(imported),
+        "first_id": imported[0].id,
+        "last_id": imported[-1].id,
+        "categories": sorted(categories.values()),
+        "start_date": min(tx.date for tx in imported),
+        "end_date": max(tx.date for tx in imported),
+        "total_income": total_income,
+        "total_expense": total_expense,
+        "large_count": sum(1 for tx in imported if tx.amount > 500),
+    }
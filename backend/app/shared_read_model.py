@@ -0,0 +1,318 @@
+"""
+Shared-memory read model of the transactions, for multi-worker deployments.
+
+With STORAGE_BACKEND=sqlite and SHARED_READ_MODEL=1, summary, balance and
+chart reads are answered from NumPy arrays in a multiprocessing.shared_memory
+segment instead of SQL scans. Writers publish: each transaction write patches
+its rows into the last generation (ReadModelView.patched) and publishes the
+result, under a cross-process file lock held across the write so generations
+follow the database's commit order. Readers only map the last published
+generation; they never build one. A segment holds:
+
+- the transaction columns sorted by (date, id): id, amount, date ordinal,
+  income flag and category code (category names are in the header);
+- cumulative income and expense per distinct day, so any date range total is
+  two binary searches.
+
+Segments are never changed after publishing. Each generation gets a new
+segment, and a small fixed "head" segment holds the current generation
+number. The previous segment is unlinked; processes still mapping it keep a
+valid mapping until they move on. Workers map the arrays read-only without
+copying them, so their memory stays flat as the history grows.
+"""
+import hashlib
+import json
+import struct
+from datetime import date
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+from app import file_lock
+from app.rollups import periods
+
+_HEADER_LEN = struct.Struct("<Q")
+_HEAD_SIZE = 64
+# Part of the segment names: bumped whenever the layout below changes, so segments
+# an older release left in /dev/shm are never mapped
+_LAYOUT = 2
+# (name, dtype) of the arrays in a segment, in layout order. Category codes are
+# intp, so np.bincount can use them in place instead of converting a copy per read.
+_ARRAYS = (
+    ("id", np.int64), ("amount", np.float64), ("date", np.int32), ("income", np.bool_), ("category", np.intp),
+    ("days", np.int32), ("cum_income", np.float64), ("cum_expense", np.float64),
+)
+# The per-transaction arrays, which a publisher supplies; the others are derived from them
+COLUMNS = ("id", "amount", "date", "income", "category")
+
+
+def _arrays_base(header_len: int) -> int:
+    """Offset of the first array: right after the header, 8-byte aligned."""
+    return -(-(_HEADER_LEN.size + header_len) // 8) * 8
+
+
+def _attach(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+    # Segments outlive the process mapping them (other workers keep using them),
+    # so the resource tracker must not unlink them when this process exits
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _unlink(name: str):
+    try:
+        shm = _attach(name)
+    except FileNotFoundError:
+        return
+    # unlink() unregisters the segment from the tracker again, so register it first
+    resource_tracker.register(shm._name, "shared_memory")
+    shm.unlink()
+    shm.close()
+
+
+def _ordinals(days: List[date]) -> np.ndarray:
+    # Same dtype as the date columns: searchsorted would otherwise convert a copy of them per call
+    return np.array([d.toordinal() for d in days], dtype=np.int32)
+
+
+def _sort_keys(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """(date, id) packed into one int64 per row, in the same order; ids stay below 2**40."""
+    return (columns["date"].astype(np.int64) << 40) | columns["id"]
+
+
+class ReadModelView:
+    """One published generation: zero-copy array views into its segment, never written to."""
+
+    def __init__(self, shm: shared_memory.SharedMemory):
+        self._shm = shm
+        (header_len,) = _HEADER_LEN.unpack_from(shm.buf, 0)
+        header = json.loads(bytes(shm.buf[_HEADER_LEN.size:_HEADER_LEN.size + header_len]))
+        self.version: str = header["version"]
+        self.category_names: List[str] = header["categories"]
+        self.income, self.expense, self.count = header["totals"]
+        base = _arrays_base(header_len)
+        self._arrays: Dict[str, np.ndarray] = {}
+        for name, dtype in _ARRAYS:
+            offset, length = header["arrays"][name]
+            # Left writeable only because np.bincount copies read-only input; nothing writes them
+            self._arrays[name] = np.ndarray(length, dtype=dtype, buffer=shm.buf, offset=base + offset)
+
+    def __del__(self):
+        # The segment can only be unmapped once no array view exports its buffer
+        self._arrays = None
+        try:
+            self._shm.close()
+        except BufferError:
+            pass
+
+    # --- Queries --- #
+    def _through(self, index: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Cumulative (income, expense) over the first `index` days (0 where index is 0)."""
+        if not len(self._arrays["days"]):
+            zeros = np.zeros(len(index))
+            return zeros, zeros
+        last = np.maximum(index - 1, 0)
+        return (np.where(index > 0, self._arrays["cum_income"][last], 0.0),
+                np.where(index > 0, self._arrays["cum_expense"][last], 0.0))
+
+    def totals_between(self, starts: List[date], ends: List[date]) -> Tuple[np.ndarray, np.ndarray]:
+        """(income, expense) arrays, one entry per inclusive [start, end] range."""
+        days = self._arrays["days"]
+        income_end, expense_end = self._through(np.searchsorted(days, _ordinals(ends), side="right"))
+        income_start, expense_start = self._through(np.searchsorted(days, _ordinals(starts), side="left"))
+        return income_end - income_start, expense_end - expense_start
+
+    def net_flow(self, start: date, end: date) -> Tuple[float, float]:
+        if end < start:
+            return 0.0, 0.0
+        income, expense = self.totals_between([start], [end])
+        return float(income[0]), float(expense[0])
+
+    def series(self, start: date, end: date, granularity: str) -> List[Dict]:
+        """Same rows as TimeRollups.series."""
+        spans = list(periods(start, end, granularity))
+        income, expense = self.totals_between([s for _, s, _, _ in spans], [e for _, _, e, _ in spans])
+        return [
+            {"period": label, "start": s, "end": e, "income": float(i), "expense": float(x)}
+            for (label, s, e, _), i, x in zip(spans, income, expense)
+        ]
+
+    def month_of_year(self, start: date, end: date) -> Tuple[List[float], List[float]]:
+        """Same as TimeRollups.month_of_year."""
+        income, expense = [0.0] * 12, [0.0] * 12
+        for row in self.series(start, end, "month"):
+            income[row["start"].month - 1] += row["income"]
+            expense[row["start"].month - 1] += row["expense"]
+        return income, expense
+
+    def patched(self, removed: Iterable[int],
+                added: Iterable[Tuple[int, float, date, bool, str]]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """
+        This generation's columns and category names with the `removed` ids
+        dropped and the `added` (id, amount, date, income, category) rows merged
+        in at their (date, id) place: the next generation, built with array
+        copies instead of a reload.
+        """
+        columns = {name: self._arrays[name] for name in COLUMNS}
+        removed = np.fromiter(removed, dtype=np.int64)
+        if len(removed):
+            keep = ~np.isin(columns["id"], removed)
+            columns = {name: values[keep] for name, values in columns.items()}
+        names = list(self.category_names)
+        added = sorted(added, key=lambda row: (row[2], row[0]))
+        if not added:
+            return columns, names
+        codes = {name: code for code, name in enumerate(names)}
+        for *_, category in added:
+            if category not in codes:
+                codes[category] = len(names)
+                names.append(category)
+        new = {
+            "id": np.array([row[0] for row in added], dtype=np.int64),
+            "amount": np.array([row[1] for row in added], dtype=np.float64),
+            "date": _ordinals([row[2] for row in added]),
+            "income": np.array([row[3] for row in added], dtype=np.bool_),
+            "category": np.array([codes[row[4]] for row in added], dtype=np.intp),
+        }
+        at = np.searchsorted(_sort_keys(columns), _sort_keys(new))
+        return {name: np.insert(values, at, new[name]) for name, values in columns.items()}, names
+
+    def cashflow_stats(self, since: date) -> Optional[Dict]:
+        """Same result as TransactionColumns.cashflow_stats; the rows are date-sorted, so `since` is a bisect."""
+        if not self.count:
+            return None
+        dates = self._arrays["date"]
+        first = int(np.searchsorted(dates, _ordinals([since])[0], side="left"))
+        if first == len(dates):
+            first = 0  # nothing recent: use all transactions
+        amount = self._arrays["amount"][first:]
+        category = self._arrays["category"][first:]
+        per_category = np.bincount(category, weights=amount, minlength=len(self.category_names))
+        present = np.bincount(category, minlength=len(self.category_names)) > 0
+        by_category: Dict[str, float] = {}
+        for code in np.flatnonzero(present):
+            name = self.category_names[code] or "misc"
+            by_category[name] = by_category.get(name, 0.0) + float(per_category[code])
+        return {
+            "total": float(amount.sum()),
+            "first_date": date.fromordinal(int(dates[first])),
+            "last_date": date.fromordinal(int(dates[-1])),
+            "by_category": by_category,
+        }
+
+
+class SharedReadModel:
+    """
+    The published generations for one database. Writers publish them while
+    holding publish_lock(); readers map the latest and never publish.
+    """
+
+    def __init__(self, key: str, lock_path: Path):
+        self.key = key
+        self._prefix = f"ba{_LAYOUT}_" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+        self._lock_path = lock_path
+        self._head: Optional[Tuple[shared_memory.SharedMemory, np.ndarray]] = None
+        self._current: Tuple[int, Optional[ReadModelView]] = (0, None)
+
+    def _segment_name(self, generation: int) -> str:
+        return f"{self._prefix}_{generation}"
+
+    def _generation(self) -> np.ndarray:
+        """The one-element int64 array in the head segment (0 = nothing published yet)."""
+        if self._head is None:
+            name = self._prefix + "_head"
+            try:
+                shm = _attach(name)
+            except FileNotFoundError:
+                try:
+                    shm = _attach(name, create=True, size=_HEAD_SIZE)  # created zero-filled
+                except FileExistsError:
+                    shm = _attach(name)
+            self._head = (shm, np.ndarray(1, dtype=np.int64, buffer=shm.buf))
+        return self._head[1]
+
+    def publish_lock(self):
+        """Cross-process lock a publisher holds from reading the latest generation until it publishes the next."""
+        return file_lock.exclusive(self._lock_path)
+
+    def latest(self) -> Optional[ReadModelView]:
+        """The last published generation (None before the first), mapped once per generation."""
+        head = self._generation()
+        generation = int(head[0])
+        if not generation:
+            return None
+        if generation == self._current[0]:
+            return self._current[1]
+        try:
+            shm = _attach(self._segment_name(generation))
+        except FileNotFoundError:
+            # Replaced (and unlinked) since we read the head: retry once with the newer one
+            if int(head[0]) == generation:
+                return None
+            return self.latest()
+        self._current = (generation, ReadModelView(shm))
+        return self._current[1]
+
+    def publish(self, version: str, columns: Dict[str, np.ndarray], category_names: List[str]) -> ReadModelView:
+        """
+        Publish `columns` (the COLUMNS arrays, sorted by (date, id)) as the next
+        generation. The caller holds publish_lock().
+        """
+        amount, income, dates = columns["amount"], columns["income"], columns["date"]
+        income_amount = np.where(income, amount, 0.0)
+        expense_amount = np.where(income, 0.0, np.abs(amount))
+        # Rows are date-sorted, so each day starts where the date changes
+        day_starts = np.flatnonzero(np.concatenate(([True], dates[1:] != dates[:-1]))) if len(dates) else []
+        days = dates[day_starts]
+        arrays = dict(columns, days=days)
+        if len(days):
+            arrays["cum_income"] = np.cumsum(np.add.reduceat(income_amount, day_starts))
+            arrays["cum_expense"] = np.cumsum(np.add.reduceat(expense_amount, day_starts))
+        else:
+            arrays["cum_income"] = arrays["cum_expense"] = np.zeros(0)
+
+        # Arrays follow the header, each 8-byte aligned; the header records where (relative to the first)
+        layout, size = {}, 0
+        for name, dtype in _ARRAYS:
+            arrays[name] = np.ascontiguousarray(arrays[name], dtype=dtype)
+            layout[name] = (size, len(arrays[name]))
+            size += -(-arrays[name].nbytes // 8) * 8
+        header = json.dumps({
+            "version": version,
+            "categories": category_names,
+            "totals": [float(income_amount.sum()), float(expense_amount.sum()), len(amount)],
+            "arrays": layout,
+        }).encode("utf-8")
+        base = _arrays_base(len(header))
+
+        head = self._generation()
+        previous = int(head[0])
+        generation = previous + 1
+        name = self._segment_name(generation)
+        try:
+            shm = _attach(name, create=True, size=base + size)
+        except FileExistsError:
+            # Left over from a run that crashed mid-publish
+            _unlink(name)
+            shm = _attach(name, create=True, size=base + size)
+        _HEADER_LEN.pack_into(shm.buf, 0, len(header))
+        shm.buf[_HEADER_LEN.size:_HEADER_LEN.size + len(header)] = header
+        for array_name, (start, _) in layout.items():
+            data = arrays[array_name].view(np.uint8)
+            shm.buf[base + start:base + start + len(data)] = data
+
+        # Readers map a generation only once the head names it, i.e. once it is complete
+        head[0] = generation
+        if previous:
+            _unlink(self._segment_name(previous))
+        self._current = (generation, ReadModelView(shm))
+        return self._current[1]
+
+    def unlink(self):
+        """Remove the published segments and the head (tests, or retiring a database)."""
+        generation = int(self._generation()[0])
+        for name in (self._segment_name(generation), self._prefix + "_head"):
+            _unlink(name)
+        self._current = (0, None)
+        self._head = None
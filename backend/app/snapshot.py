@@ -0,0 +1,243 @@
+"""
+Compact binary snapshots for the file storage collections.
+
+A snapshot file is a small JSON header followed by fixed-size packed records
+(a NumPy structured array). Every string-like column is dictionary-encoded
+against one string table kept in the header, so repeated categories, types
+and descriptions are stored once. Snapshots are only ever written from
+validated models, so loading rebuilds the models without validating again.
+
+    python -m app.snapshot convert       # write .bin snapshots from the JSON files
+    python -m app.snapshot bench 100000  # compare JSON vs binary load time
+"""
+import argparse
+import gc
+import json
+import struct
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple, Type
+import numpy as np
+from pydantic import BaseModel
+from app.models import Budget, Goal, Notification, Transaction
+
+MAGIC = b"BASNAP1\n"
+_HEADER_LEN = struct.Struct("<I")
+
+# field kind -> column dtype. String-like kinds hold an index into the string
+# table (index 0 is None); dates hold date.toordinal() with 0 meaning None.
+_KIND_DTYPES = {"int": "<i8", "float": "<f8", "bool": "?", "str": "<u4", "enum": "<u4", "datetime": "<u4", "date": "<i4"}
+
+MODELS: Dict[str, Type[BaseModel]] = {
+    "transactions": Transaction,
+    "budgets": Budget,
+    "goals": Goal,
+    "notifications": Notification,
+}
+
+FIELDS: Dict[str, List[Tuple[str, str]]] = {
+    "transactions": [("id", "int"), ("amount", "float"), ("category", "str"), ("date", "date"),
+                     ("description", "str"), ("type", "enum")],
+    "budgets": [("id", "int"), ("name", "str"), ("category", "str"), ("monthly_limit", "float"),
+                ("alert_threshold", "float"), ("spent_this_month", "float"), ("version", "int")],
+    "goals": [("id", "int"), ("name", "str"), ("target_amount", "float"), ("saved_amount", "float"),
+              ("target_date", "date"), ("description", "str"), ("version", "int")],
+    "notifications": [("id", "int"), ("notification_type", "str"), ("title", "str"), ("message", "str"),
+                      ("created_at", "datetime"), ("read", "bool")],
+}
+
+
+def _record_dtype(fields: Sequence[Tuple[str, str]]) -> np.dtype:
+    return np.dtype([(name, _KIND_DTYPES[kind]) for name, kind in fields])
+
+
+def encode(collection: str, items: Sequence[BaseModel]) -> bytes:
+    """Pack model instances of a collection into snapshot bytes."""
+    fields = FIELDS[collection]
+    records = np.zeros(len(items), dtype=_record_dtype(fields))
+    strings: List[Any] = [None]
+    codes: Dict[Any, int] = {None: 0}
+
+    def string_code(value) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(strings)
+            strings.append(value)
+        return code
+
+    for name, kind in fields:
+        values = [getattr(item, name) for item in items]
+        if kind == "enum":
+            values = [string_code(v.value if v is not None else None) for v in values]
+        elif kind == "datetime":
+            values = [string_code(v.isoformat() if v is not None else None) for v in values]
+        elif kind == "str":
+            values = [string_code(v) for v in values]
+        elif kind == "date":
+            values = [v.toordinal() if v is not None else 0 for v in values]
+        records[name] = values
+
+    header = json.dumps({
+        "collection": collection,
+        "fields": fields,
+        "count": len(items),
+        "strings": strings,
+    }, separators=(",", ":")).encode("utf-8")
+    return b"".join((MAGIC, _HEADER_LEN.pack(len(header)), header, records.tobytes()))
+
+
+def decode(data: bytes) -> Tuple[str, List[BaseModel]]:
+    """Unpack snapshot bytes into (collection, list of models)."""
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a storage snapshot")
+    offset = len(MAGIC)
+    (header_len,) = _HEADER_LEN.unpack_from(data, offset)
+    offset += _HEADER_LEN.size
+    header = json.loads(data[offset:offset + header_len])
+    offset += header_len
+
+    collection = header["collection"]
+    model = MODELS[collection]
+    fields = [tuple(f) for f in header["fields"]]
+    dtype = _record_dtype(fields)
+    count = header["count"]
+    if len(data) - offset != dtype.itemsize * count:
+        raise ValueError("Truncated storage snapshot")
+    records = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+
+    strings = header["strings"]
+    columns = []
+    for name, kind in fields:
+        column = records[name].tolist()
+        if kind in ("str", "enum", "datetime"):
+            # Convert each distinct value once, then map the codes
+            if kind == "enum":
+                convert = model.model_fields[name].annotation
+            elif kind == "datetime":
+                convert = datetime.fromisoformat
+            else:
+                convert = None
+            if convert is None:
+                column = [strings[c] for c in column]
+            else:
+                table = {c: convert(strings[c]) if c else None for c in set(column)}
+                column = [table[c] for c in column]
+        elif kind == "date":
+            dates = {o: date.fromordinal(o) for o in set(column) if o}
+            dates[0] = None
+            column = [dates[o] for o in column]
+        columns.append(column)
+
+    names = [name for name, _ in fields]
+    return collection, _construct_all(model, names, columns)
+
+
+def _construct_all(model: Type[BaseModel], names: List[str], columns: List[list]) -> List[BaseModel]:
+    """
+    model.model_construct(**record) for every record: the supported way to
+    build models from trusted data without validating. Fields added to the
+    model after the snapshot was written get their defaults.
+    """
+    unknown = set(names) - set(model.model_fields)
+    missing = [name for name in model.model_fields if name not in names]
+    if unknown or any(model.model_fields[name].is_required() for name in missing):
+        raise ValueError(f"Snapshot fields do not match {model.__name__}")
+    construct = model.model_construct
+    # Passing the fields set skips working it out per record
+    fields_set = set(names)
+    items = []
+    # Allocating this many objects would otherwise trigger repeated full GC passes
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for values in zip(*columns):
+            items.append(construct(fields_set.copy(), **dict(zip(names, values))))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return items
+
+
+# --- CLI: conversion and benchmark --- #
+def convert() -> None:
+    """Write a binary snapshot next to each JSON file (the JSON files are kept)."""
+    from app import file_storage
+
+    for collection, items in (
+        ("transactions", file_storage._load_transactions_with_journal()),
+        ("budgets", file_storage.load_budgets()),
+        ("goals", file_storage.load_goals()),
+        ("notifications", file_storage.load_notifications()),
+    ):
+        path = file_storage.binary_snapshot_path(collection)
+        file_storage._atomic_write(path, encode(collection, items))
+        print(f"{collection}: {len(items)} records -> {path}")
+
+
+def bench(rows: int, repeat: int = 3) -> None:
+    """Time loading `rows` synthetic transactions from JSON (per-row and batch validation) and binary."""
+    import tempfile
+    import time
+    from app import file_storage
+    from app.models import TransactionType
+
+    categories = ["groceries", "rent", "coffee", "transport", "utilities", "salary", "entertainment"]
+    txs = [
+        Transaction(
+            id=i + 1,
+            amount=round(5 + (i * 37 % 2000) / 10, 2),
+            category=categories[i % len(categories)],
+            date=date.fromordinal(date(2020, 1, 1).toordinal() + i % 2000),
+            description=f"purchase {i % 500}",
+            type=TransactionType.INCOME if i % len(categories) == 5 else TransactionType.EXPENSE,
+        )
+        for i in range(rows)
+    ]
+
+    def best_of(fn):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        json_path, bin_path = tmp / "transactions.json", tmp / "transactions.bin"
+        payload = {"transactions": [file_storage._transaction_to_dict(tx) for tx in txs]}
+        json_path.write_text(file_storage.serialize_data(payload))
+        bin_path.write_bytes(encode("transactions", txs))
+
+        def load_json_per_row():
+            data = json.loads(json_path.read_text())
+            return [file_storage._transaction_from_dict(d) for d in data["transactions"]]
+
+        def load_json_batch():
+            return file_storage._TRANSACTIONS.validate_python(json.loads(json_path.read_text())["transactions"])
+
+        def load_binary():
+            return decode(bin_path.read_bytes())[1]
+
+        assert load_binary() == txs
+        print(f"{rows} transactions (best of {repeat})")
+        print(f"  json, per-row models : {best_of(load_json_per_row):.3f}s  {json_path.stat().st_size:>12,} bytes")
+        print(f"  json, batch validate : {best_of(load_json_batch):.3f}s")
+        print(f"  binary snapshot      : {best_of(load_binary):.3f}s  {bin_path.stat().st_size:>12,} bytes")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.snapshot", description=__doc__.split("\n\n")[0].strip())
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("convert", help="write binary snapshots from the current JSON files")
+    bench_parser = sub.add_parser("bench", help="compare JSON and binary load times")
+    bench_parser.add_argument("rows", nargs="?", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    if args.command == "convert":
+        convert()
+    else:
+        bench(args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,818 @@
+"""
+SQLite storage backend.
+
+Implements the same public functions as app.storage on top of the stdlib
+sqlite3 module (WAL mode), for data volumes the JSON files can't carry.
+Aggregations (summary, balance, monthly chart) run as SQL queries backed by
+indexes on (date), (category, date) and (type, date); budget spending is read
+from a per-(category, month) aggregate table maintained on insert.
+
+Selected with STORAGE_BACKEND=sqlite; the database lives at SQLITE_DB_PATH
+(default: user_data/user-storage/budget_assist.db).
+
+Several processes (e.g. `uvicorn --workers 4`) can share one database: all
+state lives in it, WAL lets readers run beside the single writer, and every
+write transaction bumps per-collection counters in `data_versions`, so each
+worker's data_version() (and with it the ETags) follows the others' writes.
+"""
+import os
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+from app.models import Notification, Transaction, Budget, Goal, FinancialSummary, TransactionType
+from app.errors import VersionConflictError
+from app import file_storage
+from app.columnar import normalize_category
+from app.rollups import TimeRollups
+from app.shared_read_model import SharedReadModel
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = Path(os.getenv("SQLITE_DB_PATH", str(file_storage.USER_STORAGE_DIR / "budget_assist.db")))
+# Answer summary, balance and chart reads from a shared-memory read model
+# (app/shared_read_model.py) that all worker processes map, instead of SQL scans
+SHARED_READ_MODEL = os.getenv("SHARED_READ_MODEL", "0").lower() not in ("0", "false", "no", "off")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    amount REAL NOT NULL,
+    category TEXT NOT NULL,
+    date TEXT NOT NULL,
+    description TEXT,
+    type TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date);
+CREATE INDEX IF NOT EXISTS idx_transactions_category_date ON transactions (category, date);
+CREATE INDEX IF NOT EXISTS idx_transactions_type_date ON transactions (type, date);
+CREATE INDEX IF NOT EXISTS idx_transactions_category_nocase_date ON transactions (category COLLATE NOCASE, date);
+
+-- Materialized expense totals per (normalized category, 'YYYY-MM'), maintained on insert
+CREATE TABLE IF NOT EXISTS category_month_spend (
+    category TEXT NOT NULL,
+    month TEXT NOT NULL,
+    amount REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (category, month)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS budgets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    monthly_limit REAL NOT NULL,
+    alert_threshold REAL NOT NULL,
+    spent_this_month REAL NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_budgets_category ON budgets (category COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS goals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    target_amount REAL NOT NULL,
+    saved_amount REAL NOT NULL DEFAULT 0,
+    target_date TEXT,
+    description TEXT,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_goals_target_date ON goals (target_date);
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    notification_type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    message TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    read INTEGER NOT NULL DEFAULT 0
+);
+
+-- Alert webhooks (app.agents.notifier), shared by all worker processes
+CREATE TABLE IF NOT EXISTS webhooks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL
+);
+
+-- Change counters bumped by every write transaction; epoch is random per database file,
+-- so versions of a recreated database never match old ones
+CREATE TABLE IF NOT EXISTS data_versions (
+    collection TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO data_versions (collection, version) VALUES
+    ('transactions', 0), ('budgets', 0), ('goals', 0), ('notifications', 0);
+CREATE TABLE IF NOT EXISTS storage_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO storage_meta (key, value) VALUES ('epoch', lower(hex(randomblob(6))));
+"""
+
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    """Return this thread's connection (FastAPI runs sync routes on a threadpool)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != DB_PATH:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.create_function("normalize_category", 1, normalize_category, deterministic=True)
+        _local.conn = conn
+        _local.path = DB_PATH
+    return conn
+
+
+@contextmanager
+def _write(*collections: str):
+    """
+    Run statements in a single write transaction, bumping the data versions
+    of the collections it changes as part of it.
+    """
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        if collections:
+            conn.execute(
+                f"UPDATE data_versions SET version = version + 1 WHERE collection IN ({','.join('?' * len(collections))})",
+                collections,
+            )
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    else:
+        conn.execute("COMMIT")
+
+
+def data_version(*collections: str) -> str:
+    """
+    Same token as storage.data_version, read from the database: it changes
+    whenever any process writes one of the collections.
+    """
+    conn = _connect()
+    epoch = conn.execute("SELECT value FROM storage_meta WHERE key = 'epoch'").fetchone()[0]
+    versions = dict(conn.execute("SELECT collection, version FROM data_versions").fetchall())
+    return epoch + "-" + ".".join(str(versions[name]) for name in collections)
+
+
+# --- Row mapping --- #
+def _row_to_transaction(row: sqlite3.Row) -> Transaction:
+    return Transaction(
+        id=row["id"],
+        amount=row["amount"],
+        category=row["category"],
+        date=date.fromisoformat(row["date"]),
+        description=row["description"],
+        type=TransactionType(row["type"]),
+    )
+
+
+def _row_to_budget(row: sqlite3.Row) -> Budget:
+    return Budget(
+        id=row["id"],
+        name=row["name"],
+        category=row["category"],
+        monthly_limit=row["monthly_limit"],
+        alert_threshold=row["alert_threshold"],
+        spent_this_month=row["spent_this_month"],
+        version=row["version"],
+    )
+
+
+def _row_to_goal(row: sqlite3.Row) -> Goal:
+    return Goal(
+        id=row["id"],
+        name=row["name"],
+        target_amount=row["target_amount"],
+        saved_amount=row["saved_amount"],
+        target_date=date.fromisoformat(row["target_date"]) if row["target_date"] else None,
+        description=row["description"],
+        version=row["version"],
+    )
+
+
+def _row_to_notification(row: sqlite3.Row) -> Notification:
+    return Notification(
+        id=row["id"],
+        notification_type=row["notification_type"],
+        title=row["title"],
+        message=row["message"],
+        created_at=datetime.fromisoformat(row["created_at"]),
+        read=bool(row["read"]),
+    )
+
+
+def _insert_transaction(conn: sqlite3.Connection, tx_data: dict) -> int:
+    cur = conn.execute(
+        "INSERT INTO transactions (amount, category, date, description, type) VALUES (?, ?, ?, ?, ?)",
+        (tx_data["amount"], tx_data["category"], tx_data["date"].isoformat(),
+         tx_data.get("description"), TransactionType(tx_data["type"]).value),
+    )
+    return cur.lastrowid
+
+
+def _add_spend(conn: sqlite3.Connection, txs: Iterable[dict], sign: int = 1) -> None:
+    """Add (sign=1) or subtract (sign=-1) expense amounts in the (category, month) aggregate."""
+    spend = {}
+    for data in txs:
+        if TransactionType(data["type"]) == TransactionType.EXPENSE:
+            key = (normalize_category(data["category"]), file_storage.month_key(data["date"]))
+            spend[key] = spend.get(key, 0.0) + sign * abs(data["amount"])
+    conn.executemany(
+        "INSERT INTO category_month_spend (category, month, amount) VALUES (?, ?, ?) "
+        "ON CONFLICT (category, month) DO UPDATE SET amount = amount + excluded.amount",
+        [(category, month, amount) for (category, month), amount in spend.items()],
+    )
+
+
+# Budgets carry this month's spending from the aggregate instead of a stored counter
+_BUDGET_SELECT = (
+    "SELECT b.id, b.name, b.category, b.monthly_limit, b.alert_threshold, b.version, "
+    "COALESCE(s.amount, 0.0) AS spent_this_month FROM budgets b "
+    "LEFT JOIN category_month_spend s ON s.category = normalize_category(b.category) AND s.month = ? "
+)
+
+
+def _current_month() -> str:
+    return file_storage.month_key(date.today())
+
+
+def _insert_budget(conn: sqlite3.Connection, b_data: dict) -> int:
+    cur = conn.execute(
+        "INSERT INTO budgets (name, category, monthly_limit, alert_threshold, spent_this_month) VALUES (?, ?, ?, ?, ?)",
+        (b_data["name"], b_data["category"], b_data["monthly_limit"], b_data["alert_threshold"],
+         b_data.get("spent_this_month", 0.0)),
+    )
+    return cur.lastrowid
+
+
+def _insert_goal(conn: sqlite3.Connection, g_data: dict) -> int:
+    target_date = g_data.get("target_date")
+    cur = conn.execute(
+        "INSERT INTO goals (name, target_amount, saved_amount, target_date, description) VALUES (?, ?, ?, ?, ?)",
+        (g_data["name"], g_data["target_amount"], g_data.get("saved_amount", 0.0),
+         target_date.isoformat() if target_date else None, g_data.get("description")),
+    )
+    return cur.lastrowid
+
+
+# --- Setup --- #
+def initialize(seed_transactions: Iterable[Transaction] = (), seed_budgets: Iterable[Budget] = (),
+               seed_goals: Iterable[Goal] = ()) -> None:
+    """Create the schema and insert seed data into empty tables."""
+    conn = _connect()
+    conn.executescript(_SCHEMA)
+    with _write() as conn:
+        # Databases created before entity versions existed get the column
+        for table in ("budgets", "goals"):
+            columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if "version" not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        # Seeding happens inside the write transaction so concurrent starters don't double-seed
+        if conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0] == 0:
+            for tx in seed_transactions:
+                _insert_transaction(conn, tx.model_dump())
+        if conn.execute("SELECT COUNT(*) FROM budgets").fetchone()[0] == 0:
+            for b in seed_budgets:
+                _insert_budget(conn, b.model_dump())
+        if conn.execute("SELECT COUNT(*) FROM goals").fetchone()[0] == 0:
+            for g in seed_goals:
+                _insert_goal(conn, g.model_dump())
+        # Databases created before the aggregate existed are backfilled once
+        if conn.execute("SELECT COUNT(*) FROM category_month_spend").fetchone()[0] == 0:
+            conn.execute(
+                "INSERT INTO category_month_spend (category, month, amount) "
+                "SELECT normalize_category(category), substr(date, 1, 7), SUM(ABS(amount)) FROM transactions "
+                "WHERE type = ? GROUP BY 1, 2",
+                (TransactionType.EXPENSE.value,),
+            )
+
+    _publish_read_model()
+
+    counts = [conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
+              for t in ("transactions", "budgets", "goals", "notifications")]
+    logger.info(f"SQLite storage initialized at {DB_PATH}: {counts[0]} transactions, {counts[1]} budgets, "
+                f"{counts[2]} goals, {counts[3]} notifications")
+
+
+# --- Transactions --- #
+def add_transaction(tx_data) -> Transaction:
+    data = tx_data.model_dump()
+    with _write_transactions() as (conn, _, added):
+        tx_id = _insert_transaction(conn, data)
+        _add_spend(conn, [data])
+        added.append((tx_id, data))
+    return Transaction(id=tx_id, **data)
+
+
+def add_transactions(tx_datas) -> List[Transaction]:
+    """
+    Add many transactions in one write transaction (bulk import), updating
+    each affected (category, month) aggregate once.
+    """
+    created = []
+    datas = []
+    with _write_transactions() as (conn, _, added):
+        for tx_data in tx_datas:
+            data = tx_data.model_dump()
+            created.append(Transaction(id=_insert_transaction(conn, data), **data))
+            datas.append(data)
+        _add_spend(conn, datas)
+        added.extend((tx.id, data) for tx, data in zip(created, datas))
+    return created
+
+
+def update_transaction(tx_id: int, tx_data) -> Tuple[Transaction, Transaction]:
+    """Replace a transaction; returns (previous, updated), the previous row read in the same write transaction."""
+    data = tx_data.model_dump()
+    with _write_transactions() as (conn, removed, added):
+        row = conn.execute("SELECT * FROM transactions WHERE id = ?", (tx_id,)).fetchone()
+        if row is None:
+            raise ValueError("Transaction not found")
+        conn.execute(
+            "UPDATE transactions SET amount = ?, category = ?, date = ?, description = ?, type = ? WHERE id = ?",
+            (data["amount"], data["category"], data["date"].isoformat(), data.get("description"),
+             TransactionType(data["type"]).value, tx_id),
+        )
+        previous = _row_to_transaction(row)
+        _add_spend(conn, [previous.model_dump()], sign=-1)
+        _add_spend(conn, [data])
+        removed.append(tx_id)
+        added.append((tx_id, data))
+    return previous, Transaction(id=tx_id, **data)
+
+
+def delete_transaction(tx_id: int) -> Transaction:
+    """Remove a transaction and return it."""
+    with _write_transactions() as (conn, removed, _):
+        row = conn.execute("SELECT * FROM transactions WHERE id = ?", (tx_id,)).fetchone()
+        if row is None:
+            raise ValueError("Transaction not found")
+        conn.execute("DELETE FROM transactions WHERE id = ?", (tx_id,))
+        tx = _row_to_transaction(row)
+        _add_spend(conn, [tx.model_dump()], sign=-1)
+        removed.append(tx_id)
+    return tx
+
+
+def get_transaction(tx_id: int) -> Optional[Transaction]:
+    row = _connect().execute("SELECT * FROM transactions WHERE id = ?", (tx_id,)).fetchone()
+    return _row_to_transaction(row) if row else None
+
+
+def get_category_month_spend(category: str, month: Optional[date] = None) -> float:
+    """Expenses in a category (case-insensitive) during the month containing `month` (default: this month)."""
+    row = _connect().execute(
+        "SELECT amount FROM category_month_spend WHERE category = ? AND month = ?",
+        (normalize_category(category), file_storage.month_key(month or date.today())),
+    ).fetchone()
+    return row[0] if row else 0.0
+
+
+def list_transactions() -> List[Transaction]:
+    rows = _connect().execute("SELECT * FROM transactions ORDER BY id").fetchall()
+    return [_row_to_transaction(r) for r in rows]
+
+
+def list_transactions_page(
+    limit: int,
+    after: Optional[Tuple[date, int]] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    category: Optional[str] = None,
+    tx_type: Optional[TransactionType] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    descending: bool = False,
+) -> Tuple[List[Transaction], Optional[Tuple[date, int]]]:
+    """One page of transactions in (date, id) order (see storage.list_transactions_page)."""
+    clauses, params = [], []
+    if start:
+        clauses.append("date >= ?")
+        params.append(start.isoformat())
+    if end:
+        clauses.append("date <= ?")
+        params.append(end.isoformat())
+    if category is not None:
+        clauses.append("category = ? COLLATE NOCASE")
+        params.append(category)
+    if tx_type is not None:
+        clauses.append("type = ?")
+        params.append(TransactionType(tx_type).value)
+    if min_amount is not None:
+        clauses.append("amount >= ?")
+        params.append(min_amount)
+    if max_amount is not None:
+        clauses.append("amount <= ?")
+        params.append(max_amount)
+    if after is not None:
+        clauses.append("(date, id) < (?, ?)" if descending else "(date, id) > (?, ?)")
+        params.extend((after[0].isoformat(), after[1]))
+    where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+    order = "DESC" if descending else "ASC"
+    rows = _connect().execute(
+        f"SELECT * FROM transactions {where}ORDER BY date {order}, id {order} LIMIT ?", (*params, limit + 1)
+    ).fetchall()
+    page = [_row_to_transaction(r) for r in rows[:limit]]
+    next_key = (page[-1].date, page[-1].id) if len(rows) > limit else None
+    return page, next_key
+
+
+# --- Budgets --- #
+def add_budget(budget_data) -> Budget:
+    data = budget_data.model_dump()
+    with _write("budgets") as conn:
+        budget_id = _insert_budget(conn, data)
+        row = conn.execute(_BUDGET_SELECT + "WHERE b.id = ?", (_current_month(), budget_id)).fetchone()
+    return _row_to_budget(row)
+
+
+def list_budgets() -> List[Budget]:
+    rows = _connect().execute(_BUDGET_SELECT + "ORDER BY b.id", (_current_month(),)).fetchall()
+    return [_row_to_budget(r) for r in rows]
+
+
+def get_budget_for_category(category: str) -> Budget | None:
+    """The budget tracking a category (case-insensitive), if any."""
+    row = _connect().execute(
+        _BUDGET_SELECT + "WHERE b.category = ? COLLATE NOCASE ORDER BY b.id LIMIT 1", (_current_month(), category)
+    ).fetchone()
+    return _row_to_budget(row) if row else None
+
+
+def _check_version(conn: sqlite3.Connection, table: str, entity: str, entity_id: int,
+                   expected_version: Optional[int]) -> None:
+    """Raise ValueError if the row is missing, VersionConflictError if it moved past expected_version."""
+    row = conn.execute(f"SELECT version FROM {table} WHERE id = ?", (entity_id,)).fetchone()
+    if row is None:
+        raise ValueError(f"{entity} not found")
+    if expected_version is not None and row["version"] != expected_version:
+        raise VersionConflictError(entity, entity_id, expected_version, row["version"])
+
+
+def update_budget(budget_id: int, budget_data, expected_version: Optional[int] = None) -> Budget:
+    data = budget_data.model_dump()
+    with _write("budgets") as conn:
+        # Check and update run in one IMMEDIATE transaction, so no other writer can slip in between
+        _check_version(conn, "budgets", "Budget", budget_id, expected_version)
+        conn.execute(
+            "UPDATE budgets SET name = ?, category = ?, monthly_limit = ?, alert_threshold = ?, "
+            "version = version + 1 WHERE id = ?",
+            (data["name"], data["category"], data["monthly_limit"], data["alert_threshold"], budget_id),
+        )
+        row = conn.execute(_BUDGET_SELECT + "WHERE b.id = ?", (_current_month(), budget_id)).fetchone()
+    return _row_to_budget(row)
+
+
+def get_budget_spending(category: str):
+    """
+    Returns (spent this month, limit, alert_threshold) for a given category (case-insensitive).
+    If no budget exists, returns (0, 0, 0).
+    """
+    b = get_budget_for_category(category)
+    if b is None:
+        return (0.0, 0.0, 0.0)
+    return (b.spent_this_month, b.monthly_limit, b.alert_threshold)
+
+
+# --- Goals --- #
+def add_goal(goal_data) -> Goal:
+    data = goal_data.model_dump()
+    with _write("goals") as conn:
+        goal_id = _insert_goal(conn, data)
+    return Goal(id=goal_id, **data)
+
+
+def list_goals() -> List[Goal]:
+    rows = _connect().execute("SELECT * FROM goals ORDER BY id").fetchall()
+    return [_row_to_goal(r) for r in rows]
+
+
+def update_goal(goal_id: int, goal_data, expected_version: Optional[int] = None) -> Goal:
+    data = goal_data.model_dump()
+    target_date = data.get("target_date")
+    with _write("goals") as conn:
+        _check_version(conn, "goals", "Goal", goal_id, expected_version)
+        conn.execute(
+            "UPDATE goals SET name = ?, target_amount = ?, saved_amount = ?, target_date = ?, description = ?, "
+            "version = version + 1 WHERE id = ?",
+            (data["name"], data["target_amount"], data["saved_amount"],
+             target_date.isoformat() if target_date else None, data.get("description"), goal_id),
+        )
+        row = conn.execute("SELECT * FROM goals WHERE id = ?", (goal_id,)).fetchone()
+    return _row_to_goal(row)
+
+
+def get_goals_due_between(start: date, end: date):
+    """
+    Returns goals whose target_date is between start and end (inclusive).
+    """
+    rows = _connect().execute(
+        "SELECT * FROM goals WHERE target_date BETWEEN ? AND ? ORDER BY id",
+        (start.isoformat(), end.isoformat()),
+    ).fetchall()
+    return [
+        {
+            "id": r["id"],
+            "title": r["name"],
+            "due_date": date.fromisoformat(r["target_date"]),
+            "saved_amount": r["saved_amount"],
+            "target_amount": r["target_amount"],
+        }
+        for r in rows
+    ]
+
+
+# --- Notifications --- #
+def add_notification(notification_type: str, title: str, message: str) -> Notification:
+    created_at = datetime.now(timezone.utc)
+    with _write("notifications") as conn:
+        cur = conn.execute(
+            "INSERT INTO notifications (notification_type, title, message, created_at, read) VALUES (?, ?, ?, ?, 0)",
+            (notification_type, title, message, created_at.isoformat()),
+        )
+    n = Notification(id=cur.lastrowid, notification_type=notification_type, title=title,
+                     message=message, created_at=created_at, read=False)
+    logger.info(f"Notification added: {n.id} {n.notification_type}")
+    return n
+
+
+def list_notifications() -> List[Notification]:
+    # newest first, matching the JSON backend
+    rows = _connect().execute("SELECT * FROM notifications ORDER BY id DESC").fetchall()
+    return [_row_to_notification(r) for r in rows]
+
+
+def mark_read(id) -> Notification | None:
+    with _write("notifications") as conn:
+        conn.execute("UPDATE notifications SET read = 1 WHERE id = ?", (id,))
+        row = conn.execute("SELECT * FROM notifications WHERE id = ?", (id,)).fetchone()
+    return _row_to_notification(row) if row else None
+
+
+# --- Webhooks --- #
+def add_webhook(url: str) -> dict:
+    with _write() as conn:
+        cur = conn.execute("INSERT INTO webhooks (url) VALUES (?)", (url,))
+    return {"id": cur.lastrowid, "url": url}
+
+
+def list_webhooks() -> List[dict]:
+    return [dict(r) for r in _connect().execute("SELECT id, url FROM webhooks ORDER BY id")]
+
+
+def remove_webhook(hook_id: int) -> bool:
+    with _write() as conn:
+        return conn.execute("DELETE FROM webhooks WHERE id = ?", (hook_id,)).rowcount > 0
+
+
+# --- Shared read model --- #
+_read_model: Optional[SharedReadModel] = None
+
+
+def _shared_read_model() -> Optional[SharedReadModel]:
+    """This database's shared read model, or None when it is switched off."""
+    global _read_model
+    if not SHARED_READ_MODEL:
+        return None
+    key = str(DB_PATH.resolve())
+    if _read_model is None or _read_model.key != key:
+        _read_model = SharedReadModel(key, DB_PATH.with_name(DB_PATH.name + ".readmodel.lock"))
+    return _read_model
+
+
+# Transaction columns for a full publish; dates as proleptic ordinals (julianday of 0001-01-01 is 1721425.5)
+_READ_MODEL_SELECT = (
+    "SELECT id, amount, CAST(julianday(date) - 1721424.5 AS INTEGER), type = 'INCOME', "
+    "DENSE_RANK() OVER (ORDER BY normalize_category(category)) - 1 FROM transactions ORDER BY date, id"
+)
+_READ_MODEL_DTYPE = [("id", np.int64), ("amount", np.float64), ("date", np.int32), ("income", np.bool_),
+                     ("category", np.intp)]
+
+
+def _read_model_data():
+    """All transaction columns sorted by (date, id), read in one snapshot together with their data version."""
+    conn = _connect()
+    conn.execute("BEGIN")
+    try:
+        version = data_version("transactions")
+        names = [r[0] for r in conn.execute(
+            "SELECT DISTINCT normalize_category(category) FROM transactions ORDER BY 1")]
+        cursor = conn.cursor()
+        cursor.row_factory = None  # plain tuples, which np.fromiter takes as records
+        table = np.fromiter(cursor.execute(_READ_MODEL_SELECT), dtype=_READ_MODEL_DTYPE)
+    finally:
+        conn.execute("COMMIT")
+    return version, {name: table[name] for name, _ in _READ_MODEL_DTYPE}, names
+
+
+def _next_version(version: str) -> str:
+    """The transactions data_version once the write transaction in progress commits (one bump)."""
+    epoch, counter = version.rsplit("-", 1)
+    return f"{epoch}-{int(counter) + 1}"
+
+
+@contextmanager
+def _write_transactions():
+    """
+    _write("transactions"), also publishing the change to the shared read model
+    when it is on. Yields (conn, removed, added): the block lists the ids it
+    deletes in `removed` and the (id, data) rows it inserts in `added`; an
+    update is both.
+    """
+    removed, added = [], []
+    model = _shared_read_model()
+    if model is None:
+        with _write("transactions") as conn:
+            yield conn, removed, added
+        return
+    # Held across the write, so generations follow commit order and each writer
+    # finds the generation its own write comes after
+    with model.publish_lock():
+        with _write("transactions") as conn:
+            since = data_version("transactions")
+            yield conn, removed, added
+        latest = model.latest()
+        if latest is not None and latest.version == since:
+            rows = [(tx_id, data["amount"], data["date"], TransactionType(data["type"]) == TransactionType.INCOME,
+                     normalize_category(data["category"])) for tx_id, data in added]
+            model.publish(_next_version(since), *latest.patched(removed, rows))
+        else:
+            # Writes were made with the read model off: rebuild it here, never in a reader
+            model.publish(*_read_model_data())
+
+
+def _publish_read_model():
+    """Publish the read model at startup if the last generation is behind the database."""
+    model = _shared_read_model()
+    if model is None:
+        return
+    with model.publish_lock():
+        latest = model.latest()
+        if latest is None or latest.version != data_version("transactions"):
+            model.publish(*_read_model_data())
+
+
+def _read_model_view():
+    """
+    The last published read model generation, or None when it is switched off
+    or nothing is published yet. Readers never publish: writers keep it current.
+    """
+    model = _shared_read_model()
+    return model.latest() if model is not None else None
+
+
+# --- Aggregations --- #
+def _income_expense_totals():
+    view = _read_model_view()
+    if view is not None:
+        return view.income, view.expense, view.count
+    row = _connect().execute(
+        "SELECT "
+        "COALESCE((SELECT SUM(amount) FROM transactions WHERE type = 'INCOME'), 0.0), "
+        "COALESCE((SELECT SUM(ABS(amount)) FROM transactions WHERE type = 'EXPENSE'), 0.0), "
+        "(SELECT COUNT(*) FROM transactions)"
+    ).fetchone()
+    return row[0], row[1], row[2]
+
+
+def get_financial_summary() -> FinancialSummary:
+    total_income, total_expense, count = _income_expense_totals()
+    return FinancialSummary(
+        total_balance=total_income - total_expense,
+        total_income=total_income,
+        total_expense=total_expense,
+        transactions_count=count,
+        budgets=list_budgets(),
+        goals=list_goals(),
+    )
+
+
+def get_balance() -> float:
+    total_income, total_expense, _ = _income_expense_totals()
+    return total_income - total_expense
+
+
+def _income_expense_between(start: str, end: str) -> Tuple[float, float]:
+    row = _connect().execute(
+        "SELECT "
+        "COALESCE((SELECT SUM(amount) FROM transactions WHERE type = 'INCOME' AND date BETWEEN ? AND ?), 0.0), "
+        "COALESCE((SELECT SUM(ABS(amount)) FROM transactions WHERE type = 'EXPENSE' AND date BETWEEN ? AND ?), 0.0)",
+        (start, end, start, end),
+    ).fetchone()
+    return row[0], row[1]
+
+
+def get_balance_as_of(day: date) -> float:
+    view = _read_model_view()
+    if view is not None:
+        income, expense = view.net_flow(date.min, day)
+        return income - expense
+    income, expense = _income_expense_between("", day.isoformat())
+    return income - expense
+
+
+def get_net_flow(start: date, end: date) -> dict:
+    view = _read_model_view()
+    if view is not None:
+        income, expense = view.net_flow(start, end)
+        return {"income": income, "expense": expense, "net": income - expense}
+    income, expense = _income_expense_between(start.isoformat(), end.isoformat())
+    return {"income": income, "expense": expense, "net": income - expense}
+
+
+def get_monthly_income_expense(start: date, end: date):
+    """
+    Returns:
+    [
+      { "month": "Jan", "income": 0, "expense": 0 },
+      ...
+    ]
+    """
+    view = _read_model_view()
+    if view is not None:
+        income, expense = view.month_of_year(start, end)
+        by_month = {i: pair for i, pair in enumerate(zip(income, expense), start=1)}
+        return _month_rows(by_month)
+    rows = _connect().execute(
+        "SELECT CAST(strftime('%m', date) AS INTEGER) AS month, "
+        "SUM(CASE WHEN type = 'INCOME' THEN amount ELSE 0 END) AS income, "
+        "SUM(CASE WHEN type = 'INCOME' THEN 0 ELSE ABS(amount) END) AS expense "
+        "FROM transactions WHERE date BETWEEN ? AND ? GROUP BY month",
+        (start.isoformat(), end.isoformat()),
+    ).fetchall()
+    by_month = {r["month"]: (r["income"], r["expense"]) for r in rows}
+    return _month_rows(by_month)
+
+
+def _month_rows(by_month: dict):
+    """Chart rows Jan..Dec from {month number: (income, expense)}."""
+    ordered_months = ["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"]
+    return [
+        {
+            "month": m,
+            "income": by_month.get(i, (0.0, 0.0))[0],
+            "expense": by_month.get(i, (0.0, 0.0))[1],
+        }
+        for i, m in enumerate(ordered_months, start=1)
+    ]
+
+
+def get_income_expense_series(start: date, end: date, granularity: str):
+    """Income and expense per calendar period; same rows as storage.get_income_expense_series."""
+    view = _read_model_view()
+    if view is not None:
+        return view.series(start, end, granularity)
+    rows = _connect().execute(
+        "SELECT date, "
+        "SUM(CASE WHEN type = 'INCOME' THEN amount ELSE 0 END) AS income, "
+        "SUM(CASE WHEN type = 'INCOME' THEN 0 ELSE ABS(amount) END) AS expense "
+        "FROM transactions WHERE date BETWEEN ? AND ? GROUP BY date",
+        (start.isoformat(), end.isoformat()),
+    ).fetchall()
+    rollups = TimeRollups()
+    for r in rows:
+        rollups.add(date.fromisoformat(r["date"]), r["income"], r["expense"])
+    return rollups.series(start, end, granularity)
+
+
+def get_cashflow_stats(since: date):
+    """
+    Totals over transactions dated on/after `since` (all transactions if none are):
+    { "total", "first_date", "last_date", "by_category": {category: total} }
+    Returns None when there are no transactions.
+    """
+    view = _read_model_view()
+    if view is not None:
+        return view.cashflow_stats(since)
+    conn = _connect()
+    floor = since.isoformat()
+    if conn.execute("SELECT 1 FROM transactions WHERE date >= ? LIMIT 1", (floor,)).fetchone() is None:
+        floor = ""  # nothing recent: use all transactions
+    row = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(amount), 0.0), MIN(date), MAX(date) FROM transactions WHERE date >= ?",
+        (floor,),
+    ).fetchone()
+    if row[0] == 0:
+        return None
+    by_category = {}
+    for r in conn.execute(
+        "SELECT LOWER(category) AS category, SUM(amount) AS total FROM transactions WHERE date >= ? GROUP BY LOWER(category)",
+        (floor,),
+    ):
+        name = r["category"] or "misc"
+        by_category[name] = by_category.get(name, 0.0) + r["total"]
+    return {
+        "total": row[1],
+        "first_date": date.fromisoformat(row[2]),
+        "last_date": date.fromisoformat(row[3]),
+        "by_category": by_category,
+    }
@@ -1,53 +1,110 @@
+import functools
+import math
+from contextlib import ExitStack, contextmanager
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
 from datetime import date, datetime, timezone
 from app.models import Notification, Transaction, Budget, Goal, FinancialSummary, TransactionType
 from collections import defaultdict
 from app import file_storage
+from app.columnar import TransactionColumns, normalize_category
+from app.read_cache import ReadCache
+from app.rollups import TimeRollups
+from app.balance_index import BalanceIndex
+from app.frozen_view import CHUNK_SIZE, FrozenPrefix, SlotVector
+from app.errors import VersionConflictError
 import logging
 
 logger = logging.getLogger(__name__)
 
+# "json" (default, module-level lists mirrored to JSON files) or "sqlite" (app.sqlite_storage)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json").strip().lower()
+# Chart ranges kept by the read cache (least recently used are dropped first)
+READ_CACHE_CHART_RANGES = int(os.getenv("READ_CACHE_CHART_RANGES", "128"))
+
+
+# Seed data for first-time setup
+def _seed_transactions() -> list[Transaction]:
+    return [
+        Transaction(id=1, amount=12.5, category="coffee", date=date(2025, 12, 1), description="Morning latte", type="EXPENSE"),
+        Transaction(id=2, amount=45.0, category="groceries", date=date(2025, 12, 2), description="Weekly shop", type="EXPENSE"),
+        Transaction(id=3, amount=1200.0, category="rent", date=date(2025, 12, 1), description="Monthly rent", type="EXPENSE"),
+    ]
+
+
+def _seed_budgets() -> list[Budget]:
+    return [
+        Budget(id=1, name="Monthly Groceries", monthly_limit=400.0, alert_threshold=0.9, category="groceries", spent_this_month=400.0),
+        Budget(id=2, name="Entertainment Budget", monthly_limit=50.0, alert_threshold=0.7, category="entertainment", spent_this_month=0.0),
+        Budget(id=3, name="Transport Budget", monthly_limit=1200.0, alert_threshold=0.8, category="transport", spent_this_month=0.0),
+        Budget(id=4, name="Rent", monthly_limit=1200.0, alert_threshold=1.0, category="rent", spent_this_month=1200.0),
+        Budget(id=5, name="Utilities", monthly_limit=120.0, alert_threshold=0.7, category="utilities", spent_this_month=65.5),
+    ]
+
+
+def _seed_goals() -> list[Goal]:
+    return [
+        Goal(id=1, name="Emergency Fund", target_amount=1000.0, saved_amount=200.0, target_date=date(2025, 12, 31), description="Emergency fund for unexpected expenses"),
+        Goal(id=2, name="Vacation", target_amount=1500.0, saved_amount=300.0, target_date=date(2026, 6, 30), description="Vacation fund for summer trip"),
+        Goal(id=3, name="New Laptop", target_amount=2000.0, saved_amount=500.0, target_date=date(2026, 3, 31), description="Saving for a new laptop"),
+    ]
+
+
 # Initialize storage by loading from files
 # If files are empty, use seed data for first-time setup
 def _initialize_storage():
     """Load data from files, or use seed data if files are empty."""
+    with _locked(*_versions):
+        _load_collections()
+
+
+def _load_collections():
     global transactions, budgets, goals, notifications
     global _tx_auto_id, _budget_auto_id, _goal_auto_id, _notification_counter
 
-    # Try to load from files
+    # The JSON files belong to one process; fail fast if another one already serves them
+    file_storage.claim_storage_dir()
+
+    # Pending write-behind saves refer to the lists about to be replaced
+    file_storage.flush_pending()
+
+    # Try to load from files (snapshot first, then replay the append-only journal)
     transactions = file_storage.load_transactions()
-    budgets = file_storage.load_budgets()
-    goals = file_storage.load_goals()
-    notifications = file_storage.load_notifications()
+    replayed = file_storage.replay_transaction_journal(transactions)
+    if replayed and not file_storage.journal_active():
+        # Journal mode was switched off: fold leftover records into the snapshot
+        file_storage.save_transactions(transactions)
+    elif file_storage.PARTITIONED and transactions and not file_storage.TRANSACTIONS_MANIFEST_FILE.exists():
+        # First start with month partitions: split the single snapshot by month
+        file_storage.save_transactions(transactions)
+    budgets = tuple(file_storage.load_budgets())
+    goals = tuple(file_storage.load_goals())
+    notifications = tuple(file_storage.load_notifications())
 
     # If files are empty, use seed data for first-time setup
     if not transactions:
-        transactions = [
-            Transaction(id=1, amount=12.5, category="coffee", date=date(2025, 12, 1), description="Morning latte", type="EXPENSE"),
-            Transaction(id=2, amount=45.0, category="groceries", date=date(2025, 12, 2), description="Weekly shop", type="EXPENSE"),
-            Transaction(id=3, amount=1200.0, category="rent", date=date(2025, 12, 1), description="Monthly rent", type="EXPENSE"),
-        ]
+        transactions = _seed_transactions()
         file_storage.save_transactions(transactions)
 
     if not budgets:
-        budgets = [
-            Budget(id=1, name="Monthly Groceries", monthly_limit=400.0, alert_threshold=0.9, category="groceries", spent_this_month=400.0),
-            Budget(id=2, name="Entertainment Budget", monthly_limit=50.0, alert_threshold=0.7, category="entertainment", spent_this_month=0.0),
-            Budget(id=3, name="Transport Budget", monthly_limit=1200.0, alert_threshold=0.8, category="transport", spent_this_month=0.0),
-            Budget(id=4, name="Rent", monthly_limit=1200.0, alert_threshold=1.0, category="rent", spent_this_month=1200.0),
-            Budget(id=5, name="Utilities", monthly_limit=120.0, alert_threshold=0.7, category="utilities", spent_this_month=65.5),
-        ]
+        budgets = tuple(_seed_budgets())
         file_storage.save_budgets(budgets)
 
     if not goals:
-        goals = [
-            Goal(id=1, name="Emergency Fund", target_amount=1000.0, saved_amount=200.0, target_date=date(2025, 12, 31), description="Emergency fund for unexpected expenses"),
-            Goal(id=2, name="Vacation", target_amount=1500.0, saved_amount=300.0, target_date=date(2026, 6, 30), description="Vacation fund for summer trip"),
-            Goal(id=3, name="New Laptop", target_amount=2000.0, saved_amount=500.0, target_date=date(2026, 3, 31), description="Saving for a new laptop"),
-        ]
+        goals = tuple(_seed_goals())
         file_storage.save_goals(goals)
 
     # notifications can be empty on first run
     file_storage.save_notifications(notifications)
+    transactions = SlotVector(transactions)
+
+    # Derived state (indexes, columnar copy, running totals)
+    _rebuild_transaction_state()
+    _rebuild_budget_indexes()
+    _rebuild_goal_indexes()
+    _rebuild_notification_indexes()
 
     # Sync auto-increment IDs with loaded data
     _tx_auto_id = max((tx.id for tx in transactions), default=0) + 1
@@ -55,86 +112,580 @@ def _initialize_storage():
     _goal_auto_id = max((g.id for g in goals), default=0) + 1
     _notification_counter = max((n.id for n in notifications), default=0) + 1
 
+    # Everything may have changed on reload
+    _read_cache.clear()
+    _bump_versions(*_versions)
+
     logger.info(f"Storage initialized: {len(transactions)} transactions, {len(budgets)} budgets, {len(goals)} goals, {len(notifications)} notifications")
 
-# Initialize global lists
-transactions: list[Transaction] = []
-budgets: list[Budget] = []
-goals: list[Goal] = []
-notifications: list[Notification] = []
+# Initialize global collections (copy-on-write).
+# Transactions live in a SlotVector: appends fill its last chunk in place, an
+# edit or delete copies only the chunk it touches (a delete leaves a tombstone),
+# so list_transactions() can hand out FrozenPrefix views without copying. The
+# other collections are tuples, replaced on every write.
+transactions: SlotVector = SlotVector()
+budgets: tuple[Budget, ...] = ()
+goals: tuple[Goal, ...] = ()
+notifications: tuple[Notification, ...] = ()
 _tx_auto_id = 1
 _budget_auto_id = 1
 _goal_auto_id = 1
 _notification_counter = 1
 
-# Load data on module import
-_initialize_storage()
+# --- Write locks --- #
+# One reentrant lock per collection. Every write holds the locks of the
+# collections it changes (taken in name order, so writers never deadlock),
+# which serializes id allocation and read-modify-write updates. Readers take
+# no lock: they read the immutable tuples / FrozenPrefix views published by writers.
+_locks = {name: threading.RLock() for name in ("budgets", "goals", "notifications", "transactions")}
+
+
+@contextmanager
+def _locked(*collections: str):
+    with ExitStack() as stack:
+        for name in sorted(set(collections)):
+            stack.enter_context(_locks[name])
+        yield
+
+
+# --- Data versions --- #
+# Per-collection counters bumped after every mutation, so readers (e.g. routes
+# sending ETags) can tell whether anything changed without looking at the data.
+# The epoch differs per process start, so versions from an earlier run never match.
+_versions = {"transactions": 0, "budgets": 0, "goals": 0, "notifications": 0}
+_version_epoch = format(time.time_ns(), "x")
+_version_lock = threading.Lock()
+# mutating function name -> collections it changes
+_MUTATORS: dict[str, tuple[str, ...]] = {}
+
+
+def _bump_versions(*collections: str):
+    with _version_lock:
+        for name in collections:
+            _versions[name] += 1
+    _read_cache.collections_changed(collections)
+
+
+def _mutates(*collections: str):
+    """
+    Run the decorated write holding the collections' locks, and bump their
+    versions once it has returned (still under the locks, so versions follow
+    the order in which writes landed).
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _locked(*collections):
+                result = fn(*args, **kwargs)
+                _bump_versions(*collections)
+            return result
+        _MUTATORS[fn.__name__] = collections
+        return wrapper
+    return decorate
+
+
+def data_version(*collections: str) -> str:
+    """
+    Opaque token for the current state of the given collections; it changes
+    whenever any of them is written. Read it before reading the data it stands for.
+    """
+    return _version_epoch + "-" + ".".join(str(_versions[name]) for name in collections)
+
+
+# --- Indexes --- #
+# id -> position in the matching tuple; for transactions, id -> slot in the
+# SlotVector (slots never shift, deletes leave tombstones). Notifications are
+# stored newest first, so for them the index holds the insertion sequence
+# (position = len - 1 - seq).
+_tx_positions: dict[int, int] = {}
+_budget_positions: dict[int, int] = {}
+_goal_positions: dict[int, int] = {}
+_notification_seqs: dict[int, int] = {}
+# normalized category -> id of the first budget for it
+_budget_by_category: dict[str, int] = {}
+# normalized category -> its transactions' ids, as (date ordinal, id) keys in
+# sorted order; list_transactions_page filters by category through it
+_date_keys_by_category: defaultdict[str, list[tuple[int, int]]] = defaultdict(list)
+
+
+def _lookup(positions: dict, items: list, item_id: int, rebuild) -> int | None:
+    """Position of item_id via its index; rebuilds the index if the list was changed outside storage."""
+    pos = positions.get(item_id)
+    if pos is not None and pos < len(items) and items[pos].id == item_id:
+        return pos
+    if pos is None and len(positions) == len(items):
+        return None
+    rebuild()
+    return positions.get(item_id)
+
+
+# Index rebuilds take the collection's lock: a reader that finds an index out
+# of date waits for the write in progress instead of rebuilding under it.
+def _rebuild_budget_indexes():
+    with _locks["budgets"]:
+        _budget_positions.clear()
+        _budget_by_category.clear()
+        for idx, b in enumerate(budgets):
+            _budget_positions[b.id] = idx
+            _budget_by_category.setdefault(normalize_category(b.category), b.id)
+
+
+def _rebuild_goal_indexes():
+    with _locks["goals"]:
+        _goal_positions.clear()
+        _goal_positions.update((g.id, idx) for idx, g in enumerate(goals))
+
+
+def _rebuild_notification_indexes():
+    with _locks["notifications"]:
+        _notification_seqs.clear()
+        last = len(notifications) - 1
+        _notification_seqs.update((n.id, last - idx) for idx, n in enumerate(notifications))
+
+
+def _budget_position(budget_id: int) -> int | None:
+    return _lookup(_budget_positions, budgets, budget_id, _rebuild_budget_indexes)
+
+
+def _budget_position_for_category(category: str) -> int | None:
+    if len(_budget_positions) != len(budgets):
+        _rebuild_budget_indexes()
+    budget_id = _budget_by_category.get(normalize_category(category))
+    return None if budget_id is None else _budget_position(budget_id)
+
+
+def _tx_position(tx_id: int) -> int | None:
+    """Slot of tx_id via the index; rebuilds it if `transactions` was changed outside storage."""
+    _sync_transaction_state()
+    slot = _tx_positions.get(tx_id)
+    tx = None if slot is None else transactions.get_slot(slot)
+    if tx is not None and tx.id == tx_id:
+        return slot
+    if slot is None and len(_tx_positions) == len(transactions):
+        return None
+    _rebuild_transaction_state()
+    return _tx_positions.get(tx_id)
+
+
+def _goal_position(goal_id: int) -> int | None:
+    return _lookup(_goal_positions, goals, goal_id, _rebuild_goal_indexes)
+
+
+def _notification_position(notification_id: int) -> int | None:
+    if len(_notification_seqs) != len(notifications):
+        _rebuild_notification_indexes()
+    seq = _notification_seqs.get(notification_id)
+    if seq is None:
+        return None
+    pos = len(notifications) - 1 - seq
+    if notifications[pos].id != notification_id:
+        _rebuild_notification_indexes()
+        seq = _notification_seqs.get(notification_id)
+        return None if seq is None else len(notifications) - 1 - seq
+    return pos
+
+
+# --- Derived transaction state --- #
+# Kept in step with `transactions` on every write so reads don't rescan the list.
+_columns = TransactionColumns()  # amount/date/category columns for get_cashflow_stats
+_totals = {"income": 0.0, "expense": 0.0, "count": 0}  # running totals
+# (date ordinal, id) keys of every transaction in sorted order, for keyset
+# pagination and date-range filters
+_date_keys: list[tuple[int, int]] = []
+# (normalized category, "YYYY-MM") -> expense total; budgets read their spending from here
+_category_month_spend: defaultdict[tuple[str, str], float] = defaultdict(float)
+# Income/expense per day, week, month and year, for the chart
+_rollups = TimeRollups()
+# Cumulative income/expense by date, for balances as of a day
+_balance_index = BalanceIndex()
+# Summary and chart results, dropped by the writes that affect them
+_read_cache = ReadCache(READ_CACHE_CHART_RANGES)
+# What list_budgets() hands out: (budgets tuple it was built from, "YYYY-MM",
+# the budgets with that month's spend). Republished by budget writes, by
+# transaction writes that change a budgeted category's spend this month,
+# and by the first read in a new month.
+_budget_view: tuple = (None, None, ())
+_budget_view_lock = threading.Lock()
+
+
+def _compute_totals(txs) -> dict:
+    totals = {"income": 0.0, "expense": 0.0, "count": 0}
+    for tx in txs:
+        if tx.type == TransactionType.INCOME:
+            totals["income"] += tx.amount
+        else:
+            totals["expense"] += abs(tx.amount)
+        totals["count"] += 1
+    return totals
+
+
+def _rebuild_transaction_state():
+    with _locks["transactions"]:
+        _rebuild_transaction_state_locked()
+
+
+def _rebuild_transaction_state_locked():
+    _compact_transactions()
+    _date_keys_by_category.clear()
+    for tx in transactions:
+        _date_keys_by_category[normalize_category(tx.category)].append((tx.date.toordinal(), tx.id))
+    for keys in _date_keys_by_category.values():
+        keys.sort()
+    _date_keys[:] = sorted(key for keys in _date_keys_by_category.values() for key in keys)
+    _totals.update(_compute_totals(transactions))
+    _category_month_spend.clear()
+    _rollups.clear()
+    _read_cache.clear()
+    flows = []
+    for tx in transactions:
+        if tx.type == TransactionType.EXPENSE:
+            _category_month_spend[(normalize_category(tx.category), file_storage.month_key(tx.date))] += abs(tx.amount)
+            flows.append((tx.date, 0.0, abs(tx.amount)))
+        else:
+            flows.append((tx.date, tx.amount, 0.0))
+        _rollups.add(*flows[-1])
+    _balance_index.rebuild(flows)
+    _publish_budgets()
+
+
+def _sync_transaction_state():
+    """
+    Rebuild derived state if `transactions` was changed outside storage.
+    Skipped while another thread is writing: mid-write the counts disagree
+    legitimately, and the writer brings them back in line itself.
+    """
+    lock = _locks["transactions"]
+    if not lock.acquire(blocking=False):
+        return
+    try:
+        n = len(transactions)
+        if (_totals["count"] != n or len(_tx_positions) != n or len(_date_keys) != n
+                or len(_columns) != transactions.slot_count):
+            _rebuild_transaction_state_locked()
+    finally:
+        lock.release()
+
+
+def _append_transactions(new_txs: list[Transaction]):
+    """Append to `transactions` and update indexes, columns and running totals."""
+    _sync_transaction_state()
+    for tx in new_txs:
+        _tx_positions[tx.id] = transactions.slot_count
+        transactions.append(tx)
+        key = (tx.date.toordinal(), tx.id)
+        _insert_date_key(_date_keys, key)
+        _insert_date_key(_date_keys_by_category[normalize_category(tx.category)], key)
+        _apply_transaction(tx)
+    _columns.extend(new_txs)
+    _read_cache.transactions_changed(tx.date for tx in new_txs)
+    _budget_spend_changed(new_txs)
+
+
+def _remove_date_key(keys: list, key: tuple[int, int]):
+    i = bisect_left(keys, key)
+    if i < len(keys) and keys[i] == key:
+        del keys[i]
+
+
+def _compact_transactions():
+    """Drop the tombstones from `transactions`; slots move, so the slot-based index and columns are rebuilt."""
+    transactions.compact()
+    _tx_positions.clear()
+    _tx_positions.update((tx.id, slot) for slot, tx in enumerate(transactions))
+    _columns.rebuild(transactions)
+
+
+def _replace_transaction(slot: int, updated: Transaction) -> Transaction:
+    """Swap in an edited transaction, moving its old contribution out of every derived structure."""
+    previous = transactions.get_slot(slot)
+    _apply_transaction(previous, -1)
+    old_category, new_category = normalize_category(previous.category), normalize_category(updated.category)
+    old_key, new_key = (previous.date.toordinal(), previous.id), (updated.date.toordinal(), updated.id)
+    if old_key != new_key:
+        _remove_date_key(_date_keys, old_key)
+        _insert_date_key(_date_keys, new_key)
+    if old_key != new_key or old_category != new_category:
+        _remove_date_key(_date_keys_by_category[old_category], old_key)
+        _insert_date_key(_date_keys_by_category[new_category], new_key)
+    # Copies only the slot's chunk: views already handed out keep the old one
+    transactions.set_slot(slot, updated)
+    _apply_transaction(updated)
+    _columns.replace(slot, updated)
+    _read_cache.transactions_changed([previous.date, updated.date])
+    _budget_spend_changed([previous, updated])
+    return previous
+
+
+def _remove_transaction(slot: int) -> Transaction:
+    """Delete the transaction in a slot, subtracting it from every derived structure."""
+    tx = transactions.get_slot(slot)
+    _apply_transaction(tx, -1)
+    category = normalize_category(tx.category)
+    key = (tx.date.toordinal(), tx.id)
+    _remove_date_key(_date_keys, key)
+    _remove_date_key(_date_keys_by_category[category], key)
+    # A tombstone in a copy of the slot's chunk; later slots keep their place
+    transactions.set_slot(slot, None)
+    del _tx_positions[tx.id]
+    _columns.delete(slot)
+    # Compacting is O(n), so waiting until tombstones outnumber live rows keeps deletes amortized O(1)
+    if transactions.slot_count - len(transactions) > max(CHUNK_SIZE, len(transactions)):
+        _compact_transactions()
+    _read_cache.transactions_changed([tx.date])
+    _budget_spend_changed([tx])
+    return tx
+
+
+def _insert_date_key(keys: list, key: tuple[int, int]):
+    # New transactions are usually the latest, so this is mostly a plain append
+    if not keys or key > keys[-1]:
+        keys.append(key)
+    else:
+        insort(keys, key)
+
 
+def _apply_transaction(tx: Transaction, sign: int = 1):
+    """
+    Add (sign=1) or remove (sign=-1) a transaction's contribution to the running
+    totals, spend aggregates, rollups and balance index.
+    """
+    if tx.type == TransactionType.INCOME:
+        income, expense = sign * tx.amount, 0.0
+        _totals["income"] += income
+    else:
+        income, expense = 0.0, sign * abs(tx.amount)
+        _totals["expense"] += expense
+        _category_month_spend[(normalize_category(tx.category), file_storage.month_key(tx.date))] += expense
+    _rollups.add(tx.date, income, expense)
+    _balance_index.add(tx.date, income, expense)
+    _totals["count"] += sign
+
+
+def _transaction_columns() -> TransactionColumns:
+    _sync_transaction_state()
+    return _columns
 
+
+def check_totals_consistency(repair: bool = True) -> dict:
+    """
+    Recompute income/expense/count from scratch and compare with the running totals.
+    Returns {"ok", "running", "recomputed"}; on drift the running totals are
+    logged and (with repair=True) replaced by the recomputed values.
+    """
+    # Under the write lock, so totals and list are compared at the same point
+    with _locks["transactions"]:
+        running = dict(_totals)
+        recomputed = _compute_totals(transactions)
+        ok = (
+            running["count"] == recomputed["count"]
+            and math.isclose(running["income"], recomputed["income"], rel_tol=1e-9, abs_tol=1e-6)
+            and math.isclose(running["expense"], recomputed["expense"], rel_tol=1e-9, abs_tol=1e-6)
+        )
+        if not ok:
+            logger.warning(f"Running totals drifted: running={running} recomputed={recomputed}")
+            if repair:
+                _totals.update(recomputed)
+                _read_cache.clear()
+    return {"ok": ok, "running": running, "recomputed": recomputed}
+
+
+@_mutates("transactions")
 def add_transaction(tx_data) -> Transaction:
     global _tx_auto_id
     tx = Transaction(id=_tx_auto_id, **tx_data.dict())
     _tx_auto_id += 1
-    transactions.append(tx)
+    _append_transactions([tx])
 
-    # Persist to file
-    file_storage.save_transactions(transactions)
+    # Persist to file (one journal append in journal mode).
+    # Budget spending follows from the (category, month) aggregates, so budgets aren't rewritten.
+    file_storage.record_transaction(tx, transactions.snapshot())
 
-    # Update budget spending if expense
-    if tx.type == TransactionType.EXPENSE and tx.category:
-        for idx, b in enumerate(budgets):
-            if b.category.lower() == tx.category.lower():
-                # Increase spent_this_month
-                updated_budget = b.model_copy(
-                    update={
-                        "spent_this_month": b.spent_this_month + abs(tx.amount)
-                    }
-                )
-                budgets[idx] = updated_budget
-                break  # one transaction matches only one budget
-
-        # Persist updated budgets to file
-        file_storage.save_budgets(budgets)
+    return tx
+
+
+@_mutates("transactions")
+def add_transactions(tx_datas) -> list[Transaction]:
+    """
+    Add many transactions at once (bulk import).
+    Persists once instead of per row.
+    """
+    global _tx_auto_id
+    if not tx_datas:
+        return []
+
+    created = []
+    for tx_data in tx_datas:
+        created.append(Transaction(id=_tx_auto_id, **tx_data.model_dump()))
+        _tx_auto_id += 1
+    _append_transactions(created)
+
+    # Persist to file (a single journal append in journal mode)
+    file_storage.record_transactions(created, transactions.snapshot())
+
+    return created
+
+
+@_mutates("transactions")
+def update_transaction(tx_id: int, tx_data) -> tuple[Transaction, Transaction]:
+    """Replace a transaction; returns (previous, updated), the previous one as read under the write lock."""
+    slot = _tx_position(tx_id)
+    if slot is None:
+        raise ValueError("Transaction not found")
+    updated = Transaction(id=tx_id, **tx_data.model_dump())
+    previous = _replace_transaction(slot, updated)
 
+    # Persist to file (one journal record in journal mode)
+    file_storage.record_transaction_update(previous, updated, transactions.snapshot())
+    return previous, updated
+
+
+@_mutates("transactions")
+def delete_transaction(tx_id: int) -> Transaction:
+    """Remove a transaction and return it."""
+    slot = _tx_position(tx_id)
+    if slot is None:
+        raise ValueError("Transaction not found")
+    tx = _remove_transaction(slot)
+
+    # Persist to file (one journal record in journal mode)
+    file_storage.record_transaction_delete(tx, transactions.snapshot())
     return tx
 
 
-def list_transactions() -> list[Transaction]:
-    return list(transactions)
+def get_transaction(tx_id: int) -> Transaction | None:
+    slot = _tx_position(tx_id)
+    return None if slot is None else transactions.get_slot(slot)
+
+
+def get_category_month_spend(category: str, month: date | None = None) -> float:
+    """Expenses in a category (case-insensitive) during the month containing `month` (default: this month)."""
+    _sync_transaction_state()
+    return _category_month_spend.get((normalize_category(category), file_storage.month_key(month or date.today())), 0.0)
+
+
+def list_transactions() -> FrozenPrefix:
+    """Read-only snapshot of every transaction; taking it copies nothing."""
+    return transactions.snapshot()
 
 
+def list_transactions_page(
+    limit: int,
+    after: tuple[date, int] | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    category: str | None = None,
+    tx_type: TransactionType | None = None,
+    min_amount: float | None = None,
+    max_amount: float | None = None,
+    descending: bool = False,
+) -> tuple[list[Transaction], tuple[date, int] | None]:
+    """
+    One page of transactions in (date, id) order, read from the date-sorted index.
+    `after` is the (date, id) key of the last transaction on the previous page.
+    Date range and category narrow the index slice by binary search; type and
+    amount are checked per row. Returns (page, key to pass as `after` next, or None).
+    """
+    _sync_transaction_state()
+    keys = _date_keys if category is None else _date_keys_by_category.get(normalize_category(category), [])
+    lo = bisect_left(keys, (start.toordinal(),)) if start else 0
+    hi = bisect_left(keys, (end.toordinal() + 1,)) if end else len(keys)
+    if after is not None:
+        after_key = (after[0].toordinal(), after[1])
+        if descending:
+            hi = min(hi, bisect_left(keys, after_key))
+        else:
+            lo = max(lo, bisect_right(keys, after_key))
+
+    page = []
+    for i in (range(hi - 1, lo - 1, -1) if descending else range(lo, hi)):
+        tx = transactions.get_slot(_tx_positions[keys[i][1]])
+        if tx_type is not None and tx.type != tx_type:
+            continue
+        if (min_amount is not None and tx.amount < min_amount) or (max_amount is not None and tx.amount > max_amount):
+            continue
+        if len(page) == limit:
+            # Another match exists, so the page gets a continuation key
+            return page, (page[-1].date, page[-1].id)
+        page.append(tx)
+    return page, None
+
+
+@_mutates("budgets")
 def add_budget(budget_data) -> Budget:
-    global _budget_auto_id
+    global budgets, _budget_auto_id
     b = Budget(id=_budget_auto_id, **budget_data.dict())
     _budget_auto_id += 1
-    budgets.append(b)
+    if len(_budget_positions) != len(budgets):
+        _rebuild_budget_indexes()
+    _budget_positions[b.id] = len(budgets)
+    _budget_by_category.setdefault(normalize_category(b.category), b.id)
+    budgets = (*budgets, b)
+    _publish_budgets()
     # Persist to file
     file_storage.save_budgets(budgets)
-    return b
-
-def list_budgets() -> list[Budget]:
-    return list(budgets)
-
+    return _with_current_spend(b)
+
+def _with_current_spend(b: Budget) -> Budget:
+    """The budget with spent_this_month taken from the current month's aggregate."""
+    spent = get_category_month_spend(b.category)
+    return b if b.spent_this_month == spent else b.model_copy(update={"spent_this_month": spent})
+
+def _publish_budgets():
+    """Rebuild the budgets readers get from the current `budgets` and spend aggregates."""
+    global _budget_view
+    with _budget_view_lock:
+        source = budgets
+        month = file_storage.month_key(date.today())
+        _budget_view = (source, month, tuple(_with_current_spend(b) for b in source))
+
+def _budget_spend_changed(txs):
+    """Republish the budgets if any of txs is this month's expense in a budgeted category."""
+    month = file_storage.month_key(date.today())
+    if any(tx.type == TransactionType.EXPENSE and file_storage.month_key(tx.date) == month
+           and normalize_category(tx.category) in _budget_by_category for tx in txs):
+        _publish_budgets()
+
+def list_budgets() -> tuple[Budget, ...]:
+    """The budgets with this month's spend; an immutable tuple published by writers, so no copy is made."""
+    source, month, view = _budget_view
+    if source is not budgets or month != file_storage.month_key(date.today()):
+        # A new month (spend starts over) or budgets replaced outside storage
+        _publish_budgets()
+        view = _budget_view[2]
+    return view
+
+def get_budget_for_category(category: str) -> Budget | None:
+    """The budget tracking a category (case-insensitive), if any."""
+    idx = _budget_position_for_category(category)
+    return None if idx is None else list_budgets()[idx]
+
+@_mutates("goals")
 def add_goal(goal_data) -> Goal:
-    global _goal_auto_id
+    global goals, _goal_auto_id
     g = Goal(id=_goal_auto_id, **goal_data.dict())
     _goal_auto_id += 1
-    goals.append(g)
+    if len(_goal_positions) != len(goals):
+        _rebuild_goal_indexes()
+    _goal_positions[g.id] = len(goals)
+    goals = (*goals, g)
     # Persist to file
     file_storage.save_goals(goals)
     return g
 
-def list_goals() -> list[Goal]:
-    return list(goals)
+def list_goals() -> tuple[Goal, ...]:
+    """The current goals; an immutable tuple, so no copy is needed."""
+    return goals
 
 def get_financial_summary() -> FinancialSummary:
-    total_income = sum(
-        tx.amount for tx in transactions if tx.type == TransactionType.INCOME
-    )
+    """
+    Cached until transactions, budgets or goals change or the month rolls over
+    (budget spend is this month's); treat the result as read-only.
+    """
+    _sync_transaction_state()
+    return _read_cache.summary(_build_financial_summary, key=file_storage.month_key(date.today()))
 
-    total_expense = sum(
-        abs(tx.amount) for tx in transactions if tx.type == TransactionType.EXPENSE
-    )
+def _build_financial_summary() -> FinancialSummary:
+    total_income, total_expense = _totals["income"], _totals["expense"]
 
     total_balance = total_income - total_expense
 
@@ -142,34 +693,56 @@ def get_financial_summary() -> FinancialSummary:
         total_balance=total_balance,
         total_income=total_income,
         total_expense=total_expense,
-        transactions_count=len(transactions),
-        budgets=list(budgets),
-        goals=list(goals),
+        transactions_count=_totals["count"],
+        budgets=list_budgets(),
+        goals=goals,
     )
 
-def update_goal(goal_id: int, goal_data) -> Goal:
-    for idx, g in enumerate(goals):
-        if g.id == goal_id:
-            updated_goal = g.model_copy(update=goal_data.dict())
-            goals[idx] = updated_goal
-            # Persist to file
-            file_storage.save_goals(goals)
-            return updated_goal
-    raise ValueError("Goal not found") # In real code, raise HTTPException with 404 status
-
-def update_budget(budget_id: int, budget_data) -> Budget:
-    for idx, b in enumerate(budgets):
-        if b.id == budget_id:
-            updated_budget = b.model_copy(update=budget_data.dict())
-            budgets[idx] = updated_budget
-            # Persist to file
-            file_storage.save_budgets(budgets)
-            return updated_budget
-    raise ValueError("Budget not found") # In real code, raise HTTPException with 404 status
+def _check_version(entity: str, current, expected_version: int | None):
+    """Compare-and-swap guard: raise if the caller based its update on another version."""
+    if expected_version is not None and current.version != expected_version:
+        raise VersionConflictError(entity, current.id, expected_version, current.version)
+
+@_mutates("goals")
+def update_goal(goal_id: int, goal_data, expected_version: int | None = None) -> Goal:
+    """
+    Replace a goal's fields and bump its version. With expected_version, the
+    update only applies if the goal is still at that version (VersionConflictError otherwise).
+    """
+    global goals
+    idx = _goal_position(goal_id)
+    if idx is None:
+        raise ValueError("Goal not found") # In real code, raise HTTPException with 404 status
+    previous = goals[idx]
+    _check_version("Goal", previous, expected_version)
+    updated_goal = previous.model_copy(update={**goal_data.dict(), "version": previous.version + 1})
+    goals = (*goals[:idx], updated_goal, *goals[idx + 1:])
+    # Persist to file
+    file_storage.save_goals(goals)
+    return updated_goal
+
+@_mutates("budgets")
+def update_budget(budget_id: int, budget_data, expected_version: int | None = None) -> Budget:
+    """Like update_goal: bumps the budget's version, compare-and-swap with expected_version."""
+    global budgets
+    idx = _budget_position(budget_id)
+    if idx is None:
+        raise ValueError("Budget not found") # In real code, raise HTTPException with 404 status
+    previous = budgets[idx]
+    _check_version("Budget", previous, expected_version)
+    updated_budget = previous.model_copy(update={**budget_data.dict(), "version": previous.version + 1})
+    budgets = (*budgets[:idx], updated_budget, *budgets[idx + 1:])
+    if normalize_category(previous.category) != normalize_category(updated_budget.category):
+        _rebuild_budget_indexes()
+    _publish_budgets()
+    # Persist to file
+    file_storage.save_budgets(budgets)
+    return _with_current_spend(updated_budget)
 
 
+@_mutates("notifications")
 def add_notification(notification_type: str, title: str, message: str) -> Notification:
-    global _notification_counter
+    global notifications, _notification_counter
 
     print("Inside add_notification")
     n = Notification(
@@ -181,39 +754,47 @@ def add_notification(notification_type: str, title: str, message: str) -> Notifi
         read=False
     )
     _notification_counter += 1
-    notifications.insert(0, n)
+    if len(_notification_seqs) != len(notifications):
+        _rebuild_notification_indexes()
+    _notification_seqs[n.id] = len(notifications)
+    notifications = (n, *notifications)
     # Persist to file
     file_storage.save_notifications(notifications)
     print("🔔 Notification added:", n)
     return n
 
-def list_notifications():
+def list_notifications() -> tuple[Notification, ...]:
+    """Newest first; an immutable tuple, so no copy is needed."""
     return notifications
 
+@_mutates("notifications")
 def mark_read(id) -> Notification | None:
-    for n in notifications:
-        if n.id == id:
-            n.read = True
-            # Persist to file
-            file_storage.save_notifications(notifications)
-            return n
-    return None
-        
+    global notifications
+    idx = _notification_position(id)
+    if idx is None:
+        return None
+    n = notifications[idx].model_copy(update={"read": True})
+    notifications = (*notifications[:idx], n, *notifications[idx + 1:])
+    # Persist to file
+    file_storage.save_notifications(notifications)
+    return n
+
 
 
 def get_budget_spending(category: str):
     """
-    Returns (spent, limit, alert_threshold) for a given category.
+    Returns (spent this month, limit, alert_threshold) for a given category (case-insensitive).
     If no budget exists, returns (0, 0, 0).
     """
-    for b in budgets:
-        if b.category == category:
-            return (
-                b.spent_this_month,
-                b.monthly_limit,
-                b.alert_threshold
-            )
-    return (0.0, 0.0, 0.0)
+    idx = _budget_position_for_category(category)
+    if idx is None:
+        return (0.0, 0.0, 0.0)
+    b = budgets[idx]
+    return (
+        get_category_month_spend(category),
+        b.monthly_limit,
+        b.alert_threshold
+    )
 
 
 def get_goals_due_between(start: date, end: date):
@@ -233,13 +814,24 @@ def get_goals_due_between(start: date, end: date):
     return due_goals
 
 def get_balance() -> float:
-    total_income = sum(
-        tx.amount for tx in transactions if tx.type == TransactionType.INCOME
-    )
-    total_expense = sum(
-        abs(tx.amount) for tx in transactions if tx.type == TransactionType.EXPENSE
-    )
-    return total_income - total_expense
+    _sync_transaction_state()
+    return _totals["income"] - _totals["expense"]
+
+def get_balance_as_of(day: date) -> float:
+    """Income minus expenses over transactions dated on or before `day`, via the prefix-sum index."""
+    _sync_transaction_state()
+    income, expense = _balance_index.totals_through(day)
+    return income - expense
+
+def get_net_flow(start: date, end: date) -> dict:
+    """
+    Income, expense and net over transactions dated between start and end
+    (inclusive), as the difference of two prefix sums:
+    { "income": 0, "expense": 0, "net": 0 }
+    """
+    _sync_transaction_state()
+    income, expense = _balance_index.totals_between(start, end)
+    return {"income": income, "expense": expense, "net": income - expense}
 
 def get_monthly_income_expense(start: date, end: date):
     """
@@ -248,26 +840,96 @@ def get_monthly_income_expense(start: date, end: date):
       { "month": "Jan", "income": 0, "expense": 0 },
       ...
     ]
+    Cached per (start, end) until a transaction dated in the range is written;
+    treat the result as read-only.
     """
-    monthly = defaultdict(lambda: {"income": 0.0, "expense": 0.0})
+    _sync_transaction_state()
+    return _read_cache.chart(start, end, lambda: _build_monthly_income_expense(start, end))
 
-    for tx in transactions:
-        if start <= tx.date <= end:
-            month = tx.date.strftime("%b")
-            if tx.type == TransactionType.INCOME:
-                monthly[month]["income"] += tx.amount
-            else:
-                monthly[month]["expense"] += abs(tx.amount)
+
+def _build_monthly_income_expense(start: date, end: date):
+    income, expense = _rollups.month_of_year(start, end)
 
     # ensure months order
     ordered_months = ["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"]
 
     result = []
-    for m in ordered_months:
+    for i, m in enumerate(ordered_months):
         result.append({
             "month": m,
-            "income": monthly[m]["income"],
-            "expense": monthly[m]["expense"],
+            "income": float(income[i]),
+            "expense": float(expense[i]),
         })
 
-    return result
\ No newline at end of file
+    return result
+
+
+def get_income_expense_series(start: date, end: date, granularity: str):
+    """
+    Income and expense per calendar period ("day", "week", "month" or "year")
+    between start and end, read from the rollups:
+    [
+      { "period": "2025-12", "start": date, "end": date, "income": 0, "expense": 0 },
+      ...
+    ]
+    Periods cut by the range report only the part inside it. Cached like
+    get_monthly_income_expense; treat the result as read-only.
+    """
+    _sync_transaction_state()
+    return _read_cache.chart(start, end, lambda: _rollups.series(start, end, granularity), variant=granularity)
+
+
+def read_cache_stats() -> dict:
+    """Hit/miss counters of the summary and chart cache, plus the number of cached chart ranges."""
+    return _read_cache.stats()
+
+
+def get_cashflow_stats(since: date):
+    """
+    Totals over transactions dated on/after `since` (all transactions if none are):
+    { "total", "first_date", "last_date", "by_category": {category: total} }
+    Returns None when there are no transactions.
+    """
+    return _transaction_columns().cashflow_stats(since)
+
+
+# --- Backend selection --- #
+# Load data on module import. With the SQLite backend the functions above are
+# replaced by their app.sqlite_storage counterparts and the module-level lists stay empty.
+if STORAGE_BACKEND == "sqlite":
+    from app import sqlite_storage
+    sqlite_storage.initialize(_seed_transactions(), _seed_budgets(), _seed_goals())
+    from app.sqlite_storage import (  # noqa: E402,F811
+        add_transaction,
+        add_transactions,
+        update_transaction,
+        delete_transaction,
+        get_transaction,
+        list_transactions,
+        list_transactions_page,
+        get_category_month_spend,
+        add_budget,
+        list_budgets,
+        get_budget_for_category,
+        update_budget,
+        add_goal,
+        list_goals,
+        update_goal,
+        get_financial_summary,
+        add_notification,
+        list_notifications,
+        mark_read,
+        get_budget_spending,
+        get_goals_due_between,
+        get_balance,
+        get_balance_as_of,
+        get_net_flow,
+        get_monthly_income_expense,
+        get_income_expense_series,
+        get_cashflow_stats,
+        data_version,
+    )
+    for _name, _collections in list(_MUTATORS.items()):
+        globals()[_name] = _mutates(*_collections)(getattr(sqlite_storage, _name))
+else:
+    _initialize_storage()
@@ -0,0 +1,32 @@
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def isolated_storage(tmp_path, monkeypatch):
+    """
+    Point every file_storage path at a temporary directory and reload storage
+    from it, so tests never touch the real user_data files.
+    """
+    from app import file_storage, storage
+
+    base_dir = file_storage.USER_STORAGE_DIR
+    with monkeypatch.context() as m:
+        for name, value in list(vars(file_storage).items()):
+            if name.endswith(("_FILE", "_DIR")) and isinstance(value, Path):
+                try:
+                    relative = value.relative_to(base_dir)
+                except ValueError:
+                    continue
+                m.setattr(file_storage, name, tmp_path / relative)
+        # Modes a test may switch on are switched back before the real data is reloaded
+        for name in ("WRITE_BEHIND", "SNAPSHOT_FORMAT", "JOURNAL_ENABLED", "PARTITIONED"):
+            m.setattr(file_storage, name, getattr(file_storage, name))
+        storage._initialize_storage()
+        yield storage
+        # Write-behind saves must land in tmp_path, before the paths are restored
+        file_storage.stop_flusher()
+
+    # Reload the real data for whatever runs next
+    storage._initialize_storage()
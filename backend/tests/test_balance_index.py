@@ -0,0 +1,98 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import models, sqlite_storage
+from app.agents import tools
+from app.balance_index import BalanceIndex
+from app.routes import summary
+
+
+def _net(tx):
+    return tx.amount if tx.type == models.TransactionType.INCOME else -abs(tx.amount)
+
+
+def _random_transactions(n, seed=5):
+    rng = random.Random(seed)
+    return [
+        models.TransactionBase(
+            amount=round(rng.uniform(-30, 600), 2),
+            category="misc",
+            date=date(2025, 1, 1) + timedelta(days=rng.randrange(400)),  # out of date order
+            type=models.TransactionType.INCOME if rng.random() < 0.3 else models.TransactionType.EXPENSE,
+        )
+        for _ in range(n)
+    ]
+
+
+def test_balance_as_of_and_net_flow_match_a_scan(isolated_storage):
+    storage = isolated_storage
+    storage.add_transactions(_random_transactions(300)[:150])
+    for tx in _random_transactions(300)[150:]:
+        storage.add_transaction(tx)
+    txs = storage.list_transactions()
+
+    for day in (date(2024, 1, 1), date(2025, 3, 9), date(2025, 12, 1), date(2030, 1, 1)):
+        assert storage.get_balance_as_of(day) == pytest.approx(sum(_net(t) for t in txs if t.date <= day))
+    assert storage.get_balance_as_of(date(2030, 1, 1)) == pytest.approx(storage.get_balance())
+
+    start, end = date(2025, 2, 14), date(2025, 8, 31)
+    flow = storage.get_net_flow(start, end)
+    in_range = [t for t in txs if start <= t.date <= end]
+    assert flow["net"] == pytest.approx(sum(_net(t) for t in in_range))
+    assert flow["expense"] == pytest.approx(sum(abs(t.amount) for t in in_range if t.type == models.TransactionType.EXPENSE))
+    assert storage.get_net_flow(end, start) == {"income": 0.0, "expense": 0.0, "net": 0.0}
+
+
+def test_incremental_updates_match_rebuild():
+    entries = [(date(2025, 1, 1) + timedelta(days=(i * 37) % 90), float(i), float(i % 7)) for i in range(200)]
+    incremental = BalanceIndex(capacity=2)
+    for d, income, expense in entries:
+        incremental.add(d, income, expense)
+    rebuilt = BalanceIndex()
+    rebuilt.rebuild(entries)
+    assert len(incremental) == len(rebuilt) == 90
+    for offset in range(-1, 92):
+        d = date(2025, 1, 1) + timedelta(days=offset)
+        assert incremental.totals_through(d) == pytest.approx(rebuilt.totals_through(d))
+
+    d, income, expense = entries[10]
+    incremental.add(d, -income, -expense)
+    assert incremental.totals_between(d, d)[0] == pytest.approx(rebuilt.totals_between(d, d)[0] - income)
+
+
+def test_routes_tool_and_sqlite_parity(isolated_storage, tmp_path, monkeypatch):
+    storage = isolated_storage
+    app = FastAPI()
+    app.include_router(summary.router, prefix="/api/v1/summary")
+    client = TestClient(app)
+    # Seed data: 1257.5 of expenses in December 2025
+    assert client.get("/api/v1/summary/balance", params={"as_of": "2025-12-01"}).json() == {
+        "as_of": "2025-12-01", "balance": -1212.5}
+    flow = client.get("/api/v1/summary/net-flow", params={"start": "2025-12-02", "end": "2025-12-31"}).json()
+    assert (flow["expense"], flow["net"]) == (45.0, -45.0)
+    assert tools.balance_tool({"date": "2025-12-31", "start": "2025-12-01", "end": "2025-12-01"})["net_flow"]["net"] == -1212.5
+
+    monkeypatch.setattr(sqlite_storage, "DB_PATH", tmp_path / "finance.db")
+    sqlite_storage.initialize(storage._seed_transactions(), [], [])
+    assert sqlite_storage.get_balance_as_of(date(2025, 12, 1)) == storage.get_balance_as_of(date(2025, 12, 1))
+    assert sqlite_storage.get_net_flow(date(2025, 12, 2), date(2025, 12, 31)) == storage.get_net_flow(
+        date(2025, 12, 2), date(2025, 12, 31))
+
+
+def test_agent_routes_balance_questions(isolated_storage):
+    from app.agents import agent
+    from app.agents.intent_classifier import classify_intent
+
+    intent = classify_intent("What was my balance on 2025-12-01?")
+    assert intent["intent"] == "ask_balance" and intent["entities"]["date"] == "2025-12-01"
+
+    expected = isolated_storage.get_balance_as_of(date(2025, 12, 1))
+    reply = agent.run_agent_from_intent(intent)
+    assert reply["tool_result"]["balance"] == expected
+    assert reply["response"] == f"Your balance as of 2025-12-01 is ${expected:.2f}."
+    call = agent._choose_and_call(intent)
+    assert call["tool"] == "balance" and call["result"] == reply["tool_result"]
@@ -0,0 +1,70 @@
+from datetime import date
+
+import pytest
+
+from app import file_storage, models, snapshot
+
+
+def test_roundtrip_keeps_models_and_optional_fields():
+    txs = [
+        models.Transaction(id=1, amount=12.5, category="coffee", date=date(2025, 12, 1), type="EXPENSE"),
+        models.Transaction(id=2, amount=2500.0, category="salary", date=date(2025, 12, 2),
+                           description="December", type="INCOME"),
+    ]
+    goals = [models.Goal(id=1, name="Bike", target_amount=500.0), models.Goal(
+        id=2, name="Trip", target_amount=900.0, saved_amount=50.0, target_date=date(2026, 6, 1), description="Rome")]
+
+    collection, loaded = snapshot.decode(snapshot.encode("transactions", txs))
+    assert collection == "transactions"
+    assert loaded == txs
+    assert loaded[1].type is models.TransactionType.INCOME and loaded[0].description is None
+    # Built by model_construct, each with its own fields set
+    assert loaded[0].model_fields_set == set(models.Transaction.model_fields)
+    assert loaded[0].model_fields_set is not loaded[1].model_fields_set
+    assert snapshot.decode(snapshot.encode("goals", goals))[1] == goals
+    assert snapshot.decode(snapshot.encode("budgets", []))[1] == []
+
+
+def test_truncated_snapshot_is_rejected():
+    data = snapshot.encode("budgets", [models.Budget(
+        id=1, name="Food", category="food", monthly_limit=100.0, alert_threshold=0.8)])
+    with pytest.raises(ValueError):
+        snapshot.decode(data[:-3])
+
+
+def test_storage_round_trips_through_binary_snapshots(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    monkeypatch.setattr(file_storage, "SNAPSHOT_FORMAT", "binary")
+    storage.add_notification("info", "Hello", "binary")
+    storage.add_goal(models.GoalBase(name="Car", target_amount=8000.0))
+    file_storage.save_transactions(storage.transactions)
+    expected = (storage.list_transactions(), storage.list_goals(), list(storage.notifications))
+
+    assert file_storage.NOTIFICATIONS_BIN_FILE.exists() and file_storage.TRANSACTIONS_BIN_FILE.exists()
+    storage._initialize_storage()
+    assert (storage.list_transactions(), storage.list_goals(), list(storage.notifications)) == expected
+
+    # Loaded models behave like validated ones
+    assert storage.mark_read(storage.notifications[0].id).read
+    assert storage.notifications[0].model_dump()["read"] is True
+
+
+def test_newer_json_snapshot_wins_after_switching_back(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    monkeypatch.setattr(file_storage, "SNAPSHOT_FORMAT", "binary")
+    storage.add_budget(models.BudgetBase(name="Books", category="books", monthly_limit=30.0, alert_threshold=0.5))
+    monkeypatch.setattr(file_storage, "SNAPSHOT_FORMAT", "json")
+    storage.add_budget(models.BudgetBase(name="Games", category="games", monthly_limit=30.0, alert_threshold=0.5))
+
+    assert [b.name for b in file_storage.load_budgets()][-2:] == ["Books", "Games"]
+
+
+def test_snapshot_from_before_a_new_field_loads_with_its_default(monkeypatch):
+    goal = models.Goal(id=1, name="Bike", target_amount=500.0)
+    monkeypatch.setitem(snapshot.FIELDS, "goals", [f for f in snapshot.FIELDS["goals"] if f[0] != "version"])
+    data = snapshot.encode("goals", [goal])
+    monkeypatch.undo()
+
+    _, loaded = snapshot.decode(data)
+    assert loaded == [goal] and loaded[0].version == 1
+    assert "version" not in loaded[0].model_fields_set
@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+
+from app import models, sqlite_storage
+from app.agents import tools
+
+
+def _tx(amount, day, category="Groceries", tx_type=models.TransactionType.EXPENSE):
+    return models.TransactionBase(amount=amount, category=category, date=day, type=tx_type)
+
+
+def _last_month(today):
+    return today.replace(day=1) - timedelta(days=1)
+
+
+def test_budget_spending_covers_only_the_current_month(isolated_storage):
+    storage = isolated_storage
+    today = date.today()
+    storage.add_transactions([
+        _tx(30.0, today.replace(day=1)),
+        _tx(-5.0, today.replace(day=1), category="GROCERIES"),  # refunds count by absolute value, as in the totals
+        _tx(70.0, _last_month(today)),
+        _tx(1000.0, today, category="groceries", tx_type=models.TransactionType.INCOME),
+    ])
+
+    budget = storage.get_budget_for_category("groceries")
+    assert budget.spent_this_month == 35.0
+    assert storage.get_budget_spending("Groceries") == (35.0, budget.monthly_limit, budget.alert_threshold)
+    assert storage.get_category_month_spend("groceries", _last_month(today)) == 70.0
+    assert storage.get_category_month_spend("groceries", date(2025, 12, 9)) == 45.0  # seed data
+
+    status = {b["name"]: b for b in tools.get_budget_status_tool()["budgets"]}
+    assert status[budget.name]["spent"] == 35.0
+    check = tools.check_spending_ability_tool({"amount": budget.monthly_limit - 30.0, "category": "groceries"})
+    assert check["can_afford"] is False
+
+
+def test_aggregates_rebuilt_from_ledger_at_load(isolated_storage):
+    storage = isolated_storage
+    storage.add_transaction(_tx(12.0, date.today(), category="rent"))
+    storage._category_month_spend.clear()  # simulate drift
+
+    storage._initialize_storage()
+    assert storage.get_budget_spending("rent")[0] == 12.0
+
+
+def test_sqlite_aggregate_is_maintained_and_backfilled(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_storage, "DB_PATH", tmp_path / "spend.db")
+    today = date.today()
+    sqlite_storage.initialize([], [models.Budget(
+        id=1, name="Food", category="Groceries", monthly_limit=100.0, alert_threshold=0.8)], [])
+    sqlite_storage.add_transaction(_tx(20.0, today))
+    sqlite_storage.add_transactions([_tx(5.0, today, category="groceries"), _tx(70.0, _last_month(today))])
+
+    assert sqlite_storage.get_budget_spending("GROCERIES") == (25.0, 100.0, 0.8)
+    assert sqlite_storage.list_budgets()[0].spent_this_month == 25.0
+    assert sqlite_storage.get_category_month_spend("groceries", _last_month(today)) == 70.0
+
+    conn = sqlite_storage._connect()
+    conn.execute("DELETE FROM category_month_spend")
+    sqlite_storage.initialize()
+    assert sqlite_storage.get_category_month_spend("Groceries") == 25.0
+
+
+def test_summary_budgets_match_list_budgets(isolated_storage):
+    storage = isolated_storage
+    storage.get_financial_summary()  # cached before the write
+    storage.add_transaction(_tx(30.0, date.today(), category="entertainment"))
+
+    listed = {b.category: b.spent_this_month for b in storage.list_budgets()}
+    summarized = {b.category: b.spent_this_month for b in storage.get_financial_summary().budgets}
+    assert summarized == listed
+    assert summarized["entertainment"] == storage.get_category_month_spend("entertainment") >= 30.0
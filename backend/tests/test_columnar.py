@@ -0,0 +1,69 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app import models
+from app.agents import tools
+from app.columnar import TransactionColumns
+
+
+def _random_transactions(n, seed=7):
+    rng = random.Random(seed)
+    categories = ["groceries", "Groceries", "rent", "coffee", "salary", ""]
+    out = []
+    for i in range(n):
+        tx_type = models.TransactionType.INCOME if rng.random() < 0.2 else models.TransactionType.EXPENSE
+        out.append(models.Transaction(
+            id=i + 1,
+            amount=round(rng.uniform(-50, 500), 2),
+            category=rng.choice(categories),
+            date=date(2024, 1, 1) + timedelta(days=rng.randrange(900)),
+            type=tx_type,
+        ))
+    return out
+
+
+def test_columns_grow_by_appends_and_extends():
+    txs = _random_transactions(3000)
+    cols = TransactionColumns(capacity=4)
+    for tx in txs[:10]:
+        cols.append(tx)
+    cols.extend(txs[10:])
+    assert len(cols) == 3000
+    assert cols.amount.tolist() == [t.amount for t in txs]
+    assert cols.date_ordinal.tolist() == [t.date.toordinal() for t in txs]
+    assert [cols.category_names[c] for c in cols.category] == [t.category.lower() for t in txs]
+
+
+def test_cashflow_stats_groups_normalized_categories():
+    txs = _random_transactions(500)
+    cols = TransactionColumns()
+    cols.extend(txs)
+    since = date(2026, 1, 1)
+
+    stats = cols.cashflow_stats(since)
+
+    recent = [t for t in txs if t.date >= since]
+    assert stats["first_date"] == min(t.date for t in recent)
+    assert stats["total"] == pytest.approx(sum(t.amount for t in recent))
+    assert stats["by_category"]["groceries"] == pytest.approx(
+        sum(t.amount for t in recent if t.category.lower() == "groceries"))
+    assert "misc" in stats["by_category"]
+    assert TransactionColumns().cashflow_stats(since) is None
+
+
+def test_storage_keeps_columns_in_sync(isolated_storage):
+    storage = isolated_storage
+    storage.add_transaction(models.TransactionBase(
+        amount=100.0, category="salary", date=date(2025, 12, 3), type=models.TransactionType.INCOME))
+    assert len(storage._columns) == len(storage.transactions)
+    assert storage.get_balance() == pytest.approx(100.0 - 1257.5)
+
+    # lists mutated outside storage are picked up on the next read
+    storage.transactions.append(models.Transaction(
+        id=99, amount=10.0, category="coffee", date=date(2025, 12, 4), type=models.TransactionType.EXPENSE))
+    assert storage.get_financial_summary().total_expense == pytest.approx(1267.5)
+
+    pred = tools.predict_cashflow_tool()
+    assert pred["ok"] and pred["by_category"]["coffee"]["total"] == pytest.approx(22.5)
@@ -0,0 +1,120 @@
+import sys
+import threading
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app import models
+from app.agents.tools import add_goal_contribution_tool
+from app.errors import VersionConflictError
+from app.http_cache import if_match_version
+
+THREADS = 8
+
+
+@pytest.fixture
+def busy_switching():
+    """Switch threads as often as possible, so unguarded read-modify-writes interleave."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _run_threads(target, *args):
+    barrier = threading.Barrier(THREADS)
+    errors = []
+
+    def run(i):
+        barrier.wait()
+        try:
+            target(i, *args)
+        except Exception as e:  # pragma: no cover - surfaced by the assert below
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+
+
+def test_concurrent_adds_lose_nothing(isolated_storage, busy_switching):
+    storage = isolated_storage
+    before = len(storage.list_transactions())
+    spent_before = storage.get_category_month_spend("stress", date(2025, 12, 1))
+    per_thread = 50
+    created = []
+
+    def add(i):
+        for _ in range(per_thread):
+            created.append(storage.add_transaction(models.TransactionBase(
+                amount=1.0, category="stress", date=date(2025, 12, 1 + i), type=models.TransactionType.EXPENSE)))
+
+    _run_threads(add)
+
+    ids = [tx.id for tx in created]
+    assert len(ids) == len(set(ids)) == THREADS * per_thread
+    listed = storage.list_transactions()
+    assert len(listed) == before + THREADS * per_thread
+    assert sorted(tx.id for tx in listed) == [tx.id for tx in listed]
+    assert storage.get_category_month_spend("stress", date(2025, 12, 1)) == spent_before + THREADS * per_thread
+    assert storage.check_totals_consistency(repair=False)["ok"]
+
+
+def test_concurrent_goal_contributions_lose_nothing(isolated_storage, busy_switching):
+    storage = isolated_storage
+    goal = storage.add_goal(models.GoalBase(name="Stress", target_amount=10_000.0, target_date=date(2026, 6, 1)))
+    per_thread = 25
+
+    def contribute(i):
+        for _ in range(per_thread):
+            assert add_goal_contribution_tool({"goal_name": "stress", "amount": 2})["ok"]
+
+    _run_threads(contribute)
+
+    final = next(g for g in storage.list_goals() if g.id == goal.id)
+    assert final.saved_amount == 2.0 * THREADS * per_thread
+    assert final.version == goal.version + THREADS * per_thread
+
+
+def test_stale_version_is_rejected(isolated_storage):
+    storage = isolated_storage
+    budget = storage.list_budgets()[0]
+    data = models.BudgetBase(**budget.model_dump(exclude={"id", "version", "spent_this_month"}))
+    version = storage.data_version("budgets")
+
+    updated = storage.update_budget(budget.id, data, expected_version=budget.version)
+    assert updated.version == budget.version + 1
+
+    with pytest.raises(VersionConflictError) as conflict:
+        storage.update_budget(budget.id, data.model_copy(update={"monthly_limit": 1.0}), expected_version=budget.version)
+    assert conflict.value.current == updated.version
+    assert storage.list_budgets()[0].monthly_limit == budget.monthly_limit
+    # Only the successful write bumped the collection version
+    assert storage.data_version("budgets") != version
+    version = storage.data_version("budgets")
+    with pytest.raises(VersionConflictError):
+        storage.update_budget(budget.id, data, expected_version=budget.version)
+    assert storage.data_version("budgets") == version
+    # Unknown ids are still "not found", not a conflict
+    with pytest.raises(ValueError):
+        storage.update_goal(10_000, models.GoalBase(name="x", target_amount=1.0), expected_version=1)
+
+
+def _request(if_match=None):
+    headers = [] if if_match is None else [(b"if-match", if_match.encode())]
+    return Request({"type": "http", "headers": headers})
+
+
+def test_if_match_parsing():
+    assert if_match_version(_request()) is None
+    assert if_match_version(_request("*")) is None
+    assert if_match_version(_request('"3"')) == 3
+    for header in ('W/"3"', '"abc"', '3', '"1", "2"'):
+        with pytest.raises(HTTPException) as failed:
+            if_match_version(_request(header))
+        assert failed.value.status_code == 412
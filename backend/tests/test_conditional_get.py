@@ -0,0 +1,80 @@
+from datetime import date
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import file_storage, models
+from app.http_cache import etag_matches
+from app.routes import notifications, summary
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(summary.router, prefix="/api/v1/summary")
+    app.include_router(notifications.router, prefix="/api/v1/notifications")
+    return TestClient(app)
+
+
+def test_summary_answers_304_until_data_changes(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    client = _client()
+    first = client.get("/api/v1/summary/")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and etag.startswith('"')
+
+    # A matching If-None-Match must not touch the data at all
+    def fail():
+        raise AssertionError("summary recomputed")
+    monkeypatch.setattr(storage, "get_financial_summary", fail)
+    cached = client.get("/api/v1/summary/", headers={"If-None-Match": f'W/"other", {etag}'})
+    assert cached.status_code == 304 and cached.headers["ETag"] == etag and cached.content == b""
+    monkeypatch.undo()
+
+    storage.add_goal(models.GoalBase(name="Bike", target_amount=500.0, target_date=date(2026, 6, 1)))
+    changed = client.get("/api/v1/summary/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert client.get("/api/v1/summary/", headers={"If-None-Match": changed.headers["ETag"]}).status_code == 304
+
+    # Budget spend is per month: a new month is a new version
+    monkeypatch.setattr(file_storage, "month_key", lambda d: "2099-01")
+    assert client.get("/api/v1/summary/", headers={"If-None-Match": changed.headers["ETag"]}).status_code == 200
+
+
+def test_notifications_etag_follows_writes(isolated_storage):
+    storage = isolated_storage
+    client = _client()
+    etag = client.get("/api/v1/notifications/").headers["ETag"]
+
+    n = storage.add_notification("info", "Hello", "first")
+    after_add = client.get("/api/v1/notifications/", headers={"If-None-Match": etag})
+    assert after_add.status_code == 200 and after_add.json()[0]["id"] == n.id
+
+    etag = after_add.headers["ETag"]
+    storage.mark_read(n.id)
+    assert client.get("/api/v1/notifications/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_versions_bump_per_collection(isolated_storage):
+    storage = isolated_storage
+    before = {name: storage.data_version(name) for name in ("transactions", "budgets", "goals", "notifications")}
+
+    storage.add_budget(models.BudgetBase(name="Books", category="books", monthly_limit=50.0, alert_threshold=0.8))
+    storage.add_transactions([models.TransactionBase(
+        amount=5.0, category="books", date=date.today(), type=models.TransactionType.EXPENSE)])
+    try:
+        storage.update_goal(10_000, models.GoalBase(name="x", target_amount=1.0, target_date=date(2026, 1, 1)))
+    except ValueError:
+        pass
+
+    after = {name: storage.data_version(name) for name in before}
+    assert after["budgets"] != before["budgets"] and after["transactions"] != before["transactions"]
+    # A failed write leaves its collection's version alone
+    assert after["goals"] == before["goals"] and after["notifications"] == before["notifications"]
+
+
+def test_if_none_match_parsing():
+    assert etag_matches('"a-1"', '"a-1"')
+    assert etag_matches('W/"a-1"', '"a-1"')
+    assert etag_matches("*", '"a-1"')
+    assert not etag_matches('"a-2", "a-10"', '"a-1"')
+    assert not etag_matches(None, '"a-1"')
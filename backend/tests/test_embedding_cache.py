@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from app.rag import EmbeddingCache
+
+
+class CountingEncoder:
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.encoded = []
+
+    def __call__(self, texts):
+        self.encoded.extend(texts)
+        rng = [np.random.default_rng(abs(hash(t)) % 2**32) for t in texts]
+        return np.stack([r.standard_normal(self.dim) for r in rng]).astype(np.float32)
+
+
+def test_warm_restart_skips_encoding(tmp_path):
+    encode = CountingEncoder()
+    texts = [f"budget {i}" for i in range(100)]  # more than the initial rows: the file grows
+    first = EmbeddingCache(tmp_path, "all-MiniLM-L6-v2").get_many(texts + texts[:3], encode)
+    assert encode.encoded == texts
+    assert first.shape == (103, 8)
+
+    encode.encoded.clear()
+    restarted = EmbeddingCache(tmp_path, "all-MiniLM-L6-v2")
+    assert len(restarted) == 100
+    again = restarted.get_many(texts[::-1], encode)
+    assert encode.encoded == []
+    assert np.array_equal(again, first[:100][::-1])
+    assert (restarted.hits, restarted.misses) == (100, 0)
+
+    # Keyed by model: another model's cache starts empty
+    EmbeddingCache(tmp_path, "other-model").get_many(texts[:2], encode)
+    assert encode.encoded == texts[:2]
+
+
+def test_caches_share_appends_and_float16(tmp_path):
+    encode = CountingEncoder()
+    a = EmbeddingCache(tmp_path, "m", dtype="float16")
+    b = EmbeddingCache(tmp_path, "m", dtype="float16")  # e.g. another worker process
+    from_a = a.get_many(["rent", "coffee"], encode)
+    from_b = b.get_many(["coffee", "groceries"], encode)
+    assert encode.encoded == ["rent", "coffee", "groceries"]
+    assert np.array_equal(from_b[0], from_a[1])
+    assert from_a.dtype == np.float32
+    # float16 storage: close to, not exactly, what was encoded
+    assert from_a == pytest.approx(CountingEncoder()(["rent", "coffee"]), abs=1e-2)
+    assert len(a.get_many(["groceries"], encode)) == 1 and len(a) == 3
+    assert encode.encoded == ["rent", "coffee", "groceries"]
+
+
+def test_partial_keys_line_is_ignored(tmp_path):
+    encode = CountingEncoder()
+    EmbeddingCache(tmp_path, "m").get_many(["rent"], encode)
+    # Another process crashed halfway through appending a key
+    with open(tmp_path / "m.keys", "ab") as f:
+        f.write(b"abc")
+    assert len(EmbeddingCache(tmp_path, "m")) == 1
@@ -0,0 +1,121 @@
+import threading
+from datetime import date
+
+import pytest
+
+from app import models
+from app.frozen_view import CHUNK_SIZE, SlotVector
+
+
+def _tx(amount, day=date(2025, 12, 5)):
+    return models.TransactionBase(amount=amount, category="misc", date=day, type=models.TransactionType.EXPENSE)
+
+
+def test_transaction_views_never_change(isolated_storage):
+    storage = isolated_storage
+    before = storage.list_transactions()
+    assert before._chunks is storage.transactions._state[0]  # handed out without a copy
+    ids = [tx.id for tx in before]
+
+    storage.add_transaction(_tx(1.0))
+    storage.update_transaction(1, _tx(99.0))
+    storage.delete_transaction(2)
+
+    assert [tx.id for tx in before] == ids and before[0].amount == 12.5 and len(before) == 3
+    after = storage.list_transactions()
+    assert [tx.id for tx in after] == [1, 3, 4] and after[0].amount == 99.0
+    assert after[-1].id == 4 and after[1:] == (after[1], after[2])
+    with pytest.raises(IndexError):
+        after[3]
+
+
+def test_other_collections_are_replaced_not_mutated(isolated_storage):
+    storage = isolated_storage
+    goals = storage.list_goals()
+    assert goals is storage.goals and isinstance(goals, tuple)
+    storage.update_goal(1, models.GoalBase(name="Emergency Fund", target_amount=1000.0, saved_amount=900.0,
+                                           target_date=date(2025, 12, 31)))
+    assert goals[0].saved_amount == 200.0 and storage.list_goals()[0].saved_amount == 900.0
+
+    n = storage.add_notification("info", "Hello", "first")
+    seen = storage.list_notifications()
+    storage.mark_read(n.id)
+    assert not seen[0].read and not n.read and storage.list_notifications()[0].read
+
+
+def test_budgets_are_published_by_writes(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    budgets = storage.list_budgets()
+    assert storage.list_budgets() is budgets  # no copy per read
+
+    # An expense elsewhere or in another month leaves the published tuple alone
+    storage.add_transaction(_tx(5.0))
+    storage.add_transaction(models.TransactionBase(amount=5.0, category="groceries", date=date(2020, 1, 1),
+                                                   type=models.TransactionType.EXPENSE))
+    assert storage.list_budgets() is budgets
+
+    spent = storage.get_budget_for_category("groceries").spent_this_month
+    storage.add_transaction(models.TransactionBase(amount=7.0, category="Groceries", date=date.today(),
+                                                   type=models.TransactionType.EXPENSE))
+    published = storage.list_budgets()
+    assert published is not budgets and storage.list_budgets() is published
+    assert storage.get_budget_for_category("groceries").spent_this_month == spent + 7.0
+
+    # A new month starts from zero spend
+    monkeypatch.setattr(storage.file_storage, "month_key", lambda d: "2099-01")
+    assert all(b.spent_this_month == 0.0 for b in storage.list_budgets())
+
+
+def test_readers_see_consistent_snapshots_during_writes(isolated_storage):
+    storage = isolated_storage
+    stop = threading.Event()
+    problems = []
+
+    def reader():
+        while not stop.is_set():
+            view = storage.list_transactions()
+            ids = [tx.id for tx in view]
+            if len(ids) != len(view) or len(set(ids)) != len(ids) or ids != sorted(ids):
+                problems.append(ids)
+
+    threads = [threading.Thread(target=reader) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for i in range(300):
+        created = storage.add_transaction(_tx(float(i)))
+        if i % 3 == 0:
+            storage.update_transaction(created.id, _tx(float(i) + 0.5))
+        if i % 5 == 0:
+            storage.delete_transaction(created.id)
+    stop.set()
+    for t in threads:
+        t.join()
+    assert not problems
+
+
+def test_frozen_prefix_ignores_later_writes():
+    items = SlotVector([1, 2])
+    view = items.snapshot()
+    items.append(3)
+    assert list(view) == [1, 2] and view == [1, 2] and view != [1, 2, 3]
+    assert view[-1] == 2 and view[::-1] == (2, 1)
+
+    items.set_slot(0, 10)
+    items.set_slot(1, None)
+    assert list(view) == [1, 2] and list(items) == [10, 3] and items[-1] == 3
+
+
+def test_slot_writes_copy_one_chunk():
+    items = SlotVector(range(3 * CHUNK_SIZE))
+    view = items.snapshot()
+    chunks = view._chunks
+    assert items.set_slot(CHUNK_SIZE + 5, None) == CHUNK_SIZE + 5
+    new_chunks = items._state[0]
+    # Only the touched chunk was copied; the others are shared with the old view
+    assert [a is b for a, b in zip(chunks, new_chunks)] == [True, False, True]
+    assert len(items) == 3 * CHUNK_SIZE - 1 and items.slot_count == 3 * CHUNK_SIZE
+    assert items[CHUNK_SIZE + 5] == CHUNK_SIZE + 6 and items.get_slot(CHUNK_SIZE + 5) is None
+
+    items.compact()
+    assert items.slot_count == len(items) and list(items) == [i for i in range(3 * CHUNK_SIZE) if i != CHUNK_SIZE + 5]
+    assert len(view) == 3 * CHUNK_SIZE and view[CHUNK_SIZE + 5] == CHUNK_SIZE + 5
@@ -0,0 +1,60 @@
+import json
+from datetime import date
+
+import pytest
+
+from app import file_storage, models
+
+
+def _tx(amount, day, tx_type=models.TransactionType.EXPENSE, category="groceries"):
+    return models.TransactionBase(amount=amount, category=category, date=day, type=tx_type)
+
+
+def _partitioned(storage, monkeypatch):
+    monkeypatch.setattr(file_storage, "PARTITIONED", True)
+    storage._initialize_storage()
+    return storage
+
+
+def test_existing_snapshot_is_split_by_month(isolated_storage, monkeypatch):
+    storage = _partitioned(isolated_storage, monkeypatch)
+
+    manifest = json.loads(file_storage.TRANSACTIONS_MANIFEST_FILE.read_text())["partitions"]
+    assert manifest == {"2025-12": {"count": 3, "income": 0.0, "expense": 1257.5}}
+    assert (file_storage.TRANSACTIONS_PARTITION_DIR / "2025-12.json").exists()
+
+    storage._initialize_storage()
+    assert [tx.id for tx in storage.list_transactions()] == [1, 2, 3]
+
+
+def test_insert_rewrites_only_its_month(isolated_storage, monkeypatch):
+    storage = _partitioned(isolated_storage, monkeypatch)
+    storage.add_transaction(_tx(100.0, date(2025, 11, 5)))
+
+    written = []
+    original = file_storage._write_partition
+    monkeypatch.setattr(file_storage, "_write_partition",
+                        lambda month, txs: written.append(month) or original(month, txs))
+    storage.add_transactions([_tx(20.0, date(2026, 1, 3)), _tx(3000.0, date(2026, 1, 9), models.TransactionType.INCOME)])
+
+    assert written == ["2026-01"]
+    manifest = json.loads(file_storage.TRANSACTIONS_MANIFEST_FILE.read_text())["partitions"]
+    assert list(manifest) == ["2025-11", "2025-12", "2026-01"]
+    assert manifest["2026-01"] == {"count": 2, "income": 3000.0, "expense": 20.0}
+
+    storage._initialize_storage()
+    assert [tx.id for tx in storage.list_transactions()] == [1, 2, 3, 4, 5, 6]
+
+
+def test_export_reads_disk_without_touching_live_state(isolated_storage, monkeypatch):
+    storage = _partitioned(isolated_storage, monkeypatch)
+    storage.add_transaction(_tx(10.0, date(2025, 10, 1)))
+    partitions, manifest = file_storage._partitions, dict(file_storage._manifest)
+    counters = (file_storage._journal_records, file_storage._snapshot_size)
+    # A write running meanwhile would see swapped-in globals, so none are reassigned
+    monkeypatch.setattr(file_storage, "_index_partitions", lambda txs: pytest.fail("live index rebuilt"))
+
+    exported = file_storage.export_all_data()["transactions"]
+    assert [tx["id"] for tx in exported] == [1, 2, 3, 4]
+    assert file_storage._partitions is partitions and file_storage._manifest == manifest
+    assert (file_storage._journal_records, file_storage._snapshot_size) == counters
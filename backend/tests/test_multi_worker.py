@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app import file_storage, sqlite_storage, storage
+
+WORKERS = 4
+WORKER_SCRIPT = """
+import sys, time
+from datetime import date
+from pathlib import Path
+from app import storage
+from app.agents import notifier
+from app.agents.tools import add_goal_contribution_tool
+from app.models import TransactionBase, TransactionType
+
+worker, workers, sync_dir = int(sys.argv[1]), int(sys.argv[2]), Path(sys.argv[3])
+
+def wait_for(names):
+    while not all((sync_dir / name).exists() for name in names):
+        time.sleep(0.01)
+
+wait_for(["go"])
+for i in range(20):
+    storage.add_transaction(TransactionBase(amount=1.0, category="shared", date=date(2025, 12, 3),
+                                            type=TransactionType.EXPENSE))
+    if i % 4 == 0:
+        assert add_goal_contribution_tool({"goal_name": "vacation", "amount": 10})["ok"]
+notifier.register_webhook(f"http://worker-{worker}.invalid/hook")
+(sync_dir / f"done-{worker}").touch()
+
+# Every worker sees every other worker's writes
+wait_for([f"done-{w}" for w in range(workers)])
+print(len(storage.list_transactions()), len(notifier.list_webhooks()),
+      storage.data_version("transactions", "goals"))
+"""
+
+
+def test_workers_share_one_sqlite_database(tmp_path, monkeypatch):
+    db_path = tmp_path / "shared.db"
+    env = dict(os.environ, STORAGE_BACKEND="sqlite", SQLITE_DB_PATH=str(db_path))
+    workers = [
+        subprocess.Popen([sys.executable, "-c", WORKER_SCRIPT, str(w), str(WORKERS), str(tmp_path)],
+                         cwd=Path(__file__).parent.parent, env=env, stdout=subprocess.PIPE,
+                         stderr=subprocess.PIPE, text=True)
+        for w in range(WORKERS)
+    ]
+    (tmp_path / "go").touch()
+    outputs = []
+    for process in workers:
+        stdout, stderr = process.communicate(timeout=120)
+        assert process.returncode == 0, stderr
+        outputs.append(stdout.split())
+
+    # All workers agree on the data and on its version
+    expected_count = len(storage._seed_transactions()) + WORKERS * 20
+    assert {tuple(o) for o in outputs} == {(str(expected_count), str(WORKERS), outputs[0][2])}
+
+    monkeypatch.setattr(sqlite_storage, "DB_PATH", db_path)
+    assert sqlite_storage.data_version("transactions", "goals") == outputs[0][2]
+    txs = sqlite_storage.list_transactions()
+    assert len({tx.id for tx in txs}) == expected_count
+    assert sum(tx.amount for tx in txs if tx.category == "shared") == WORKERS * 20.0
+    # No contribution was lost between workers
+    vacation = next(g for g in sqlite_storage.list_goals() if g.name == "Vacation")
+    seeded = next(g for g in storage._seed_goals() if g.name == "Vacation")
+    assert vacation.saved_amount == seeded.saved_amount + WORKERS * 5 * 10
+    assert vacation.version == 1 + WORKERS * 5
+
+
+def test_second_process_cannot_serve_json_storage(isolated_storage):
+    lock_file = file_storage.STORAGE_LOCK_FILE
+    assert lock_file.exists()
+    script = "import sys; from pathlib import Path; from app import file_lock; file_lock.claim(Path(sys.argv[1]), 'busy')"
+    result = subprocess.run([sys.executable, "-c", script, str(lock_file)],
+                            cwd=Path(__file__).parent.parent, capture_output=True, text=True)
+    assert result.returncode != 0 and "RuntimeError: busy" in result.stderr
@@ -0,0 +1,125 @@
+import os
+import subprocess
+import sys
+import uuid
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app import rag
+
+pytest.importorskip("chromadb")
+
+
+class FakeModel:
+    """Bag-of-words vectors; records the size of every encode call."""
+
+    def __init__(self, name):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False):
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        self.calls.append(len(texts))
+        vectors = np.zeros((len(texts), 16), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in rag._tokenize(text):
+                vectors[row, zlib.crc32(token.encode()) % 16] += 1.0
+        if normalize_embeddings:
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors[0] if single else vectors
+
+
+@pytest.fixture
+def chroma_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(rag, "_load_model", FakeModel)
+    monkeypatch.setattr(rag, "EMBEDDING_CACHE_DIR", tmp_path / "embeddings")
+    monkeypatch.setattr(rag, "CHROMA_DIR", tmp_path / "chroma")
+    store = rag.ChromaDocStore(collection_name=f"test-{uuid.uuid4().hex}")
+    upserts = []
+    upsert = store.collection.upsert
+
+    def counting_upsert(**kwargs):
+        upserts.append(len(kwargs["ids"]))
+        return upsert(**kwargs)
+
+    monkeypatch.setattr(store.collection, "upsert", counting_upsert)
+    store.upserts = upserts
+    return store
+
+
+def test_ingests_in_batches(chroma_store):
+    docs = [{"id": f"d{i}", "text": f"note {i} about rent"} for i in range(10)]
+    docs.append({"id": "coffee", "text": "coffee coffee coffee", "metadata": {"type": "policy"}})
+    chroma_store.add_documents(docs, batch_size=4)
+
+    assert chroma_store.model.calls == [4, 4, 3]
+    assert chroma_store.upserts == [4, 4, 3]
+    assert chroma_store.collection.count() == 11
+    stored = chroma_store.collection.get(ids=["d0"], include=["embeddings"])["embeddings"][0]
+    assert np.linalg.norm(stored) == pytest.approx(1.0, abs=1e-5)
+
+    hit = chroma_store.retrieve("coffee", k=1)[0]
+    assert hit["id"] == "coffee" and hit["metadata"] == {"type": "policy"}
+
+    # Upsert: re-adding ids replaces them
+    chroma_store.add_documents(docs[:2], batch_size=4)
+    assert chroma_store.collection.count() == 11
+
+
+def test_add_financial_docs_writes_one_batch(chroma_store, monkeypatch):
+    monkeypatch.setattr(rag, "_MEMORY_STORE", rag.InMemoryDocStore())
+    monkeypatch.setattr(rag, "_VECTOR_STORE", chroma_store)
+    monkeypatch.setattr(rag, "_DOC_HASHES", {})
+    docs = [{"id": f"p{i}", "text": f"policy {i}"} for i in range(5)]
+
+    stats = rag.add_financial_docs(docs)
+    assert stats["written"] == 5 and stats["docs_per_sec"] > 0
+    assert chroma_store.upserts == [5]
+    assert rag.add_financial_docs(docs)["written"] == 0
+    assert chroma_store.upserts == [5]
+
+
+def test_restart_and_repeated_queries_skip_the_model(chroma_store):
+    docs = [{"id": f"d{i}", "text": f"note {i} about rent"} for i in range(5)]
+    chroma_store.add_documents(docs)
+
+    # A new store over the same embedding cache (e.g. after a restart)
+    restarted = rag.ChromaDocStore(collection_name=f"test-{uuid.uuid4().hex}")
+    restarted.add_documents(docs)
+    assert restarted._model is None
+    assert restarted.collection.count() == 5
+
+    restarted.retrieve("rent", k=1)
+    restarted.retrieve("rent", k=1)
+    assert restarted.model.calls == [1]
+
+
+def test_warm_up_switches_retrieval_to_chroma(chroma_store, monkeypatch):
+    monkeypatch.setattr(rag, "_MEMORY_STORE", rag.InMemoryDocStore())
+    monkeypatch.setattr(rag, "_VECTOR_STORE", None)
+    monkeypatch.setattr(rag, "_DOC_HASHES", {})
+    # Left in the persistent collection by an earlier run
+    previous = rag.ChromaDocStore()
+    previous.add_documents([{"id": "goal_99", "text": "Goal: Gone"}, {"id": "policy_old", "text": "Old policy"}])
+
+    rag.add_financial_docs([{"id": "goal_1", "text": "Goal: Boat"}, {"id": "rule_rent", "text": "Pay rent first"}])
+    assert rag.retrieve_context("rent")[0]["id"] == "rule_rent"  # served from memory
+
+    assert rag.warm_up()
+    assert isinstance(rag._VECTOR_STORE, rag.ChromaDocStore)
+    assert sorted(rag._VECTOR_STORE.ids()) == ["goal_1", "policy_old", "rule_rent"]
+    rag.add_financial_docs([{"id": "goal_2", "text": "Goal: Car"}])
+    assert "goal_2" in rag._VECTOR_STORE.ids()
+
+
+def test_import_loads_no_model(tmp_path):
+    script = "import sys, app.main; print(sorted({'chromadb', 'sentence_transformers', 'torch'} & set(sys.modules)))"
+    # SQLite backend: the JSON one is claimed by this test process
+    env = dict(os.environ, STORAGE_BACKEND="sqlite", SQLITE_DB_PATH=str(tmp_path / "app.db"))
+    result = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).parent.parent,
+                            env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
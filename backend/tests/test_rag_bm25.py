@@ -0,0 +1,118 @@
+import math
+import random
+import sys
+import threading
+from collections import Counter
+
+import pytest
+
+from app.rag import InMemoryDocStore, _tokenize
+
+WORDS = ["coffee", "rent", "groceries", "budget", "spent", "on", "the", "transaction", "alert", "savings"]
+
+
+def _reference_scores(docs, query):
+    """Plain BM25 over every doc, for checking the index against."""
+    tokenized = {doc_id: _tokenize(text) for doc_id, text in docs.items()}
+    n = len(docs)
+    avg_length = sum(len(t) for t in tokenized.values()) / n
+    scores = {}
+    for term in set(_tokenize(query)):
+        df = sum(1 for t in tokenized.values() if term in t)
+        if not df:
+            continue
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        for doc_id, tokens in tokenized.items():
+            tf = Counter(tokens)[term]
+            if tf:
+                norm = InMemoryDocStore.K1 * (1 - InMemoryDocStore.B + InMemoryDocStore.B * len(tokens) / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (InMemoryDocStore.K1 + 1) / (tf + norm)
+    return scores
+
+
+def _check_top(store, docs, query, k):
+    scores = _reference_scores(docs, query)
+    hits = store.retrieve(query, k=k)
+    assert len(hits) == min(k, len(scores))
+    assert len({h["id"] for h in hits}) == len(hits)
+    got = [scores[h["id"]] for h in hits]
+    assert got == pytest.approx(sorted(scores.values(), reverse=True)[:k])
+
+
+def test_ranks_rare_terms_first():
+    store = InMemoryDocStore()
+    store.add_document("tx1", "Spent 4.50 on coffee at the corner cafe")
+    store.add_document("tx2", "Spent 1200 on rent for the month")
+    store.add_document("policy", "Budget alert threshold policy: alert at 80% of the limit", {"type": "policy"})
+
+    hits = store.retrieve("when does the budget alert fire", k=3)
+    assert hits[0]["id"] == "policy"
+    assert hits[0]["metadata"] == {"type": "policy"}
+    assert [h["id"] for h in store.retrieve("coffee", k=3)] == ["tx1"]
+    assert store.retrieve("unrelated words", k=3) == []
+
+
+@pytest.mark.parametrize("candidate_limit", [InMemoryDocStore.CANDIDATE_LIMIT, 40])
+def test_matches_reference_bm25(monkeypatch, candidate_limit):
+    # A small limit forces the common terms onto the probe and full-scan paths
+    monkeypatch.setattr(InMemoryDocStore, "CANDIDATE_LIMIT", candidate_limit)
+    rng = random.Random(7)
+    store, docs = InMemoryDocStore(), {}
+    for i in range(300):
+        words = rng.choices(WORDS[:6], k=rng.randint(3, 12)) + [f"merchant{i % 25}"]
+        docs[f"d{i}"] = " ".join(words)
+        store.add_document(f"d{i}", docs[f"d{i}"])
+
+    for query in ("coffee", "merchant3 on", "spent on the", "merchant7 merchant8 rent", "on"):
+        _check_top(store, docs, query, k=5)
+
+
+def test_replace_and_remove():
+    store = InMemoryDocStore()
+    store.add_document("a", "coffee coffee")
+    store.add_document("b", "rent")
+    store.add_document("a", "groceries")
+
+    assert len(store) == 2
+    assert store.retrieve("coffee") == []
+    assert [h["text"] for h in store.retrieve("groceries")] == ["groceries"]
+
+    assert store.remove_document("b")
+    assert not store.remove_document("b")
+    assert "b" not in store and store.retrieve("rent") == []
+    # The freed slot is reused
+    store.add_document("c", "rent again")
+    assert [h["id"] for h in store.retrieve("rent")] == ["c"]
+
+
+def test_queries_during_writes():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    store, errors, done = InMemoryDocStore(), [], threading.Event()
+    for i in range(200):
+        store.add_document(f"d{i}", f"rent coffee note {i}")
+
+    def write():
+        # "groceries" postings appear and disappear under the readers
+        for i in range(5000):
+            store.add_document(f"w{i}", f"groceries {i}")
+            store.remove_document(f"w{i}")
+        done.set()
+
+    def read():
+        try:
+            while not done.is_set():
+                hits = store.retrieve("rent coffee groceries", k=5)
+                assert len(hits) == 5 and all(h is not None for h in hits)
+        except Exception as e:  # pragma: no cover - surfaced by the assert below
+            errors.append(e)
+
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(3)]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
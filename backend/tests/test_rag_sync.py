@@ -0,0 +1,72 @@
+import pytest
+
+from app import models, rag
+
+
+class RecordingStore(rag.InMemoryDocStore):
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+        self.removals = []
+
+    def add_document(self, doc_id, text, metadata=None):
+        self.writes.append(doc_id)
+        super().add_document(doc_id, text, metadata)
+
+    def remove_document(self, doc_id):
+        self.removals.append(doc_id)
+        return super().remove_document(doc_id)
+
+
+@pytest.fixture
+def doc_store(monkeypatch, isolated_storage):
+    store = RecordingStore()
+    monkeypatch.setattr(rag, "_MEMORY_STORE", store)
+    monkeypatch.setattr(rag, "_VECTOR_STORE", None)
+    monkeypatch.setattr(rag, "_DOC_HASHES", {})
+    return store
+
+
+def test_resync_writes_only_changed_docs(doc_store, isolated_storage):
+    storage = isolated_storage
+    rag.initialize_with_financial_data()
+    initial = len(doc_store)
+    assert len(doc_store.writes) == initial
+
+    doc_store.writes.clear()
+    rag.sync_financial_data()
+    assert doc_store.writes == []
+    assert len(doc_store) == initial
+
+    budget = storage.list_budgets()[0]
+    data = models.BudgetBase(**budget.model_dump(exclude={"id", "version", "spent_this_month"}))
+    storage.update_budget(budget.id, data.model_copy(update={"monthly_limit": 1234.0}))
+    rag.sync_financial_data()
+    assert doc_store.writes == [f"budget_{budget.id}"]
+    assert len(doc_store) == initial
+    assert "$1234.0" in rag.retrieve_context(budget.name, k=1)[0]["text"]
+
+
+def test_touched_entity_only(doc_store, isolated_storage):
+    storage = isolated_storage
+    rag.initialize_with_financial_data()
+    doc_store.writes.clear()
+
+    goal = storage.add_goal(models.GoalBase(name="Boat", target_amount=500.0))
+    rag.sync_financial_data(goal=goal)
+    assert doc_store.writes == [f"goal_{goal.id}"]
+    # Unchanged entity: nothing to write
+    rag.sync_financial_data(goal=goal)
+    assert doc_store.writes == [f"goal_{goal.id}"]
+
+
+def test_stale_generated_docs_are_removed(doc_store, isolated_storage):
+    rag.initialize_with_financial_data()
+    rag.add_financial_docs([
+        {"id": "goal_999", "text": "Goal: Gone."},
+        {"id": "policy_savings", "text": "Always save 20% of monthly income"},
+    ])
+
+    rag.sync_financial_data()
+    assert doc_store.removals == ["goal_999"]
+    assert "goal_999" not in doc_store and "policy_savings" in doc_store
@@ -0,0 +1,72 @@
+from datetime import date
+
+from app import models
+from app.read_cache import ReadCache
+
+
+def _tx(amount, day, tx_type=models.TransactionType.EXPENSE):
+    return models.TransactionBase(amount=amount, category="misc", date=day, type=tx_type)
+
+
+def test_summary_cached_until_a_relevant_write(isolated_storage):
+    storage = isolated_storage
+    base = storage.read_cache_stats()
+    first = storage.get_financial_summary()
+    assert storage.get_financial_summary() is first
+
+    storage.add_notification("info", "n", "notifications don't feed the summary")
+    assert storage.get_financial_summary() is first
+
+    storage.add_transaction(_tx(10.0, date(2025, 12, 5)))
+    second = storage.get_financial_summary()
+    assert second.total_expense == first.total_expense + 10.0
+
+    storage.add_goal(models.GoalBase(name="Bike", target_amount=500.0, target_date=date(2026, 6, 1)))
+    assert len(storage.get_financial_summary().goals) == len(second.goals) + 1
+
+    stats = storage.read_cache_stats()
+    assert stats["summary_hits"] - base["summary_hits"] == 2
+    assert stats["summary_misses"] - base["summary_misses"] == 3
+
+
+def test_chart_ranges_invalidated_only_by_dates_inside_them(isolated_storage):
+    storage = isolated_storage
+    year_2025 = (date(2025, 1, 1), date(2025, 12, 31))
+    year_2024 = (date(2024, 1, 1), date(2024, 12, 31))
+    chart_2025 = storage.get_monthly_income_expense(*year_2025)
+    chart_2024 = storage.get_monthly_income_expense(*year_2024)
+
+    storage.add_transactions([_tx(99.0, date(2025, 3, 10)), _tx(1.0, date(2026, 1, 2))])
+    assert storage.get_monthly_income_expense(*year_2024) is chart_2024
+    updated = storage.get_monthly_income_expense(*year_2025)
+    assert updated is not chart_2025 and updated[2]["expense"] == chart_2025[2]["expense"] + 99.0
+    assert updated == storage._build_monthly_income_expense(*year_2025)
+
+
+def test_chart_ranges_bounded_lru():
+    cache = ReadCache(max_ranges=2)
+    days = [date(2025, m, 1) for m in (1, 2, 3)]
+    for d in days:
+        cache.chart(d, d, lambda: [d])
+    cache.chart(days[1], days[1], lambda: None)  # hit, becomes most recent
+    cache.chart(days[0], days[0], lambda: ["recomputed"])
+    assert cache.stats() == {"summary_hits": 0, "summary_misses": 0, "chart_hits": 1, "chart_misses": 4, "chart_ranges": 2}
+    assert cache.chart(days[1], days[1], lambda: None) == [days[1]]
+
+
+def test_value_computed_across_an_invalidation_is_not_stored():
+    cache = ReadCache()
+
+    def compute_while_written():
+        cache.collections_changed(["budgets"])
+        return "stale"
+
+    assert cache.summary(compute_while_written) == "stale"
+    assert cache.summary(lambda: "fresh") == "fresh"
+
+
+def test_summary_recomputed_under_a_new_key():
+    cache = ReadCache()
+    assert cache.summary(lambda: "december", key="2025-12") == "december"
+    assert cache.summary(lambda: "recomputed", key="2025-12") == "december"
+    assert cache.summary(lambda: "january", key="2026-01") == "january"
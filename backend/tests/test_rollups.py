@@ -0,0 +1,98 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import models, sqlite_storage
+from app.rollups import TimeRollups, period_count
+from app.routes import summary
+
+
+def _random_transactions(n, seed=3):
+    rng = random.Random(seed)
+    return [
+        models.TransactionBase(
+            amount=round(rng.uniform(-20, 400), 2),
+            category="misc",
+            date=date(2024, 11, 1) + timedelta(days=rng.randrange(500)),
+            type=models.TransactionType.INCOME if rng.random() < 0.3 else models.TransactionType.EXPENSE,
+        )
+        for _ in range(n)
+    ]
+
+
+def _scan(txs, start, end):
+    in_range = [t for t in txs if start <= t.date <= end]
+    return (sum(t.amount for t in in_range if t.type == models.TransactionType.INCOME),
+            sum(abs(t.amount) for t in in_range if t.type == models.TransactionType.EXPENSE))
+
+
+@pytest.mark.parametrize("granularity", ["day", "week", "month", "year"])
+def test_series_matches_a_full_scan(isolated_storage, granularity):
+    storage = isolated_storage
+    storage.add_transactions(_random_transactions(800))
+    txs = storage.list_transactions()
+    start, end = date(2024, 12, 17), date(2026, 2, 3)
+
+    rows = storage.get_income_expense_series(start, end, granularity)
+    assert len(rows) == period_count(start, end, granularity)
+    assert rows[0]["start"] == start and rows[-1]["end"] == end
+    assert all(a["end"] + timedelta(days=1) == b["start"] for a, b in zip(rows, rows[1:]))
+    for row in rows:
+        income, expense = _scan(txs, row["start"], row["end"])
+        assert row["income"] == pytest.approx(income) and row["expense"] == pytest.approx(expense)
+
+
+def test_months_of_different_years_stay_apart(isolated_storage):
+    storage = isolated_storage
+    storage.add_transactions([
+        models.TransactionBase(amount=10.0, category="misc", date=date(2025, 1, 5), type=models.TransactionType.EXPENSE),
+        models.TransactionBase(amount=30.0, category="misc", date=date(2026, 1, 5), type=models.TransactionType.EXPENSE),
+    ])
+    rows = storage.get_income_expense_series(date(2025, 1, 1), date(2026, 1, 31), "month")
+    assert [(r["period"], r["expense"]) for r in (rows[0], rows[-1])] == [("2025-01", 10.0), ("2026-01", 30.0)]
+    # The legacy month-name chart still combines them
+    legacy = storage.get_monthly_income_expense(date(2025, 1, 1), date(2026, 1, 31))
+    assert legacy[0] == {"month": "Jan", "income": 0.0, "expense": 40.0}
+
+
+def test_removing_amounts_and_week_labels():
+    rollups = TimeRollups()
+    rollups.add(date(2025, 12, 31), 0.0, 5.0)
+    rollups.add(date(2025, 12, 31), 0.0, -5.0)
+    rollups.add(date(2026, 1, 1), 7.0, 0.0)
+    (week,) = rollups.series(date(2025, 12, 29), date(2026, 1, 4), "week")
+    assert (week["period"], week["income"], week["expense"]) == ("2026-W01", 7.0, 0.0)
+
+
+def test_chart_route_and_sqlite_parity(isolated_storage, tmp_path, monkeypatch):
+    storage = isolated_storage
+    txs = _random_transactions(200, seed=11)
+    storage.add_transactions(txs)
+    app = FastAPI()
+    app.include_router(summary.router, prefix="/api/v1/summary")
+    client = TestClient(app)
+
+    response = client.get("/api/v1/summary/financial-chart",
+                          params={"start": "2025-01-01", "end": "2025-12-31", "granularity": "month"})
+    assert response.status_code == 200 and [r["period"] for r in response.json()][::11] == ["2025-01", "2025-12"]
+    assert len(client.get("/api/v1/summary/financial-chart", params={"start": "2025-01-01", "end": "2025-12-31"}).json()) == 12
+    too_long = client.get("/api/v1/summary/financial-chart",
+                          params={"start": "2000-01-01", "end": "2030-01-01", "granularity": "day"})
+    assert too_long.status_code == 400
+
+    monkeypatch.setattr(sqlite_storage, "DB_PATH", tmp_path / "finance.db")
+    sqlite_storage.initialize([], [], [])
+    sqlite_storage.add_transactions(txs)
+    start, end = date(2024, 12, 10), date(2025, 9, 20)
+    expected = TimeRollups()
+    for tx in txs:
+        income = tx.type == models.TransactionType.INCOME
+        expected.add(tx.date, tx.amount if income else 0.0, 0.0 if income else abs(tx.amount))
+    for granularity in ("week", "year"):
+        got = sqlite_storage.get_income_expense_series(start, end, granularity)
+        want = expected.series(start, end, granularity)
+        assert [r["period"] for r in got] == [r["period"] for r in want]
+        assert [r["expense"] for r in got] == pytest.approx([r["expense"] for r in want])
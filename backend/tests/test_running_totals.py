@@ -0,0 +1,33 @@
+from datetime import date
+
+from app import models
+
+
+def test_running_totals_follow_writes(isolated_storage):
+    storage = isolated_storage
+    storage.add_transaction(models.TransactionBase(
+        amount=2500.0, category="salary", date=date(2025, 12, 1), type=models.TransactionType.INCOME))
+    storage.add_transactions([
+        models.TransactionBase(amount=-20.0, category="refund", date=date(2025, 12, 2), type=models.TransactionType.EXPENSE),
+        models.TransactionBase(amount=80.0, category="coffee", date=date(2025, 12, 3), type=models.TransactionType.EXPENSE),
+    ])
+
+    assert storage._totals == {"income": 2500.0, "expense": 1357.5, "count": 6}
+    assert storage.get_balance() == 1142.5
+    summary = storage.get_financial_summary()
+    assert (summary.total_income, summary.total_expense, summary.transactions_count) == (2500.0, 1357.5, 6)
+    assert storage.check_totals_consistency()["ok"]
+
+
+def test_totals_rebuilt_at_load_and_repaired_on_drift(isolated_storage):
+    storage = isolated_storage
+    storage._totals["expense"] += 1.0
+
+    report = storage.check_totals_consistency()
+    assert not report["ok"]
+    assert report["recomputed"]["expense"] == 1257.5
+    assert storage._totals["expense"] == 1257.5
+
+    storage._totals["income"] = 999.0
+    storage._initialize_storage()
+    assert storage._totals == {"income": 0.0, "expense": 1257.5, "count": 3}
@@ -0,0 +1,131 @@
+import os
+import subprocess
+import sys
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from app import models, sqlite_storage, storage
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_storage, "DB_PATH", tmp_path / "budget_assist.db")
+    monkeypatch.setattr(sqlite_storage, "SHARED_READ_MODEL", True)
+    sqlite_storage.initialize(storage._seed_transactions(), storage._seed_budgets(), storage._seed_goals())
+    yield sqlite_storage
+    if sqlite_storage._read_model is not None:
+        sqlite_storage._read_model.unlink()
+        sqlite_storage._read_model = None
+
+
+def _tx(amount, day, category="misc", kind=models.TransactionType.EXPENSE):
+    return models.TransactionBase(amount=amount, category=category, date=day, type=kind)
+
+
+def _reads(db):
+    return (
+        db.get_financial_summary().model_dump(),
+        db.get_balance(),
+        db.get_balance_as_of(date(2025, 12, 31)),
+        db.get_net_flow(date(2025, 12, 2), date(2026, 2, 15)),
+        db.get_monthly_income_expense(date(2025, 1, 1), date(2026, 12, 31)),
+        db.get_income_expense_series(date(2025, 11, 20), date(2026, 3, 3), "week"),
+        db.get_cashflow_stats(date(2026, 1, 1)),
+    )
+
+
+def _generation(db):
+    return int(db._read_model._generation()[0])
+
+
+def test_read_model_answers_like_sql(db, monkeypatch):
+    db.add_transactions([
+        _tx(2000.0, date(2026, 1, 1), "salary", models.TransactionType.INCOME),
+        _tx(30.0, date(2026, 1, 20), "Coffee"),
+        _tx(80.0, date(2026, 2, 14), "dining"),
+        _tx(12.0, date(2026, 1, 20), "coffee"),
+    ])
+    db.update_transaction(2, _tx(60.0, date(2026, 3, 1), "groceries"))
+    db.delete_transaction(3)
+
+    published = _reads(db)
+    monkeypatch.setattr(db, "SHARED_READ_MODEL", False)
+    assert published == _reads(db)
+
+
+def test_writes_publish_and_reads_only_map(db, monkeypatch):
+    generation = _generation(db)
+    balance = db.get_balance()
+
+    # Each write publishes its own generation, patched from the one before
+    monkeypatch.setattr(db, "_read_model_data", lambda: pytest.fail("patched writes reload nothing"))
+    db.add_transaction(_tx(5.0, date(2026, 1, 2)))
+    assert _generation(db) == generation + 1
+    db.delete_transaction(1)
+    assert _generation(db) == generation + 2
+
+    # ...so reads never publish
+    monkeypatch.setattr(db._read_model, "publish", lambda *args: pytest.fail("a read published"))
+    expected = db.get_balance()
+    _reads(db)
+    assert _generation(db) == generation + 2
+    monkeypatch.setattr(db, "SHARED_READ_MODEL", False)
+    assert db.get_balance() == expected != balance
+
+
+def test_next_write_catches_up_on_writes_made_with_the_model_off(db, monkeypatch):
+    generation = _generation(db)
+    monkeypatch.setattr(db, "SHARED_READ_MODEL", False)
+    db.add_transaction(_tx(7.0, date(2026, 1, 3)))
+    expected = _reads(db)
+
+    monkeypatch.setattr(db, "SHARED_READ_MODEL", True)
+    # Readers serve the last published generation rather than rebuilding it
+    assert db.get_balance() == expected[1] + 7.0
+    assert _generation(db) == generation
+
+    db.add_transaction(_tx(3.0, date(2026, 1, 4)))
+    assert _generation(db) == generation + 1
+    assert db.get_balance() == expected[1] - 3.0
+
+
+def test_workers_map_the_published_segment(db):
+    balance = db.get_balance()
+    generation = _generation(db)
+
+    script = (
+        "from datetime import date\n"
+        "from app import sqlite_storage as db\n"
+        "from app.models import TransactionBase\n"
+        "print(db.get_balance(), int(db._read_model._generation()[0]))\n"
+        "db.add_transaction(TransactionBase(amount=100.0, category='x', date=date(2026, 1, 5), type='INCOME'))\n"
+        "print(db.get_balance(), int(db._read_model._generation()[0]))\n"
+    )
+    env = dict(os.environ, SHARED_READ_MODEL="1", SQLITE_DB_PATH=str(db.DB_PATH))
+    result = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).parent.parent,
+                            env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    mapped, republished = [line.split() for line in result.stdout.split("\n")[:2]]
+    # The worker mapped this process's segment instead of publishing its own
+    assert (float(mapped[0]), int(mapped[1])) == (balance, generation)
+    assert (float(republished[0]), int(republished[1])) == (balance + 100.0, generation + 1)
+    # ...and this process picks up the segment the worker published
+    assert db.get_balance() == balance + 100.0
+    assert _generation(db) == generation + 1
+
+
+def test_reads_do_not_allocate_per_transaction(db):
+    db.add_transactions([_tx(float(i % 50), date(2020, 1, 1 + i % 28), f"c{i % 20}") for i in range(50_000)])
+    db.get_financial_summary()  # map
+
+    tracemalloc.start()
+    db.get_financial_summary()
+    db.get_income_expense_series(date(2020, 1, 1), date(2020, 12, 31), "month")
+    db.get_cashflow_stats(date(2020, 1, 15))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # 50k transactions are ~1 MB of columns alone; a read touches none of it on the heap
+    assert peak < 100_000
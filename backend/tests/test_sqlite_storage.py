@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from app import models, sqlite_storage, storage
+from app.errors import VersionConflictError
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_storage, "DB_PATH", tmp_path / "budget_assist.db")
+    sqlite_storage.initialize(storage._seed_transactions(), storage._seed_budgets(), storage._seed_goals())
+    return sqlite_storage
+
+
+def test_schema_uses_wal_and_indexes(db):
+    conn = db._connect()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_transactions_date", "idx_transactions_category_date", "idx_transactions_type_date"} <= indexes
+
+
+def test_seed_and_add_transaction_updates_budget(db):
+    assert len(db.list_transactions()) == 3
+    spent_before, limit, _ = db.get_budget_spending("groceries")
+
+    tx = db.add_transaction(models.TransactionBase(
+        amount=20.0, category="Groceries", date=date.today(), type=models.TransactionType.EXPENSE))
+
+    assert tx.id == 4
+    assert db.get_budget_spending("groceries") == (spent_before + 20.0, limit, 0.9)
+    assert db.list_transactions()[-1] == tx
+
+
+def test_aggregations_match_json_backend_semantics(db):
+    db.add_transaction(models.TransactionBase(
+        amount=2000.0, category="salary", date=date(2026, 1, 1), type=models.TransactionType.INCOME))
+
+    summary = db.get_financial_summary()
+    assert summary.total_income == 2000.0
+    assert summary.total_expense == 1257.5
+    assert summary.total_balance == db.get_balance() == 742.5
+    assert summary.transactions_count == 4
+    assert len(summary.budgets) == 5 and len(summary.goals) == 3
+
+    chart = {m["month"]: m for m in db.get_monthly_income_expense(date(2025, 12, 1), date(2026, 1, 31))}
+    assert chart["Dec"] == {"month": "Dec", "income": 0.0, "expense": 1257.5}
+    assert chart["Jan"]["income"] == 2000.0
+    assert len(chart) == 12
+
+
+def test_updates_and_notifications(db):
+    goal = db.update_goal(2, models.GoalBase(name="Vacation", target_amount=1500.0, saved_amount=400.0))
+    assert goal.saved_amount == 400.0
+    with pytest.raises(ValueError):
+        db.update_budget(99, models.BudgetBase(name="x", category="x", monthly_limit=1.0, alert_threshold=0.5))
+
+    first = db.add_notification("test", "First", "one")
+    second = db.add_notification("test", "Second", "two")
+    assert [n.id for n in db.list_notifications()] == [second.id, first.id]
+    assert db.mark_read(first.id).read is True
+    assert db.mark_read(12345) is None
+
+    due = db.get_goals_due_between(date(2026, 1, 1), date(2026, 3, 31))
+    assert [g["id"] for g in due] == [3]
+
+
+def test_cashflow_stats(db):
+    stats = db.get_cashflow_stats(date(2030, 1, 1))
+    assert stats["total"] == 1257.5
+    assert stats["first_date"] == date(2025, 12, 1) and stats["last_date"] == date(2025, 12, 2)
+    assert stats["by_category"] == {"coffee": 12.5, "groceries": 45.0, "rent": 1200.0}
+
+
+def test_backend_selected_at_import(tmp_path):
+    script = (
+        "from app import storage, sqlite_storage\n"
+        "from app.models import GoalBase\n"
+        "assert storage.add_transaction.__wrapped__ is sqlite_storage.add_transaction\n"
+        "assert storage.get_budget_for_category is sqlite_storage.get_budget_for_category\n"
+        "version = storage.data_version('goals')\n"
+        "storage.add_goal(GoalBase(name='x', target_amount=1.0, target_date='2026-01-01'))\n"
+        "assert storage.data_version('goals') != version\n"
+        "print(len(storage.list_transactions()))\n"
+    )
+    env = dict(os.environ, STORAGE_BACKEND="sqlite", SQLITE_DB_PATH=str(tmp_path / "import.db"))
+    result = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).parent.parent,
+                            env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "3"
+
+
+def test_versioned_updates_and_migration(db):
+    goal = db.update_goal(2, models.GoalBase(name="Vacation", target_amount=1500.0, saved_amount=400.0),
+                          expected_version=1)
+    assert goal.version == 2
+    with pytest.raises(VersionConflictError):
+        db.update_goal(2, models.GoalBase(name="Vacation", target_amount=1.0), expected_version=1)
+    assert db.list_goals()[1].target_amount == 1500.0
+
+    budget = db.list_budgets()[0]
+    data = models.BudgetBase(**budget.model_dump(exclude={"id", "version", "spent_this_month"}))
+    assert db.update_budget(budget.id, data).version == budget.version + 1
+
+    # A database from before entity versions gets the column on startup
+    conn = db._connect()
+    conn.execute("ALTER TABLE goals DROP COLUMN version")
+    db.initialize()
+    assert [g.version for g in db.list_goals()] == [1, 1, 1]
@@ -0,0 +1,77 @@
+from datetime import date
+
+from app import models, sqlite_storage
+
+
+def _expense(amount, category):
+    return models.TransactionBase(amount=amount, category=category, date=date.today(), type=models.TransactionType.EXPENSE)
+
+
+def test_category_lookups_are_case_insensitive(isolated_storage):
+    storage = isolated_storage
+    storage.add_transaction(_expense(12.5, "Groceries"))
+    storage.add_transactions([_expense(7.5, "GROCERIES"), _expense(40.0, "travel")])
+
+    groceries = storage.get_budget_for_category("gRoCeRiEs")
+    assert groceries is not None and groceries.category.lower() == "groceries"
+    assert storage.get_category_month_spend("no such category") == 0.0
+    assert storage.get_budget_spending("GROCERIES")[0] == groceries.spent_this_month
+
+
+def test_updating_budget_category_reindexes(isolated_storage):
+    storage = isolated_storage
+    budget = storage.add_budget(models.BudgetBase(name="Books", category="Books", monthly_limit=50.0, alert_threshold=0.8))
+    assert storage.get_budget_for_category("books").id == budget.id
+
+    storage.update_budget(budget.id, models.BudgetBase(name="Games", category="Games", monthly_limit=50.0, alert_threshold=0.8))
+    assert storage.get_budget_for_category("books") is None
+    assert storage.get_budget_for_category("games").id == budget.id
+
+    storage.add_transaction(_expense(20.0, "games"))
+    assert storage.get_budget_for_category("games").spent_this_month == 20.0
+
+
+def test_id_lookups_survive_external_list_changes(isolated_storage):
+    storage = isolated_storage
+    goal = storage.add_goal(models.GoalBase(name="Bike", target_amount=500.0, target_date=date(2026, 6, 1)))
+    first = storage.add_notification("info", "one", "first")
+    second = storage.add_notification("info", "two", "second")
+    assert storage.mark_read(first.id).read
+    assert not storage.list_notifications()[0].read
+
+    # Collections replaced or changed directly (as older callers do) must not break the indexes
+    storage.goals = storage.goals[-1:] + storage.goals[:-1]
+    storage.notifications = storage.notifications[::-1]
+    storage.transactions.pop(0)
+
+    updated = storage.update_goal(goal.id, models.GoalBase(
+        name="Bike", target_amount=500.0, saved_amount=100.0, target_date=date(2026, 6, 1)))
+    assert storage.goals[0].id == goal.id and updated.saved_amount == 100.0
+    assert storage.mark_read(second.id).id == second.id
+    assert storage.mark_read(10_000) is None
+
+
+def test_sqlite_category_lookups_match(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_storage, "DB_PATH", tmp_path / "finance.db")
+    sqlite_storage.initialize([], [models.Budget(id=1, name="Food", category="Food", monthly_limit=100.0, alert_threshold=0.8)], [])
+    sqlite_storage.add_transactions([_expense(12.5, "food"), _expense(7.5, "FOOD"), _expense(3.0, "misc")])
+
+    assert sqlite_storage.get_budget_for_category("FOOD").spent_this_month == 20.0
+    assert sqlite_storage.get_budget_for_category("misc") is None
+    assert sqlite_storage.get_budget_spending("fOOD") == (20.0, 100.0, 0.8)
+
+
+def test_category_filter_reads_only_that_categorys_rows(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    storage.add_transactions([_expense(1.0, "misc")] * 200 + [_expense(5.0, "Books"), _expense(6.0, "BOOKS")])
+    reads = []
+
+    class CountingIndex(dict):
+        def __getitem__(self, tx_id):
+            reads.append(tx_id)
+            return super().__getitem__(tx_id)
+
+    monkeypatch.setattr(storage, "_tx_positions", CountingIndex(storage._tx_positions))
+    page, after = storage.list_transactions_page(limit=10, category="books")
+    assert [tx.amount for tx in page] == [5.0, 6.0] and after is None
+    assert len(reads) == 2
@@ -0,0 +1,74 @@
+from datetime import date
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.agents import eventing
+from app.routes import transactions
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(transactions.router, prefix="/api/v1/transactions")
+    return TestClient(app)
+
+
+def _capture_events(monkeypatch):
+    events = []
+    monkeypatch.setattr(eventing, "emit", lambda name, payload: events.append((name, payload)) or [])
+    return events
+
+
+def test_csv_import_persists_per_chunk_and_emits_one_event(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    events = _capture_events(monkeypatch)
+    writes = []
+    original = storage.add_transactions
+    monkeypatch.setattr(storage, "add_transactions", lambda chunk: writes.append(len(chunk)) or original(chunk))
+    monkeypatch.setattr(transactions, "IMPORT_CHUNK_SIZE", 4)
+    groceries_before = storage.get_budget_spending("groceries")[0]
+
+    rows = ["amount,category,date,description,type"]
+    month = date.today().strftime("%Y-%m")
+    rows += [f"{i + 1}.0,groceries,{month}-{i + 1:02d},,expense" for i in range(9)]
+    rows += ["3000,salary,2025-12-28,December pay,INCOME", "oops,groceries,2025-12-01,,EXPENSE"]
+    res = _client().post("/api/v1/transactions/import?format=csv", content="\n".join(rows))
+
+    body = res.json()
+    assert res.status_code == 200
+    assert body["imported"] == 10 and body["rejected"] == 1
+    assert body["errors"][0]["line"] == 12
+    assert writes == [4, 4, 2]
+    assert storage.get_budget_spending("groceries")[0] == groceries_before + sum(range(1, 10))
+
+    assert [name for name, _ in events] == ["transactions.imported"]
+    payload = events[0][1]
+    assert payload["count"] == 10
+    assert payload["categories"] == ["groceries", "salary"]
+    assert payload["large_count"] == 1
+
+
+def test_ndjson_import_uses_content_type(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    _capture_events(monkeypatch)
+    before = len(storage.list_transactions())
+    body = "\n".join([
+        '{"amount": 12.5, "category": "coffee", "date": "2025-12-01", "type": "EXPENSE"}',
+        "not json",
+        '{"amount": 40, "category": "books", "date": "2025-12-02", "type": "EXPENSE", "description": "novel"}',
+    ])
+
+    res = _client().post("/api/v1/transactions/import", content=body,
+                         headers={"content-type": "application/x-ndjson"})
+
+    assert res.json()["imported"] == 2
+    assert res.json()["rejected"] == 1
+    assert len(storage.list_transactions()) == before + 2
+    assert storage.list_transactions()[-1].description == "novel"
+
+
+def test_import_rejects_unknown_format_and_bad_header(isolated_storage):
+    client = _client()
+    assert client.post("/api/v1/transactions/import", content="x").status_code == 415
+    res = client.post("/api/v1/transactions/import?format=csv", content="amount,date\n1,2025-01-01")
+    assert res.status_code == 400
@@ -0,0 +1,89 @@
+from datetime import date
+
+from app import file_storage, models
+
+
+def _expense(amount, category="groceries", d=date(2025, 12, 5)):
+    return models.TransactionBase(amount=amount, category=category, date=d, type=models.TransactionType.EXPENSE)
+
+
+def test_add_transaction_appends_one_journal_record(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    monkeypatch.setattr(file_storage, "JOURNAL_ENABLED", True)
+    snapshot_before = file_storage.TRANSACTIONS_FILE.read_text()
+
+    storage.add_transaction(_expense(10.0))
+    storage.add_transaction(_expense(20.0))
+
+    # snapshot untouched, one line per insert in the journal
+    assert file_storage.TRANSACTIONS_FILE.read_text() == snapshot_before
+    lines = file_storage.TRANSACTIONS_JOURNAL_FILE.read_text().splitlines()
+    assert len(lines) == 2
+
+
+def test_journal_is_replayed_on_startup(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    monkeypatch.setattr(file_storage, "JOURNAL_ENABLED", True)
+    created = storage.add_transaction(_expense(33.0, category="coffee"))
+    expected_ids = [tx.id for tx in storage.transactions]
+
+    storage._initialize_storage()
+
+    assert [tx.id for tx in storage.transactions] == expected_ids
+    assert storage.transactions[-1] == created
+    assert storage._tx_auto_id == created.id + 1
+
+
+def test_checkpoint_folds_journal_into_snapshot(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    monkeypatch.setattr(file_storage, "JOURNAL_ENABLED", True)
+    monkeypatch.setattr(file_storage, "JOURNAL_CHECKPOINT_MIN", 2)
+    # the seed snapshot holds 3 transactions, so the 3rd append checkpoints
+    for amount in (1.0, 2.0, 3.0):
+        storage.add_transaction(_expense(amount))
+
+    assert not file_storage.TRANSACTIONS_JOURNAL_FILE.exists()
+    assert len(file_storage.load_transactions()) == len(storage.transactions) == 6
+
+
+def test_replay_skips_torn_record_and_duplicates(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    monkeypatch.setattr(file_storage, "JOURNAL_ENABLED", True)
+    storage.add_transaction(_expense(5.0))
+    journal = file_storage.TRANSACTIONS_JOURNAL_FILE
+    # simulate a crash after checkpoint (record already in snapshot) and a torn write
+    file_storage.save_transactions(storage.transactions)
+    journal.write_text(
+        '{"op":"add","transaction":{"id":4,"amount":5.0,"category":"groceries",'
+        '"date":"2025-12-05","description":null,"type":"EXPENSE"}}\n{"op":"add","tra'
+    )
+
+    loaded = file_storage.load_transactions()
+    replayed = file_storage.replay_transaction_journal(loaded)
+
+    assert replayed == 1
+    assert [tx.id for tx in loaded] == [1, 2, 3, 4]
+
+
+def test_appends_and_checkpoints_are_fsynced(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    monkeypatch.setattr(file_storage, "JOURNAL_ENABLED", True)
+    monkeypatch.setattr(file_storage, "JOURNAL_CHECKPOINT_MIN", 2)
+    events = []
+    fsync = file_storage.os.fsync
+    monkeypatch.setattr(file_storage.os, "fsync", lambda fd: (events.append("fsync"), fsync(fd))[1])
+    monkeypatch.setattr(file_storage, "_fsync_dir", lambda directory: events.append(("dir", directory)))
+    unlink = type(file_storage.TRANSACTIONS_JOURNAL_FILE).unlink
+    monkeypatch.setattr(type(file_storage.TRANSACTIONS_JOURNAL_FILE), "unlink",
+                        lambda path, missing_ok=False: (events.append(("unlink", path.name)), unlink(path, missing_ok))[1])
+
+    storage.add_transaction(_expense(1.0))
+    # The new journal file is synced, then its directory entry
+    assert events == ["fsync", ("dir", file_storage.TRANSACTIONS_JOURNAL_FILE.parent)]
+
+    events.clear()
+    storage.add_transaction(_expense(2.0))
+    storage.add_transaction(_expense(3.0))  # checkpoints
+    # Snapshot file and its rename reach the disk before the journal is dropped
+    assert events[-3:] == ["fsync", ("dir", file_storage.TRANSACTIONS_FILE.parent),
+                           ("unlink", file_storage.TRANSACTIONS_JOURNAL_FILE.name)]
@@ -0,0 +1,99 @@
+from datetime import date
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import models, sqlite_storage
+from app.routes import transactions
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(transactions.router, prefix="/api/v1/transactions")
+    return TestClient(app)
+
+
+def _sample():
+    categories = ["Food", "rent", "food", "travel"]
+    return [
+        models.TransactionBase(
+            amount=float(i * 7 % 50 + 1),
+            category=categories[i % 4],
+            date=date(2025, 1 + i * 5 % 12, 1 + i % 28),  # deliberately not in insertion order
+            type=models.TransactionType.INCOME if i % 5 == 0 else models.TransactionType.EXPENSE,
+        )
+        for i in range(60)
+    ]
+
+
+def _pages(backend, limit, **filters):
+    pages, after = [], None
+    while True:
+        page, after = backend.list_transactions_page(limit, after=after, **filters)
+        pages.append(page)
+        if after is None:
+            return pages
+
+
+def _expected(backend, descending=False, **filters):
+    txs = [
+        tx for tx in backend.list_transactions()
+        if (filters.get("start") is None or tx.date >= filters["start"])
+        and (filters.get("end") is None or tx.date <= filters["end"])
+        and (filters.get("category") is None or tx.category.lower() == filters["category"].lower())
+        and (filters.get("tx_type") is None or tx.type == filters["tx_type"])
+        and (filters.get("min_amount") is None or tx.amount >= filters["min_amount"])
+    ]
+    return sorted(txs, key=lambda tx: (tx.date, tx.id), reverse=descending)
+
+
+def _check_paging(backend):
+    backend.add_transactions(_sample())
+    cases = [
+        {},
+        {"descending": True},
+        {"start": date(2025, 3, 1), "end": date(2025, 9, 30)},
+        {"category": "FOOD", "tx_type": models.TransactionType.EXPENSE, "min_amount": 10.0},
+        {"category": "travel", "descending": True, "end": date(2025, 6, 15)},
+        {"category": "no such category"},
+    ]
+    for filters in cases:
+        pages = _pages(backend, 7, **filters)
+        assert all(len(page) == 7 for page in pages[:-1]) and len(pages[-1]) <= 7
+        flat = [tx for page in pages for tx in page]
+        assert flat == _expected(backend, **filters), filters
+
+
+def test_keyset_pages_cover_filtered_results_in_order(isolated_storage):
+    _check_paging(isolated_storage)
+
+
+def test_sqlite_keyset_pages_match(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_storage, "DB_PATH", tmp_path / "pages.db")
+    sqlite_storage.initialize()
+    _check_paging(sqlite_storage)
+
+
+def test_route_pages_with_cursor_header(isolated_storage):
+    storage = isolated_storage
+    storage.add_transactions(_sample())
+    client = _client()
+
+    # No parameters keeps the old full listing
+    assert len(client.get("/api/v1/transactions/").json()) == len(storage.list_transactions())
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10, "category": "food", "order": "desc"}
+        if cursor:
+            params["cursor"] = cursor
+        res = client.get("/api/v1/transactions/", params=params)
+        assert res.status_code == 200
+        seen += [tx["id"] for tx in res.json()]
+        cursor = res.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == [tx.id for tx in _expected(storage, descending=True, category="food")]
+
+    assert client.get("/api/v1/transactions/", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/api/v1/transactions/", params={"limit": 0}).status_code == 422
@@ -0,0 +1,130 @@
+import json
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import file_storage, models, sqlite_storage
+from app.agents import eventing
+from app.routes import transactions as transaction_routes
+
+
+def _tx(amount, day, category="groceries", tx_type=models.TransactionType.EXPENSE):
+    return models.TransactionBase(amount=amount, category=category, date=day, type=tx_type)
+
+
+def _derived_state(storage):
+    return {
+        "totals": dict(storage._totals),
+        "spend": {k: round(v, 6) for k, v in storage._category_month_spend.items() if round(v, 6)},
+        "date_keys": list(storage._date_keys),
+        # Slots differ once a rebuild compacts the tombstones away; what they point at must not
+        "by_id": {tx_id: storage.get_transaction(tx_id) for tx_id in storage._tx_positions},
+        "amounts": storage._columns.amount[storage._columns.live].tolist(),
+        "months": storage.get_income_expense_series(date(2025, 1, 1), date(2026, 12, 31), "month"),
+        "balance": round(storage.get_balance_as_of(date(2025, 12, 15)), 6),
+    }
+
+
+def test_update_and_delete_apply_deltas_that_match_a_rebuild(isolated_storage):
+    storage = isolated_storage
+    created = storage.add_transactions([
+        _tx(20.0, date(2025, 11, 5)), _tx(3000.0, date(2025, 12, 20), "salary", models.TransactionType.INCOME),
+        _tx(60.0, date(2026, 1, 2), "travel"),
+    ])
+    storage.get_income_expense_series(date(2025, 1, 1), date(2026, 12, 31), "month")  # warm the cache
+
+    previous, updated = storage.update_transaction(created[0].id, _tx(25.0, date(2025, 12, 3), "Coffee"))
+    assert (previous.amount, updated.amount, updated.id) == (20.0, 25.0, created[0].id)
+    storage.update_transaction(2, _tx(50.0, date(2025, 12, 2), "groceries"))
+    assert storage.delete_transaction(created[1].id).category == "salary"
+    storage.delete_transaction(1)
+
+    incremental = _derived_state(storage)
+    storage._rebuild_transaction_state()
+    assert incremental == _derived_state(storage)
+    assert [tx.id for tx in storage.list_transactions()] == [2, 3, 4, 6]
+    assert storage.get_category_month_spend("coffee", date(2025, 12, 1)) == 25.0
+    with pytest.raises(ValueError):
+        storage.delete_transaction(1)
+
+
+def test_deletes_leave_a_tombstone_until_compaction(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    storage.add_transactions([_tx(float(i), date(2025, 12, 1)) for i in range(10)])
+    slots = dict(storage._tx_positions)
+
+    storage.delete_transaction(5)
+    storage.update_transaction(6, _tx(1.5, date(2025, 12, 2)))
+    # No slot moved: later transactions keep their index entries
+    assert storage._tx_positions == {tx_id: slot for tx_id, slot in slots.items() if tx_id != 5}
+    assert storage.transactions.slot_count == 13 and len(storage.transactions) == 12
+
+    # Once tombstones outnumber live rows they are compacted away
+    monkeypatch.setattr(storage, "CHUNK_SIZE", 4)
+    for tx_id in (1, 2, 3, 4, 7, 8):
+        storage.delete_transaction(tx_id)
+    assert storage.transactions.slot_count == len(storage.transactions) == 6
+    assert [tx.id for tx in storage.list_transactions()] == [6, 9, 10, 11, 12, 13]
+    assert storage.get_transaction(6).amount == 1.5 and storage.get_cashflow_stats(date(2025, 1, 1))["total"] == 36.5
+
+
+@pytest.mark.parametrize("mode", ["journal", "partitioned", "snapshot"])
+def test_changes_survive_a_reload(isolated_storage, monkeypatch, mode):
+    monkeypatch.setattr(file_storage, "PARTITIONED", mode == "partitioned")
+    monkeypatch.setattr(file_storage, "JOURNAL_ENABLED", mode == "journal")
+    storage = isolated_storage
+    storage._initialize_storage()
+    new = storage.add_transaction(_tx(10.0, date(2025, 11, 1)))
+    storage.update_transaction(new.id, _tx(12.0, date(2026, 2, 1), "travel"))
+    storage.delete_transaction(3)
+    storage.update_transaction(1, _tx(2.5, date(2025, 12, 1), "coffee"))
+    before = storage.list_transactions()
+
+    storage._initialize_storage()
+    assert storage.list_transactions() == before
+    if mode == "partitioned":
+        manifest = json.loads(file_storage.TRANSACTIONS_MANIFEST_FILE.read_text())["partitions"]
+        # November emptied out when its only transaction moved to February
+        assert manifest == {"2025-12": {"count": 2, "income": 0.0, "expense": 47.5},
+                            "2026-02": {"count": 1, "income": 0.0, "expense": 12.0}}
+        assert not (file_storage.TRANSACTIONS_PARTITION_DIR / "2025-11.json").exists()
+
+
+def test_routes_emit_events(isolated_storage, monkeypatch):
+    emitted = []
+    monkeypatch.setattr(eventing, "emit", lambda name, payload: emitted.append((name, payload)))
+    app = FastAPI()
+    app.include_router(transaction_routes.router, prefix="/api/v1/transactions")
+    client = TestClient(app)
+    # The previous values must come from the locked update, not a separate read
+    get_transaction = isolated_storage.get_transaction
+    monkeypatch.setattr(isolated_storage, "get_transaction", lambda tx_id: None)
+
+    body = {"amount": 14.0, "category": "coffee", "date": "2025-12-01", "type": "EXPENSE"}
+    response = client.put("/api/v1/transactions/1", json=body)
+    assert response.status_code == 200 and response.json()["amount"] == 14.0
+    monkeypatch.setattr(isolated_storage, "get_transaction", get_transaction)
+    assert client.get("/api/v1/transactions/1").json()["amount"] == 14.0
+    assert client.delete("/api/v1/transactions/2").json() == {"ok": True}
+    assert client.delete("/api/v1/transactions/2").status_code == 404
+    assert client.put("/api/v1/transactions/99", json=body).status_code == 404
+
+    assert [name for name, _ in emitted] == ["transaction.updated", "transaction.deleted"]
+    assert emitted[0][1]["previous"]["amount"] == 12.5 and emitted[1][1]["id"] == 2
+
+
+def test_sqlite_update_and_delete_keep_spend_aggregate(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_storage, "DB_PATH", tmp_path / "finance.db")
+    sqlite_storage.initialize([], [models.Budget(id=1, name="Food", category="food", monthly_limit=100.0, alert_threshold=0.8)], [])
+    a, b = sqlite_storage.add_transactions([_tx(30.0, date.today(), "food"), _tx(5.0, date.today(), "food")])
+
+    previous, updated = sqlite_storage.update_transaction(a.id, _tx(40.0, date.today(), "FOOD"))
+    assert (previous.amount, updated.amount) == (30.0, 40.0)
+    assert sqlite_storage.get_budget_for_category("food").spent_this_month == 45.0
+    sqlite_storage.delete_transaction(b.id)
+    assert sqlite_storage.get_category_month_spend("food") == 40.0
+    assert sqlite_storage.get_transaction(b.id) is None
+    with pytest.raises(ValueError):
+        sqlite_storage.update_transaction(b.id, _tx(1.0, date.today()))
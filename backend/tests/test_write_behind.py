@@ -0,0 +1,44 @@
+from app import file_storage, models
+
+
+def test_write_behind_coalesces_saves_until_flush(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    monkeypatch.setattr(file_storage, "WRITE_BEHIND", True)
+    monkeypatch.setattr(file_storage, "FLUSH_INTERVAL", 3600.0)
+    writes = []
+    original = file_storage._write_budgets
+    monkeypatch.setattr(file_storage, "_write_budgets", lambda budgets: (writes.append(len(budgets)), original(budgets)))
+
+    for i in range(5):
+        storage.add_budget(models.BudgetBase(name=f"B{i}", category=f"cat{i}", monthly_limit=10.0, alert_threshold=0.5))
+    assert writes == []
+    assert len(file_storage.load_budgets()) == 5  # still the seed data on disk
+
+    assert file_storage.flush_pending() == 1
+    assert writes == [10]
+    on_disk = file_storage.load_budgets()
+    assert [b.name for b in on_disk[5:]] == ["B0", "B1", "B2", "B3", "B4"]
+    assert file_storage.flush_pending() == 0
+
+
+def test_stop_flusher_writes_pending_data(isolated_storage, monkeypatch):
+    storage = isolated_storage
+    monkeypatch.setattr(file_storage, "WRITE_BEHIND", True)
+    monkeypatch.setattr(file_storage, "FLUSH_INTERVAL", 3600.0)
+
+    storage.add_goal(models.GoalBase(name="Trip", target_amount=900.0))
+    storage.add_notification("info", "Hi", "pending")
+    assert file_storage._flusher.is_alive()
+
+    file_storage.stop_flusher()
+    assert file_storage._flusher is None
+    assert file_storage.load_goals()[-1].name == "Trip"
+    assert file_storage.load_notifications()[0].message == "pending"
+
+
+def test_atomic_write_replaces_file_without_leftovers(tmp_path):
+    target = tmp_path / "budgets.json"
+    target.write_text("old")
+    file_storage._atomic_write(target, '{"budgets": []}')
+    assert target.read_text() == '{"budgets": []}'
+    assert [p.name for p in tmp_path.iterdir()] == ["budgets.json"]